@@ -33,24 +33,35 @@ Command Line Usage:
 __version__ = "0.1.0"
 from .__version__ import __version__, __author__, __email__, __description__
 
-# Import all tool modules to make them directly importable from the package
-from .tools import (
-    formatter,
-    random_gen, 
-    diff_tool,
-    converter,
-    linter,
-    regex_tester,
-    batch_process,
-    markdown_preview,
-    port_checker,
-    unused_func_detector,
-    api_contract_diff,
-    Robot_checker,
+import importlib
+
+# Tool modules are importable from the package but only loaded on first use,
+# so `devkit-zero format` does not pay for e.g. requests in Robot_checker
+_TOOL_MODULES = (
+    'formatter',
+    'random_gen',
+    'diff_tool',
+    'converter',
+    'linter',
+    'regex_tester',
+    'batch_process',
+    'markdown_preview',
+    'port_checker',
+    'unused_func_detector',
+    'api_contract_diff',
+    'Robot_checker',
 )
 
-# Import core classes and functions (for advanced users)
-from .core import DevKitCore
+
+def __getattr__(name):
+    """Import tool modules and DevKitCore lazily (PEP 562)"""
+    if name in _TOOL_MODULES:
+        return importlib.import_module(f'.tools.{name}', __name__)
+    if name == 'DevKitCore':
+        from .core import DevKitCore
+        return DevKitCore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     # Version Information
@@ -5,24 +5,44 @@ Provides a unified CLI entry point
 """
 
 import argparse
+import importlib
 import sys
 import os
-from typing import Optional
+from typing import List, Optional
 
 # Handle relative import and fallback for direct execution
 try:
     # Try relative import (when running as a module: python -m devkit_zero.cli)
-    from .tools import formatter, random_gen, diff_tool, converter, linter, port_checker, unused_func_detector, api_contract_diff, Robot_checker, regex_tester
     from .__version__ import __version__, __description__
 except ImportError:
     # Fallback: add parent directory to path and use absolute imports
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-    from devkit_zero.tools import formatter, random_gen, diff_tool, converter, linter, port_checker, unused_func_detector, api_contract_diff, Robot_checker, regex_tester
     from devkit_zero.__version__ import __version__, __description__
 
+# Subcommand -> tool module, in help order
+# batch_process only supports GUI
+# markdown_preview only supports GUI
+TOOL_COMMANDS = {
+    'format': 'formatter',
+    'random': 'random_gen',
+    'diff': 'diff_tool',
+    'convert': 'converter',
+    'lint': 'linter',
+    'regex': 'regex_tester',
+    'port': 'port_checker',
+    'unused-func': 'unused_func_detector',
+    'api-diff': 'api_contract_diff',
+    'robots_checker': 'Robot_checker',
+}
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create main command line parser"""
+
+def create_parser(commands: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """
+    Create main command line parser
+    
+    Args:
+        commands: Only import and register these subcommands (default: all)
+    """
     parser = argparse.ArgumentParser(
         prog='devkit-zero',
         description=__description__,
@@ -52,26 +72,20 @@ For more information, visit: https://github.com/devkit-zero/devkit-zero
     )
     subparsers.required = True
     
-    # Register subcommands for all tools
-    formatter.register_parser(subparsers)
-    random_gen.register_parser(subparsers)
-    diff_tool.register_parser(subparsers)
-    converter.register_parser(subparsers)
-    linter.register_parser(subparsers)
-    regex_tester.register_parser(subparsers)
-    # batch_process only supports GUI
-    # markdown_preview only supports GUI
-    port_checker.register_parser(subparsers)
-    unused_func_detector.register_parser(subparsers)
-    api_contract_diff.register_parser(subparsers)
-    Robot_checker.register_parser(subparsers)
+    # Register subcommands; tool modules are imported only when registered
+    for command, module_name in TOOL_COMMANDS.items():
+        if commands is None or command in commands:
+            module = importlib.import_module(f'devkit_zero.tools.{module_name}')
+            module.register_parser(subparsers)
     
     return parser
 
 
 def main(argv: Optional[list] = None) -> int:
     """Main entry function"""
-    parser = create_parser()
+    # A known subcommand only needs its own tool module; help and errors list all
+    command = (sys.argv[1:] if argv is None else argv)[:1]
+    parser = create_parser(command if command and command[0] in TOOL_COMMANDS else None)
     
     try:
         args = parser.parse_args(argv)
@@ -79,6 +93,9 @@ def main(argv: Optional[list] = None) -> int:
         # Execute corresponding tool
         result = args.func(args)
         
+        # Integer results are exit codes (e.g. format --check); anything else is output
+        if isinstance(result, int) and not isinstance(result, bool):
+            return result
         if result is not None:
             print(result)
         
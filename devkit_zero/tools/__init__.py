@@ -2,16 +2,31 @@
 Tools module initialization file
 """
 
-from . import formatter
-from . import random_gen
-from . import diff_tool
-from . import converter
-from . import linter
-from . import regex_tester
-from . import batch_process
-from . import markdown_preview
-from . import port_checker
-from . import unused_func_detector
+import importlib
+
+# Modules are imported on first attribute access (PEP 562)
+_MODULES = (
+    'formatter',
+    'random_gen',
+    'diff_tool',
+    'converter',
+    'linter',
+    'regex_tester',
+    'batch_process',
+    'markdown_preview',
+    'port_checker',
+    'unused_func_detector',
+    'api_contract_diff',
+    'Robot_checker',
+)
+
+
+def __getattr__(name):
+    """Import a tool module lazily"""
+    if name in _MODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'formatter',
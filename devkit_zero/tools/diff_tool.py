@@ -6,11 +6,434 @@ Owner: Unassigned
 Priority: Medium
 """
 
+import bisect
 import difflib
-from typing import List, Tuple
+import hashlib
+import heapq
+import json
+import marshal
+import math
+import mmap
+import os
+import shutil
+import tempfile
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
+# Line diff engines selectable with --algorithm
+ALGORITHMS = ('histogram', 'myers', 'difflib')
+DEFAULT_ALGORITHM = 'histogram'
+# Lines occurring more often than this in a region are not used as histogram anchors
+HISTOGRAM_MAX_CHAIN = 64
+# Myers gives up on a region after max(MYERS_MIN_COST, MYERS_COST_FACTOR * sqrt(N)) edit
+# steps and reports it as one replaced block, bounding its cost like git's xdiff does
+MYERS_MIN_COST = 256
+MYERS_COST_FACTOR = 4
+# Files at least this large are decoded straight from a memory map
+MMAP_THRESHOLD = 1 << 20
+# check_similarity() estimates instead of matching when a text exceeds this many characters
+SIMILARITY_APPROX_SIZE = 1 << 20
+# Byte shingle width and bottom-k sketch size for the MinHash estimate
+SHINGLE_SIZE = 5
+SKETCH_SIZE = 256
+# Read size when hashing files for directory comparison
+HASH_CHUNK_SIZE = 1 << 20
+# Most files hashed by one thread pool task
+HASH_BATCH_FILES = 256
+# Block diff: block size bounds, read buffer size, Adler-32 modulus and delta file header
+MIN_BLOCK_SIZE = 512
+MAX_BLOCK_SIZE = 1 << 17
+BLOCK_READ_SIZE = 1 << 20
+ADLER_MOD = 65521
+DELTA_MAGIC = b'DKDELTA1'
+# marshal format for JSON subtree digests; version 2 predates object references,
+# so equal trees always serialize to equal bytes
+JSON_MARSHAL_VERSION = 2
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+                                   check_circular=False).encode
 
-def compare_text(text1: str, text2: str, context_lines: int = 3) -> str:
+# (tag, i1, i2, j1, j2) as returned by difflib.SequenceMatcher.get_opcodes()
+Opcode = Tuple[str, int, int, int, int]
+
+
+def intern_lines(lines1: List[str], lines2: List[str]) -> Tuple[List[int], List[int]]:
+    """
+    Map lines to small integer IDs shared by both sides
+    
+    Equal lines get equal IDs, so the diff engines compare integers
+    instead of strings.
+    """
+    table: Dict[str, int] = {}
+    intern = table.setdefault
+    ids1 = [intern(line, len(table)) for line in lines1]
+    ids2 = [intern(line, len(table)) for line in lines2]
+    return ids1, ids2
+
+
+def _myers_split(a: List[int], b: List[int]) -> Optional[Tuple[int, int]]:
+    """
+    Find the middle snake of a and b (Myers' bisection)
+    
+    Returns the (x, y) point where the forward and reverse searches meet,
+    or None if the sequences have nothing in common or the search exceeds
+    its cost limit. Each search is capped at
+    max(MYERS_MIN_COST, MYERS_COST_FACTOR * sqrt(N)) steps and snakes are
+    followed with galloping slice compares, so dissimilar inputs cost
+    O(N) instead of O(N * D).
+    """
+    n, m = len(a), len(b)
+    max_d = min((n + m + 1) // 2, max(MYERS_MIN_COST, MYERS_COST_FACTOR * math.isqrt(n + m)))
+    offset = max_d
+    size = 2 * max_d + 2
+    forward = [-1] * size
+    reverse = [-1] * size
+    forward[offset + 1] = 0
+    reverse[offset + 1] = 0
+    delta = n - m
+    odd = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+    
+    for d in range(max_d):
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            index = offset + k1
+            if k1 == -d or (k1 != d and forward[index - 1] < forward[index + 1]):
+                x1 = forward[index + 1]
+            else:
+                x1 = forward[index - 1] + 1
+            y1 = x1 - k1
+            if x1 < n and y1 < m and a[x1] == b[y1]:
+                run = _common_run(a, b, x1, y1, min(n - x1, m - y1))
+                x1 += run
+                y1 += run
+            forward[index] = x1
+            if x1 > n:
+                k1end += 2
+            elif y1 > m:
+                k1start += 2
+            elif odd:
+                other = offset + delta - k1
+                if 0 <= other < size and reverse[other] != -1 and x1 >= n - reverse[other]:
+                    return x1, y1
+        
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            index = offset + k2
+            if k2 == -d or (k2 != d and reverse[index - 1] < reverse[index + 1]):
+                x2 = reverse[index + 1]
+            else:
+                x2 = reverse[index - 1] + 1
+            y2 = x2 - k2
+            if x2 < n and y2 < m and a[n - x2 - 1] == b[m - y2 - 1]:
+                run = _common_run(a, b, n - x2, m - y2, min(n - x2, m - y2), -1)
+                x2 += run
+                y2 += run
+            reverse[index] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not odd:
+                other = offset + delta - k2
+                if 0 <= other < size and forward[other] != -1:
+                    x1 = forward[other]
+                    if x1 >= n - x2:
+                        return x1, offset + x1 - other
+    return None
+
+
+def _common_run(a: List[int], b: List[int], i: int, j: int, limit: int, step: int = 1) -> int:
+    """
+    Length of the common run of a and b starting at i and j
+    
+    With step=-1 the run extends backwards from a[i - 1] and b[j - 1].
+    Slices are compared in doubling chunks and then bisected, so the
+    element comparisons run in C.
+    """
+    length = 0
+    chunk = 1
+    while length < limit:
+        size = min(chunk, limit - length)
+        if step > 0:
+            equal = a[i + length:i + length + size] == b[j + length:j + length + size]
+        else:
+            equal = a[i - length - size:i - length] == b[j - length - size:j - length]
+        if equal:
+            length += size
+            chunk *= 2
+            continue
+        # The first mismatch is within the next `size` elements
+        while size > 1:
+            half = size // 2
+            if step > 0:
+                equal = a[i + length:i + length + half] == b[j + length:j + length + half]
+            else:
+                equal = a[i - length - half:i - length] == b[j - length - half:j - length]
+            if equal:
+                length += half
+                size -= half
+            else:
+                size = half
+        break
+    return length
+
+
+def _trim_common(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int,
+                 blocks: List[Tuple[int, int, int]]) -> Tuple[int, int, int, int]:
+    """Record the common prefix and suffix of a region and return the rest"""
+    prefix = _common_run(a, b, alo, blo, min(ahi - alo, bhi - blo))
+    if prefix:
+        blocks.append((alo, blo, prefix))
+        alo += prefix
+        blo += prefix
+    suffix = _common_run(a, b, ahi, bhi, min(ahi - alo, bhi - blo), -1)
+    if suffix:
+        ahi -= suffix
+        bhi -= suffix
+        blocks.append((ahi, bhi, suffix))
+    return alo, ahi, blo, bhi
+
+
+def _myers_blocks(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int,
+                  blocks: List[Tuple[int, int, int]]):
+    """
+    Append the matching blocks of a region found by Myers' O(ND) algorithm
+    
+    A region whose split exceeds the cost limit gets no blocks, so it is
+    reported as one replace.
+    """
+    stack = [(alo, ahi, blo, bhi)]
+    while stack:
+        alo, ahi, blo, bhi = _trim_common(a, b, *stack.pop(), blocks)
+        if alo == ahi or blo == bhi:
+            continue
+        split = _myers_split(a[alo:ahi], b[blo:bhi])
+        if split is None or split == (0, 0) or split == (ahi - alo, bhi - blo):
+            continue
+        x, y = split
+        stack.append((alo + x, ahi, blo + y, bhi))
+        stack.append((alo, alo + x, blo, blo + y))
+
+
+def _unique_anchors(a: List[int], b: List[int], alo: int, ahi: int,
+                    blo: int, bhi: int) -> List[Tuple[int, int]]:
+    """
+    Lines occurring exactly once on both sides of a region, as (i, j)
+    pairs forming the longest increasing sequence (patience diff)
+    """
+    a_slice = a[alo:ahi]
+    b_slice = b[blo:bhi]
+    count_a = Counter(a_slice)
+    count_b = Counter(b_slice)
+    index_a = {line: i for i, line in enumerate(a_slice, alo) if count_a[line] == 1}
+    pairs = [(index_a[line], j) for j, line in enumerate(b_slice, blo)
+             if line in index_a and count_b[line] == 1]
+    if not pairs:
+        return []
+    
+    # Longest increasing subsequence of the a indexes (pairs are ordered by j)
+    tails: List[int] = []
+    tail_pairs: List[int] = []
+    previous = [-1] * len(pairs)
+    for index, (i, _) in enumerate(pairs):
+        position = bisect.bisect_left(tails, i)
+        if position:
+            previous[index] = tail_pairs[position - 1]
+        if position == len(tails):
+            tails.append(i)
+            tail_pairs.append(index)
+        else:
+            tails[position] = i
+            tail_pairs[position] = index
+    anchors = []
+    index = tail_pairs[-1]
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _histogram_blocks(a: List[int], b: List[int], blocks: List[Tuple[int, int, int]]):
+    """
+    Append the matching blocks of a and b found by patience/histogram diff
+    
+    Each region is first split at lines that are unique on both sides
+    (patience anchors). A region without such lines is split at the
+    longest common run anchored on its least frequent line, as in git's
+    histogram diff; when every line is too frequent, cost-limited Myers is
+    used.
+    """
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = _trim_common(a, b, *stack.pop(), blocks)
+        if alo == ahi or blo == bhi:
+            continue
+        
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if anchors:
+            # Gaps between anchors; trimming each gap extends the anchors
+            for i, j in reversed(anchors):
+                blocks.append((i, j, 1))
+                stack.append((i + 1, ahi, j + 1, bhi))
+                ahi, bhi = i, j
+            stack.append((alo, ahi, blo, bhi))
+            continue
+        
+        positions: Dict[int, List[int]] = {}
+        for i in range(alo, ahi):
+            occurrences = positions.get(a[i])
+            if occurrences is None:
+                positions[a[i]] = [i]
+            else:
+                occurrences.append(i)
+        
+        best = None
+        lowest = HISTOGRAM_MAX_CHAIN + 1
+        j = blo
+        while j < bhi:
+            occurrences = positions.get(b[j])
+            if occurrences is None or len(occurrences) > lowest:
+                j += 1
+                continue
+            next_j = j + 1
+            count = len(occurrences)
+            for i in occurrences:
+                # Extend the anchor in both directions
+                before = _common_run(a, b, i, j, min(i - alo, j - blo), -1)
+                after = _common_run(a, b, i + 1, j + 1, min(ahi - i, bhi - j) - 1)
+                length = before + 1 + after
+                if best is None or count < lowest or (count == lowest and length > best[2]):
+                    best = (i - before, j - before, length)
+                    lowest = count
+                next_j = max(next_j, j + 1 + after)
+            j = next_j
+        
+        if best is None:
+            if any(line in positions for line in b[blo:bhi]):
+                _myers_blocks(a, b, alo, ahi, blo, bhi, blocks)
+            continue
+        
+        start_i, start_j, length = best
+        blocks.append(best)
+        stack.append((start_i + length, ahi, start_j + length, bhi))
+        stack.append((alo, start_i, blo, start_j))
+
+
+def diff_opcodes(lines1: List[str], lines2: List[str],
+                 algorithm: str = DEFAULT_ALGORITHM) -> List[Opcode]:
+    """
+    Compute line opcodes between two line lists
+    
+    Args:
+        lines1: Lines of the first text
+        lines2: Lines of the second text
+        algorithm: 'histogram', 'myers' or 'difflib'
+        
+    Returns:
+        (tag, i1, i2, j1, j2) opcodes in the format of
+        difflib.SequenceMatcher.get_opcodes()
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown diff algorithm: {algorithm} (choose from {', '.join(ALGORITHMS)})")
+    ids1, ids2 = intern_lines(lines1, lines2)
+    
+    if algorithm == 'difflib':
+        return difflib.SequenceMatcher(None, ids1, ids2).get_opcodes()
+    
+    blocks: List[Tuple[int, int, int]] = []
+    if algorithm == 'histogram':
+        _histogram_blocks(ids1, ids2, blocks)
+    else:
+        _myers_blocks(ids1, ids2, 0, len(ids1), 0, len(ids2), blocks)
+    blocks.sort()
+    
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for ai, bj, size in blocks + [(len(ids1), len(ids2), 0)]:
+        if i < ai and j < bj:
+            opcodes.append(('replace', i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(('delete', i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(('insert', i, ai, j, bj))
+        if size:
+            if opcodes and opcodes[-1][0] == 'equal':
+                # Merge adjacent blocks
+                opcodes[-1] = ('equal', opcodes[-1][1], ai + size, opcodes[-1][3], bj + size)
+            else:
+                opcodes.append(('equal', ai, ai + size, bj, bj + size))
+        i, j = ai + size, bj + size
+    return opcodes
+
+
+def _group_opcodes(opcodes: List[Opcode], context_lines: int) -> Iterator[List[Opcode]]:
+    """Group opcodes into hunks with context (difflib's get_grouped_opcodes)"""
+    codes = list(opcodes) or [('equal', 0, 1, 0, 1)]
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context_lines), i2, max(j1, j2 - context_lines), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context_lines), j1, min(j2, j1 + context_lines)
+    
+    span = context_lines + context_lines
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal' and i2 - i1 > span:
+            group.append((tag, i1, min(i2, i1 + context_lines), j1, min(j2, j1 + context_lines)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context_lines), max(j1, j2 - context_lines)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Unified diff range 'start,length' (difflib's _format_range_unified)"""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f'{beginning}'
+    if not length:
+        beginning -= 1
+    return f'{beginning},{length}'
+
+
+def unified_diff(lines1: List[str], lines2: List[str], opcodes: List[Opcode],
+                 fromfile: str = 'text1', tofile: str = 'text2',
+                 context_lines: int = 3) -> Iterator[str]:
+    """
+    Yield unified diff lines for precomputed opcodes
+    
+    Lines are yielded with a trailing newline; a line missing one (the
+    last line of a file) gets it added.
+    """
+    started = False
+    for group in _group_opcodes(opcodes, context_lines):
+        if not started:
+            started = True
+            yield f'--- {fromfile}\n'
+            yield f'+++ {tofile}\n'
+        first, last = group[0], group[-1]
+        yield f'@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n'
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in lines1[i1:i2]:
+                    yield ' ' + line if line.endswith('\n') else ' ' + line + '\n'
+                continue
+            if tag in ('replace', 'delete'):
+                for line in lines1[i1:i2]:
+                    yield '-' + line if line.endswith('\n') else '-' + line + '\n'
+            if tag in ('replace', 'insert'):
+                for line in lines2[j1:j2]:
+                    yield '+' + line if line.endswith('\n') else '+' + line + '\n'
+
+
+def compare_text(text1: str, text2: str, context_lines: int = 3,
+                 algorithm: str = DEFAULT_ALGORITHM) -> str:
     """
     Compare differences between two texts
     
@@ -18,26 +441,19 @@ def compare_text(text1: str, text2: str, context_lines: int = 3) -> str:
         text1: First text
         text2: Second text
         context_lines: Number of context lines
+        algorithm: Line diff engine ('histogram', 'myers' or 'difflib')
         
     Returns:
         Difference report string
     """
     lines1 = text1.splitlines(keepends=True)
     lines2 = text2.splitlines(keepends=True)
-    
-    diff = difflib.unified_diff(
-        lines1, 
-        lines2,
-        fromfile='text1',
-        tofile='text2',
-        lineterm='',
-        n=context_lines
-    )
-    
-    return ''.join(diff)
+    opcodes = diff_opcodes(lines1, lines2, algorithm)
+    return ''.join(unified_diff(lines1, lines2, opcodes, 'text1', 'text2', context_lines))
 
 
-def compare_files(file1: str, file2: str, context_lines: int = 3) -> str:
+def compare_files(file1: str, file2: str, context_lines: int = 3,
+                  algorithm: str = DEFAULT_ALGORITHM) -> str:
     """
     Compare differences between two files
     
@@ -45,33 +461,94 @@ def compare_files(file1: str, file2: str, context_lines: int = 3) -> str:
         file1: First file path
         file2: Second file path
         context_lines: Number of context lines
+        algorithm: Line diff engine ('histogram', 'myers' or 'difflib')
         
     Returns:
         Difference report string
     """
     try:
-        with open(file1, 'r', encoding='utf-8') as f1:
-            text1 = f1.read()
-        with open(file2, 'r', encoding='utf-8') as f2:
-            text2 = f2.read()
-        
-        lines1 = text1.splitlines(keepends=True)
-        lines2 = text2.splitlines(keepends=True)
-        
-        diff = difflib.unified_diff(
-            lines1,
-            lines2,
-            fromfile=file1,
-            tofile=file2,
-            lineterm='',
-            n=context_lines
-        )
-        
-        return ''.join(diff)
+        return diff_summary(read_text(file1), read_text(file2), file1, file2,
+                            context_lines, algorithm)['diff']
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+def read_text(path: str) -> str:
+    """
+    Read a UTF-8 text file in one pass
+    
+    Large files are decoded directly from a memory map, so the raw bytes
+    are never copied into an intermediate buffer.
+    
+    Args:
+        path: File path
+        
+    Returns:
+        File content
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < max(MMAP_THRESHOLD, 1):
+            return f.read().decode('utf-8')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, 'utf-8')
+
+
+def _tally(opcodes: List[Opcode], count1: int, count2: int) -> dict:
+    """Line statistics for one opcode list"""
+    additions = 0
+    deletions = 0
+    modifications = 0
+    matches = 0
+    
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            matches += i2 - i1
+        elif tag == 'replace':
+            modifications += max(i2-i1, j2-j1)
+        elif tag == 'delete':
+            deletions += (i2-i1)
+        elif tag == 'insert':
+            additions += (j2-j1)
+    
+    # Same definition as SequenceMatcher.ratio() over lines
+    total = count1 + count2
+    return {
+        'total_lines_1': count1,
+        'total_lines_2': count2,
+        'additions': additions,
+        'deletions': deletions,
+        'modifications': modifications,
+        'similarity': 2.0 * matches / total if total else 1.0,
+        'total_changes': additions + deletions + modifications
+    }
+
+
+def diff_summary(text1: str, text2: str, fromfile: str = 'text1', tofile: str = 'text2',
+                 context_lines: int = 3, algorithm: str = DEFAULT_ALGORITHM) -> dict:
+    """
+    Diff two texts once and derive the report, stats and similarity from it
+    
+    Args:
+        text1: First text
+        text2: Second text
+        fromfile: Name shown on the --- header line
+        tofile: Name shown on the +++ header line
+        context_lines: Number of context lines
+        algorithm: Line diff engine ('histogram', 'myers' or 'difflib')
+        
+    Returns:
+        analyze_changes() statistics plus the unified 'diff' string
+    """
+    lines1 = text1.splitlines(keepends=True)
+    lines2 = text2.splitlines(keepends=True)
+    opcodes = diff_opcodes(lines1, lines2, algorithm)
+    
+    summary = _tally(opcodes, len(lines1), len(lines2))
+    summary['diff'] = ''.join(unified_diff(lines1, lines2, opcodes, fromfile, tofile, context_lines))
+    return summary
+
+
 def get_similarity(text1: str, text2: str) -> float:
     """
     Calculate similarity between two texts
@@ -86,7 +563,111 @@ def get_similarity(text1: str, text2: str) -> float:
     return difflib.SequenceMatcher(None, text1, text2).ratio()
 
 
-def get_side_by_side_diff(text1: str, text2: str, width: int = 40) -> List[str]:
+def _shingles(text: str, by_words: bool) -> Set[int]:
+    """
+    CRC-32 hashes of word trigrams, or of SHINGLE_SIZE-byte slices
+    
+    zlib.crc32 is stable across processes (unlike hash()), so the same
+    inputs always give the same sketch.
+    """
+    data = text.encode('utf-8', 'surrogatepass')
+    if by_words:
+        words = data.split()
+        return set(map(zlib.crc32, map(b' '.join, zip(words, words[1:], words[2:])))) or {zlib.crc32(data)}
+    if len(data) <= SHINGLE_SIZE:
+        return {zlib.crc32(data)}
+    starts = range(len(data) - SHINGLE_SIZE + 1)
+    ends = range(SHINGLE_SIZE, len(data) + 1)
+    return set(map(zlib.crc32, map(data.__getitem__, map(slice, starts, ends))))
+
+
+def _estimate_similarity(text1: str, text2: str, confidence: float) -> Tuple[float, float, float]:
+    """
+    Estimate shingle similarity from bottom-k MinHash sketches
+    
+    Texts are shingled into word trigrams, or into byte slices when they
+    hold too few words. The Jaccard index J of the two shingle sets is
+    estimated from the SKETCH_SIZE smallest hashes of their union; with k
+    samples, Hoeffding's inequality bounds the error on J by
+    sqrt(ln(2 / (1 - confidence)) / 2k). J and its bounds are reported as
+    the Dice coefficient 2J / (1 + J).
+    
+    Shingle sets ignore where shingles occur, so this measures shared
+    content, not SequenceMatcher.ratio(): shuffled lines score close to 1.
+    
+    Returns:
+        (estimate, lower, upper) of the shingle Dice coefficient
+    """
+    by_words = min(text1.count(' '), text2.count(' ')) >= SKETCH_SIZE
+    members1 = set(heapq.nsmallest(SKETCH_SIZE, _shingles(text1, by_words)))
+    members2 = set(heapq.nsmallest(SKETCH_SIZE, _shingles(text2, by_words)))
+    union = heapq.nsmallest(SKETCH_SIZE, members1 | members2)
+    jaccard = sum(1 for h in union if h in members1 and h in members2) / len(union)
+    
+    error = math.sqrt(math.log(2 / (1 - confidence)) / (2 * len(union)))
+    dice = lambda j: 2 * j / (1 + j)
+    return dice(jaccard), dice(max(jaccard - error, 0.0)), dice(min(jaccard + error, 1.0))
+
+
+def check_similarity(text1: str, text2: str, threshold: float,
+                     approximate_above: Optional[int] = SIMILARITY_APPROX_SIZE,
+                     confidence: float = 0.95) -> dict:
+    """
+    Decide whether two texts are at least `threshold` similar, as cheaply as possible
+    
+    Cheap upper bounds on SequenceMatcher.ratio() are tried first: the
+    length bound (real_quick_ratio) and the character multiset bound
+    (quick_ratio). The exact ratio is only computed when neither rules the
+    pair out. When either text is longer than `approximate_above`
+    characters, the decision is made on a MinHash estimate of shingle
+    similarity instead, which ignores the order of the shared content.
+    
+    Args:
+        text1: First text
+        text2: Second text
+        threshold: Minimum similarity (0-1)
+        approximate_above: Size limit for exact matching, None to always match exactly
+        confidence: Confidence level of the shingle similarity interval
+        
+    Returns:
+        Dictionary with 'similar', 'ratio' (None unless computed exactly),
+        'lower' and 'upper' bounds on the ratio, 'exact' and the deciding
+        'method'. The approximate mode adds 'shingle_similarity' with its
+        'shingle_lower' and 'shingle_upper' confidence bounds.
+    """
+    def result(method, ratio, lower, upper, similar=None):
+        if similar is None:
+            similar = ratio is not None and ratio >= threshold
+        return {'similar': similar, 'ratio': ratio, 'lower': lower, 'upper': upper,
+                'exact': method != 'minhash', 'method': method}
+    
+    if text1 == text2:
+        return result('identical', 1.0, 1.0, 1.0)
+    
+    # Every matched character needs a partner, so 2 * min(len) / total bounds the ratio
+    total = len(text1) + len(text2)
+    upper = 2.0 * min(len(text1), len(text2)) / total
+    if upper < threshold:
+        return result('real_quick_ratio', None, 0.0, upper)
+    
+    # Matched characters are also bounded by the common character multiset
+    common = Counter(text1) & Counter(text2)
+    upper = min(upper, 2.0 * sum(common.values()) / total)
+    if upper < threshold:
+        return result('quick_ratio', None, 0.0, upper)
+    
+    if approximate_above is not None and max(len(text1), len(text2)) > approximate_above:
+        estimate, lower, high = _estimate_similarity(text1, text2, confidence)
+        summary = result('minhash', None, 0.0, upper, similar=estimate >= threshold)
+        summary.update({'shingle_similarity': estimate, 'shingle_lower': lower, 'shingle_upper': high})
+        return summary
+    
+    ratio = difflib.SequenceMatcher(None, text1, text2).ratio()
+    return result('exact', ratio, ratio, ratio)
+
+
+def get_side_by_side_diff(text1: str, text2: str, width: int = 40,
+                          algorithm: str = DEFAULT_ALGORITHM) -> List[str]:
     """
     Generate side-by-side difference comparison
     
@@ -94,6 +675,7 @@ def get_side_by_side_diff(text1: str, text2: str, width: int = 40) -> List[str]:
         text1: First text
         text2: Second text
         width: Column width
+        algorithm: Line diff engine ('histogram', 'myers' or 'difflib')
         
     Returns:
         List of strings representing side-by-side diff
@@ -101,7 +683,6 @@ def get_side_by_side_diff(text1: str, text2: str, width: int = 40) -> List[str]:
     lines1 = text1.splitlines()
     lines2 = text2.splitlines()
     
-    matcher = difflib.SequenceMatcher(None, lines1, lines2)
     result = []
     
     # Header
@@ -109,7 +690,7 @@ def get_side_by_side_diff(text1: str, text2: str, width: int = 40) -> List[str]:
     result.append(fmt.format("Text 1", "Text 2", "Op"))
     result.append("-" * (width * 2 + 10))
     
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in diff_opcodes(lines1, lines2, algorithm):
         if tag == 'equal':
             for k in range(i2 - i1):
                 l1 = lines1[i1+k]
@@ -140,42 +721,21 @@ def get_side_by_side_diff(text1: str, text2: str, width: int = 40) -> List[str]:
     return result
 
 
-def analyze_changes(text1: str, text2: str) -> dict:
+def analyze_changes(text1: str, text2: str, algorithm: str = DEFAULT_ALGORITHM) -> dict:
     """
     Analyze changes between two texts
     
     Args:
         text1: First text
         text2: Second text
+        algorithm: Line diff engine ('histogram', 'myers' or 'difflib')
         
     Returns:
         Dictionary with change statistics
     """
     lines1 = text1.splitlines()
     lines2 = text2.splitlines()
-    matcher = difflib.SequenceMatcher(None, lines1, lines2)
-    
-    additions = 0
-    deletions = 0
-    modifications = 0
-    
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-        if tag == 'replace':
-            modifications += max(i2-i1, j2-j1)
-        elif tag == 'delete':
-            deletions += (i2-i1)
-        elif tag == 'insert':
-            additions += (j2-j1)
-            
-    return {
-        'total_lines_1': len(lines1),
-        'total_lines_2': len(lines2),
-        'additions': additions,
-        'deletions': deletions,
-        'modifications': modifications,
-        'similarity': matcher.ratio(),
-        'total_changes': additions + deletions + modifications
-    }
+    return _tally(diff_opcodes(lines1, lines2, algorithm), len(lines1), len(lines2))
 
 
 # Function used by GUI
@@ -186,48 +746,731 @@ def diff_text(text1: str, text2: str) -> dict:
     Returns:
         Dictionary containing difference info
     """
-    diff = compare_text(text1, text2)
-    similarity = get_similarity(text1, text2)
+    summary = diff_summary(text1, text2)
+    similarity = summary['similarity']
     
     return {
-        'diff': diff,
+        'diff': summary['diff'],
         'similarity': similarity,
         'similarity_percent': f"{similarity * 100:.2f}%"
     }
 
 
+def _scan_tree(root: str) -> Tuple[Dict[str, os.stat_result], Dict[str, str]]:
+    """
+    Map every file below root (relative path) to its stat result, using os.scandir
+    
+    Returns:
+        (files, errors); errors maps each directory or file that could not
+        be listed or stat'ed (relative path, '.' for root) to the error message
+    """
+    files: Dict[str, os.stat_result] = {}
+    errors: Dict[str, str] = {}
+    pending = ['']
+    while pending:
+        relative = pending.pop()
+        try:
+            entries = list(os.scandir(os.path.join(root, relative)))
+        except OSError as e:
+            errors[relative or os.curdir] = str(e)
+            continue
+        for entry in entries:
+            name = os.path.join(relative, entry.name)
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(name)
+                elif entry.is_file():
+                    files[name] = entry.stat()
+            except OSError as e:
+                errors[name] = str(e)
+    return files, errors
+
+
+def _under_errors(name: str, errors: Dict[str, str]) -> bool:
+    """Whether name, or a directory containing it, could not be read"""
+    while name:
+        if name in errors:
+            return True
+        name = os.path.dirname(name)
+    return os.curdir in errors
+
+
+def file_digest(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> bytes:
+    """
+    SHA-256 of a file, read in fixed-size chunks
+    
+    hashlib releases the GIL while hashing large chunks, so digests of
+    different files computed from a thread pool run in parallel.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        chunk = f.read(chunk_size)
+        while chunk:
+            digest.update(chunk)
+            chunk = f.read(chunk_size)
+    return digest.digest()
+
+
+def _digests_differ(names: List[str], dir1: str, dir2: str) -> List[Tuple[bool, Optional[str]]]:
+    """
+    Whether each relative path has different content under dir1 and dir2
+    
+    A file that cannot be read yields (True, error message) instead of
+    failing the whole batch.
+    """
+    results = []
+    for name in names:
+        try:
+            changed = file_digest(os.path.join(dir1, name)) != file_digest(os.path.join(dir2, name))
+        except OSError as e:
+            results.append((True, str(e)))
+            continue
+        results.append((changed, None))
+    return results
+
+
+def compare_directories(dir1: str, dir2: str, jobs: int = 0, checksum: bool = False) -> dict:
+    """
+    Compare two directory trees
+    
+    Files present on one side only are added or removed. A file present on
+    both sides is modified when the sizes differ, and unchanged when size
+    and modification time both match (unless checksum is set). Only the
+    remaining candidates are hashed, in a thread pool. Directories that
+    cannot be listed and files that cannot be read are reported under
+    'errors' and the comparison carries on; files below an unreadable
+    directory on either side are not reported as added or removed.
+    
+    Args:
+        dir1: Old directory
+        dir2: New directory
+        jobs: Hashing threads (0 = executor default)
+        checksum: Hash every common file even when size and mtime match
+        
+    Returns:
+        Dictionary with sorted 'added', 'removed' and 'modified' relative
+        paths, 'errors' mapping unreadable paths to their error message and
+        the 'unchanged' file count
+    """
+    for directory in (dir1, dir2):
+        if not os.path.isdir(directory):
+            raise NotADirectoryError(f"Not a directory: {directory}")
+    
+    with ThreadPoolExecutor(max_workers=jobs or None) as executor:
+        (tree1, errors), (tree2, errors2) = executor.map(_scan_tree, (dir1, dir2))
+        for name, error in errors2.items():
+            errors.setdefault(name, error)
+        
+        modified: List[str] = []
+        candidates: List[str] = []
+        unchanged = 0
+        for name, stat1 in tree1.items():
+            stat2 = tree2.get(name)
+            if stat2 is None:
+                continue
+            if stat1.st_size != stat2.st_size:
+                modified.append(name)
+            elif not checksum and stat1.st_mtime_ns == stat2.st_mtime_ns:
+                unchanged += 1
+            else:
+                candidates.append(name)
+        
+        # Batch small files so pool overhead does not dominate; large files get their own task
+        batches: List[List[str]] = [[]]
+        batch_bytes = 0
+        for name in candidates:
+            if batch_bytes >= HASH_CHUNK_SIZE or len(batches[-1]) >= HASH_BATCH_FILES:
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(name)
+            batch_bytes += tree1[name].st_size
+        for batch, differs in zip(batches, executor.map(_digests_differ, batches, repeat(dir1), repeat(dir2))):
+            for name, (changed, error) in zip(batch, differs):
+                if error:
+                    errors[name] = error
+                elif changed:
+                    modified.append(name)
+                else:
+                    unchanged += 1
+    
+    added, removed = tree2.keys() - tree1.keys(), tree1.keys() - tree2.keys()
+    if errors:
+        # Whether these exist on the other side is unknown
+        added = {name for name in added if not _under_errors(name, errors)}
+        removed = {name for name in removed if not _under_errors(name, errors)}
+    return {
+        'added': sorted(added),
+        'removed': sorted(removed),
+        'modified': sorted(modified),
+        'errors': dict(sorted(errors.items())),
+        'unchanged': unchanged
+    }
+
+
+def _auto_block_size(size: int) -> int:
+    """rsync-style block size: about sqrt(size), so the signature stays small"""
+    return max(MIN_BLOCK_SIZE, min(MAX_BLOCK_SIZE, math.isqrt(size) // 64 * 64))
+
+
+def _block_signature(path: str, block_size: int):
+    """
+    Index the full blocks of a file by weak (Adler-32) and strong (BLAKE2b) checksum
+    
+    Returns:
+        ({weak: {strong: offset}}, (strong, offset, length) of the trailing
+        partial block or None)
+    """
+    signature: Dict[int, Dict[bytes, int]] = {}
+    tail = None
+    offset = 0
+    with open(path, 'rb') as f:
+        block = f.read(block_size)
+        while block:
+            strong = hashlib.blake2b(block, digest_size=16).digest()
+            if len(block) < block_size:
+                tail = (strong, offset, len(block))
+                break
+            signature.setdefault(zlib.adler32(block), {}).setdefault(strong, offset)
+            offset += block_size
+            block = f.read(block_size)
+    return signature, tail
+
+
+def _block_ops(file1: str, file2: str, block_size: int) -> Iterator[Tuple[str, int, int, bytes]]:
+    """
+    Scan file2 against the block signature of file1
+    
+    Yields ('copy', offset1, length, b'') for data found in file1 and
+    ('literal', 0, length, data) for the rest, in file2 order. Where the
+    files agree, whole blocks are checked with C-level checksums; only
+    through changed regions does the Adler-32 window roll byte by byte.
+    Memory is the signature plus a bounded read buffer.
+    """
+    signature, tail = _block_signature(file1, block_size)
+    buffer_size = max(BLOCK_READ_SIZE, 4 * block_size)
+    literal = bytearray()
+    copy_offset = copy_length = 0
+    
+    def flush_copy():
+        return ('copy', copy_offset, copy_length, b'')
+    
+    with open(file2, 'rb') as f:
+        buf = f.read(buffer_size)
+        pos = 0
+        eof = len(buf) < buffer_size
+        while True:
+            if len(buf) - pos < block_size and not eof:
+                more = f.read(buffer_size)
+                eof = len(more) < buffer_size
+                buf = buf[pos:] + more
+                pos = 0
+            if len(buf) - pos < block_size:
+                break
+            
+            window = buf[pos:pos + block_size]
+            weak = zlib.adler32(window)
+            strongs = signature.get(weak)
+            offset = None
+            if strongs is not None:
+                offset = strongs.get(hashlib.blake2b(window, digest_size=16).digest())
+            if offset is not None:
+                if literal:
+                    yield ('literal', 0, len(literal), bytes(literal))
+                    literal.clear()
+                if copy_length and copy_offset + copy_length == offset:
+                    copy_length += block_size
+                else:
+                    if copy_length:
+                        yield flush_copy()
+                    copy_offset, copy_length = offset, block_size
+                pos += block_size
+                continue
+            
+            # Roll the window one byte at a time until a weak checksum hits
+            a, b = weak & 0xffff, weak >> 16
+            start, limit = pos, len(buf) - block_size
+            step = block_size % ADLER_MOD
+            while pos < limit:
+                out = buf[pos]
+                a = (a - out + buf[pos + block_size]) % ADLER_MOD
+                b = (b - step * out + a - 1) % ADLER_MOD
+                pos += 1
+                if (b << 16 | a) in signature:
+                    break
+            else:
+                pos += 1
+            if copy_length:
+                yield flush_copy()
+                copy_length = 0
+            literal += buf[start:pos]
+            if len(literal) >= BLOCK_READ_SIZE:
+                yield ('literal', 0, len(literal), bytes(literal))
+                literal.clear()
+    
+    rest = buf[pos:]
+    if rest and tail and len(rest) == tail[2] and hashlib.blake2b(rest, digest_size=16).digest() == tail[0]:
+        if literal:
+            yield ('literal', 0, len(literal), bytes(literal))
+            literal.clear()
+        if copy_length and copy_offset + copy_length == tail[1]:
+            copy_length += len(rest)
+        else:
+            if copy_length:
+                yield flush_copy()
+            copy_offset, copy_length = tail[1], len(rest)
+    else:
+        literal += rest
+    if copy_length:
+        yield flush_copy()
+    if literal:
+        yield ('literal', 0, len(literal), bytes(literal))
+
+
+def block_diff(file1: str, file2: str,
+               block_size: Optional[int] = None) -> Iterator[Tuple[str, int, int, Optional[int]]]:
+    """
+    Compare two files block by block with an rsync-style rolling checksum
+    
+    Args:
+        file1: Old file path
+        file2: New file path
+        block_size: Block size in bytes (default: about sqrt of file1's size)
+        
+    Yields:
+        ('match', offset2, length, offset1) for ranges of file2 found in
+        file1 and ('differ', offset2, length, None) for the rest
+    """
+    if block_size is None:
+        block_size = _auto_block_size(os.path.getsize(file1))
+    offset2 = 0
+    pending = None
+    for op, offset1, length, _ in _block_ops(file1, file2, block_size):
+        if op == 'copy':
+            if pending:
+                yield pending
+                pending = None
+            yield ('match', offset2, length, offset1)
+        elif pending:
+            pending = ('differ', pending[1], pending[2] + length, None)
+        else:
+            pending = ('differ', offset2, length, None)
+        offset2 += length
+    if pending:
+        yield pending
+
+
+def _write_varint(out, value: int):
+    """Write an unsigned LEB128 integer"""
+    while value >= 0x80:
+        out.write(bytes((value & 0x7f | 0x80,)))
+        value >>= 7
+    out.write(bytes((value,)))
+
+
+def _read_varint(f) -> int:
+    """Read an unsigned LEB128 integer"""
+    value = shift = 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise ValueError("Truncated delta")
+        value |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def write_delta(file1: str, file2: str, delta_path: str, block_size: Optional[int] = None) -> dict:
+    """
+    Write a binary delta that rebuilds file2 from file1
+    
+    The delta is the DELTA_MAGIC header followed by 'C' offset length
+    (copy from file1) and 'L' length data (literal) records, and an 'E'
+    record holding the SHA-256 of file2 that apply_delta() verifies.
+    
+    Returns:
+        Dictionary with 'copied' and 'literal' byte counts and 'delta_size'
+    """
+    if block_size is None:
+        block_size = _auto_block_size(os.path.getsize(file1))
+    target = hashlib.sha256()
+    copied = literal = 0
+    with open(delta_path, 'wb') as out, open(file1, 'rb') as base:
+        out.write(DELTA_MAGIC)
+        for op, offset1, length, data in _block_ops(file1, file2, block_size):
+            if op == 'copy':
+                out.write(b'C')
+                _write_varint(out, offset1)
+                _write_varint(out, length)
+                copied += length
+                # The copied range is already verified by checksum; hash it from file1
+                base.seek(offset1)
+                remaining = length
+                while remaining:
+                    chunk = base.read(min(remaining, BLOCK_READ_SIZE))
+                    target.update(chunk)
+                    remaining -= len(chunk)
+            else:
+                out.write(b'L')
+                _write_varint(out, length)
+                out.write(data)
+                target.update(data)
+                literal += length
+        out.write(b'E')
+        out.write(target.digest())
+        delta_size = out.tell()
+    return {'copied': copied, 'literal': literal, 'delta_size': delta_size}
+
+
+def apply_delta(base_path: str, delta_path: str, output_path: str) -> int:
+    """
+    Rebuild a file from its base and a delta written by write_delta()
+    
+    The result is written to a temporary file next to output_path and only
+    moved into place once its checksum matches, so output_path may be the
+    base file itself and a bad delta never leaves a partial file behind.
+    
+    Raises:
+        ValueError: If the delta is malformed or the result does not match
+        
+    Returns:
+        Size of the rebuilt file in bytes
+    """
+    target = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(prefix='.delta-', dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        with open(delta_path, 'rb') as delta, open(base_path, 'rb') as base, os.fdopen(fd, 'wb') as out:
+            if delta.read(len(DELTA_MAGIC)) != DELTA_MAGIC:
+                raise ValueError(f"Not a delta file: {delta_path}")
+            while True:
+                record = delta.read(1)
+                if record == b'E':
+                    expected = delta.read(32)
+                    break
+                if record == b'C':
+                    base.seek(_read_varint(delta))
+                    remaining = _read_varint(delta)
+                    while remaining:
+                        chunk = base.read(min(remaining, BLOCK_READ_SIZE))
+                        if not chunk:
+                            raise ValueError("Delta copies past the end of the base file")
+                        remaining -= len(chunk)
+                        out.write(chunk)
+                        target.update(chunk)
+                        size += len(chunk)
+                elif record == b'L':
+                    length = _read_varint(delta)
+                    chunk = delta.read(length)
+                    if len(chunk) != length:
+                        raise ValueError("Truncated delta")
+                    out.write(chunk)
+                    target.update(chunk)
+                    size += length
+                else:
+                    raise ValueError("Corrupt delta record")
+        if target.digest() != expected:
+            raise ValueError("Rebuilt file does not match the delta checksum; wrong base file?")
+        # mkstemp creates the file private; keep the mode of the file it stands in for
+        shutil.copymode(output_path if os.path.exists(output_path) else base_path, temp_path)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return size
+
+
+def _pointer(path: str, token) -> str:
+    """Append one reference token to a JSON Pointer (RFC 6901)"""
+    return path + '/' + str(token).replace('~', '~0').replace('/', '~1')
+
+
+def _subtree_digest(node) -> bytes:
+    """
+    Digest of a parsed JSON subtree's exact structure
+    
+    marshal serializes the tree in C and tags bools, ints and floats
+    separately, so equal digests mean strictly equal values. Dict key
+    order is part of the digest; callers fall back to a key-by-key walk
+    or to _canonical_digest() when digests differ.
+    """
+    return hashlib.blake2b(marshal.dumps(node, JSON_MARSHAL_VERSION), digest_size=16).digest()
+
+
+def _canonical_digest(node) -> bytes:
+    """Key-order insensitive digest of a subtree, from its sorted-key serialization"""
+    text = _CANONICAL_JSON(node).encode('utf-8', 'surrogatepass')
+    return hashlib.blake2b(text, digest_size=16).digest()
+
+
+def _scalar_equal(a, b) -> bool:
+    """JSON value equality: 1 and 1.0 are the same number, true and 1 are not"""
+    if type(a) is bool or type(b) is bool:
+        return a is b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b or (a != a and b != b)
+    return type(a) is type(b) and a == b
+
+
+def _diff_arrays(a: list, b: list, path: str) -> list:
+    """
+    Match array elements by subtree digest and describe what is left
+    
+    The line diff engine aligns the two digest sequences. Unmatched
+    elements that are equal once keys are sorted are given one shared key
+    and the arrays are aligned again, so key order alone never breaks a
+    match. Unmatched elements that still share a key are moves; the rest
+    of a replaced run is paired up for a deeper diff.
+    
+    Returns:
+        Work items for json_diff(), in array order
+    """
+    keys1 = list(map(_subtree_digest, a))
+    keys2 = list(map(_subtree_digest, b))
+    blocks = [op for op in diff_opcodes(keys1, keys2) if op[0] != 'equal']
+    
+    shared: Dict[bytes, bytes] = {}
+    realign = False
+    for keys, values, ranges in ((keys1, a, [(i1, i2) for _, i1, i2, _, _ in blocks]),
+                                 (keys2, b, [(j1, j2) for _, _, _, j1, j2 in blocks])):
+        for lo, hi in ranges:
+            for index in range(lo, hi):
+                key = shared.setdefault(_canonical_digest(values[index]), keys[index])
+                if key != keys[index]:
+                    keys[index] = key
+                    realign = True
+    if realign:
+        blocks = [op for op in diff_opcodes(keys1, keys2) if op[0] != 'equal']
+    
+    unmatched_old: Dict[bytes, List[int]] = {}
+    for _, i1, i2, _, _ in blocks:
+        for i in range(i1, i2):
+            unmatched_old.setdefault(keys1[i], []).append(i)
+    moved_old, moved_new = set(), set()
+    moves = []
+    for _, _, _, j1, j2 in blocks:
+        for j in range(j1, j2):
+            candidates = unmatched_old.get(keys2[j])
+            if candidates:
+                i = candidates.pop(0)
+                moved_old.add(i)
+                moved_new.add(j)
+                moves.append({'op': 'moved', 'from': _pointer(path, i), 'path': _pointer(path, j)})
+    
+    items = []
+    for _, i1, i2, j1, j2 in blocks:
+        old_left = [i for i in range(i1, i2) if i not in moved_old]
+        new_left = [j for j in range(j1, j2) if j not in moved_new]
+        for i, j in zip(old_left, new_left):
+            items.append((a[i], b[j], _pointer(path, j)))
+        for i in old_left[len(new_left):]:
+            items.append({'op': 'removed', 'path': _pointer(path, i), 'value': a[i]})
+        for j in new_left[len(old_left):]:
+            items.append({'op': 'added', 'path': _pointer(path, j), 'value': b[j]})
+    return items + moves
+
+
+def json_diff(old, new) -> List[dict]:
+    """
+    Structural diff of two parsed JSON documents
+    
+    Subtrees are compared by digest and identical ones are skipped without
+    being walked. Object key order is ignored and 1 equals 1.0. Paths are
+    JSON Pointers; removed paths refer to the old document and all others
+    to the new one.
+    
+    Args:
+        old: Old document
+        new: New document
+        
+    Returns:
+        List of changes, each {'op': 'added' | 'removed', 'path', 'value'},
+        {'op': 'changed', 'path', 'old', 'new'} or {'op': 'moved', 'from', 'path'}
+    """
+    changes: List[dict] = []
+    # Work items: (old value, new value, path) pairs to compare, or finished changes
+    pending: list = [(old, new, '')]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, dict):
+            changes.append(item)
+            continue
+        a, b, path = item
+        if isinstance(a, dict) and isinstance(b, dict):
+            if a == b and _subtree_digest(a) == _subtree_digest(b):
+                continue
+            items = []
+            for key in sorted(a.keys() | b.keys()):
+                if key not in b:
+                    items.append({'op': 'removed', 'path': _pointer(path, key), 'value': a[key]})
+                elif key not in a:
+                    items.append({'op': 'added', 'path': _pointer(path, key), 'value': b[key]})
+                else:
+                    items.append((a[key], b[key], _pointer(path, key)))
+        elif isinstance(a, list) and isinstance(b, list):
+            if a == b and _subtree_digest(a) == _subtree_digest(b):
+                continue
+            items = _diff_arrays(a, b, path)
+        else:
+            if not _scalar_equal(a, b):
+                changes.append({'op': 'changed', 'path': path, 'old': a, 'new': b})
+            continue
+        # LIFO stack: push in reverse to report in document order
+        pending.extend(reversed(items))
+    return changes
+
+
+def compare_json(text1: str, text2: str) -> List[dict]:
+    """
+    Parse two JSON texts and diff them structurally (see json_diff)
+    
+    Raises:
+        ValueError: If either text is not valid JSON
+    """
+    if text1 == text2:
+        json.loads(text1)
+        return []
+    return json_diff(json.loads(text1), json.loads(text2))
+
+
+def _print_json_diff(text1: str, text2: str) -> int:
+    """Print a structural JSON diff, one JSON Pointer per line"""
+    changes = compare_json(text1, text2)
+    if not changes:
+        print("✓ JSON documents are equivalent")
+        return 0
+    
+    def show(value) -> str:
+        text = json.dumps(value, ensure_ascii=False)
+        return text if len(text) <= 80 else text[:77] + '...'
+    
+    counts = Counter(change['op'] for change in changes)
+    for change in changes:
+        path = change['path'] or '(root)'
+        if change['op'] == 'added':
+            print(f"+ {path}: {show(change['value'])}")
+        elif change['op'] == 'removed':
+            print(f"- {path}: {show(change['value'])}")
+        elif change['op'] == 'changed':
+            print(f"~ {path}: {show(change['old'])} -> {show(change['new'])}")
+        else:
+            print(f"> {change['from']} -> {path}")
+    print(f"\nSummary: {counts['added']} added, {counts['removed']} removed, "
+          f"{counts['changed']} changed, {counts['moved']} moved")
+    return 0
+
+
+def _print_block_diff(args) -> int:
+    """Print matching/differing byte ranges, or write a delta with --delta"""
+    if args.delta:
+        stats = write_delta(args.file1, args.file2, args.delta, args.block_size)
+        print(f"✓ Delta written to {args.delta} ({stats['delta_size']} bytes: "
+              f"{stats['copied']} copied, {stats['literal']} literal)")
+        return 0
+    
+    matched = differing = 0
+    # Identical needs every match at the same offset in both files, not just reordered blocks
+    in_place = True
+    for tag, offset2, length, offset1 in block_diff(args.file1, args.file2, args.block_size):
+        if tag == 'match':
+            matched += length
+            in_place = in_place and offset1 == offset2
+            print(f"  = {offset2}-{offset2 + length}  (file1 {offset1}-{offset1 + length})")
+        else:
+            differing += length
+            print(f"  ~ {offset2}-{offset2 + length}")
+    
+    total = matched + differing
+    if not differing and in_place and total == os.path.getsize(args.file1):
+        print("✓ File contents are identical")
+    else:
+        percent = matched / total * 100 if total else 100.0
+        print(f"\nMatched {matched} of {total} bytes ({percent:.2f}%), {differing} bytes differ")
+    return 0
+
+
+def _print_directory_diff(args) -> int:
+    """Print the tree summary and, with --show-diff, unified diffs of modified files"""
+    result = compare_directories(args.dir1, args.dir2, args.jobs, args.checksum)
+    
+    for title, marker in (('added', '+'), ('removed', '-'), ('modified', '~')):
+        if result[title]:
+            print(f"{title.capitalize()} ({len(result[title])}):")
+            for name in result[title]:
+                print(f"  {marker} {name}")
+    errors = result['errors']
+    if errors:
+        print(f"Unreadable ({len(errors)}):")
+        for name, error in errors.items():
+            print(f"  ! {name}: {error}")
+    
+    if args.show_diff:
+        for name in result['modified']:
+            path1, path2 = os.path.join(args.dir1, name), os.path.join(args.dir2, name)
+            try:
+                text1, text2 = read_text(path1), read_text(path2)
+            except UnicodeDecodeError:
+                print(f"\nBinary files {path1} and {path2} differ")
+                continue
+            except OSError as e:
+                print(f"\n⚠️ Warning: cannot diff {name}: {e}")
+                continue
+            print()
+            print(diff_summary(text1, text2, path1, path2, args.context, args.algorithm)['diff'], end='')
+    
+    changed = len(result['added']) + len(result['removed']) + len(result['modified'])
+    if not changed and not errors:
+        print(f"✓ Directory trees are identical ({result['unchanged']} files)")
+    else:
+        print(f"\nSummary: {len(result['added'])} added, {len(result['removed'])} removed, "
+              f"{len(result['modified'])} modified, {result['unchanged']} unchanged"
+              + (f", {len(errors)} unreadable" if errors else ""))
+    return 1 if errors else 0
+
+
 def main_function(args):
     """CLI Main function"""
     try:
-        if args.file1 and args.file2:
-            # Compare files
-            diff = compare_files(args.file1, args.file2, args.context)
-            if diff:
-                print(diff)
-                # Calculate similarity
-                with open(args.file1, 'r', encoding='utf-8') as f1:
-                    text1 = f1.read()
-                with open(args.file2, 'r', encoding='utf-8') as f2:
-                    text2 = f2.read()
-                similarity = get_similarity(text1, text2)
-                print(f"\nSimilarity: {similarity * 100:.2f}%")
-            else:
-                print("✓ File contents are identical")
+        if args.dir1 or args.dir2:
+            if not (args.dir1 and args.dir2):
+                print("❌ Error: Please provide both --dir1 and --dir2")
+                return 1
+            return _print_directory_diff(args)
+        
+        if args.apply:
+            if not (args.file1 and args.output):
+                print("❌ Error: --apply needs the base file (--file1) and --output")
+                return 1
+            size = apply_delta(args.file1, args.apply, args.output)
+            print(f"✓ Rebuilt {args.output} ({size} bytes)")
             return 0
-            
+        
+        if args.file1 and args.file2 and (args.blocks or args.delta):
+            return _print_block_diff(args)
+        
+        if args.file1 and args.file2:
+            # Compare files, reading each one exactly once
+            text1, text2 = read_text(args.file1), read_text(args.file2)
+            names, kind = (args.file1, args.file2), "File"
         elif args.text1 and args.text2:
-            # Compare texts
-            diff = compare_text(args.text1, args.text2, args.context)
-            if diff:
-                print(diff)
-                similarity = get_similarity(args.text1, args.text2)
-                print(f"\nSimilarity: {similarity * 100:.2f}%")
-            else:
-                print("✓ Text contents are identical")
-            return 0
+            text1, text2 = args.text1, args.text2
+            names, kind = ('text1', 'text2'), "Text"
         else:
-            print("❌ Error: Please provide files (--file1 --file2) or texts (--text1 --text2) to compare")
+            print("❌ Error: Please provide files (--file1 --file2), texts (--text1 --text2) "
+                  "or directories (--dir1 --dir2) to compare")
             return 1
+        
+        if args.json:
+            return _print_json_diff(text1, text2)
+        
+        # Diff, stats and similarity all come from a single matcher pass
+        summary = diff_summary(text1, text2, names[0], names[1], args.context, args.algorithm)
+        if summary['diff']:
+            print(summary['diff'])
+            print(f"\nSimilarity: {summary['similarity'] * 100:.2f}%")
+        else:
+            print(f"✓ {kind} contents are identical")
+        return 0
             
     except Exception as e:
         print(f"❌ Comparison failed: {e}")
@@ -239,7 +1482,7 @@ def register_parser(subparsers):
     parser = subparsers.add_parser(
         'diff',
         help='Text/File difference comparison tool',
-        description='Compare differences between two texts or files, showing detailed difference report'
+        description='Compare differences between two texts, files or directory trees, showing detailed difference report'
     )
     
     # File comparison options
@@ -250,8 +1493,34 @@ def register_parser(subparsers):
     parser.add_argument('--text1', '-t1', help='First text content')
     parser.add_argument('--text2', '-t2', help='Second text content')
     
+    parser.add_argument('--json', action='store_true',
+                       help='Compare as JSON documents: structural changes as JSON Pointer paths')
+    
+    # Block comparison options
+    parser.add_argument('--blocks', action='store_true',
+                       help='Compare files as byte blocks with a rolling checksum (constant memory)')
+    parser.add_argument('--block-size', type=int,
+                       help='Block size in bytes for --blocks (default: about sqrt of file size)')
+    parser.add_argument('--delta', metavar='PATH',
+                       help='Write a binary delta that rebuilds --file2 from --file1')
+    parser.add_argument('--apply', metavar='DELTA',
+                       help='Rebuild a file from --file1 and a delta, written to --output')
+    parser.add_argument('--output', '-o', help='Output path for --apply')
+    
+    # Directory comparison options
+    parser.add_argument('--dir1', '-d1', help='First directory path')
+    parser.add_argument('--dir2', '-d2', help='Second directory path')
+    parser.add_argument('--show-diff', action='store_true',
+                       help='With directories, also print unified diffs of modified files')
+    parser.add_argument('--checksum', action='store_true',
+                       help='With directories, hash files even when size and mtime match')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                       help='Hashing threads for directories (0 = default pool size)')
+    
     # Context lines
     parser.add_argument('--context', '-c', type=int, default=3,
                        help='Number of context lines to show (default: 3)')
+    parser.add_argument('--algorithm', '-a', choices=ALGORITHMS, default=DEFAULT_ALGORITHM,
+                       help=f'Line diff engine (default: {DEFAULT_ALGORITHM})')
     
     parser.set_defaults(func=main_function)
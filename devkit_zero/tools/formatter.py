@@ -1,10 +1,412 @@
 
 
 import argparse
+import bisect
+import hashlib
+import io
+import json
+import keyword
 import sys
 import os
 import re
-from typing import Optional, Tuple
+import stat
+import subprocess
+import tempfile
+import threading
+import tokenize
+from collections import OrderedDict, deque
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    from ..__version__ import __version__
+except ImportError:
+    # Running as a standalone script
+    __version__ = "standalone"
+
+DEFAULT_CACHE_DIR = os.path.join('.devkit_cache', 'format')
+# Number of most recent "already formatted" hashes kept in the cache
+DEFAULT_CACHE_MAX_ENTRIES = 100000
+# Number of (content hash -> formatted output) results kept by --serve
+DEFAULT_SERVE_CACHE_ENTRIES = 256
+SOURCE_EXTENSIONS = {'.py': 'python', '.js': 'javascript', '.jsx': 'javascript'}
+SKIP_DIRS = {'.git', '.hg', '.svn', '__pycache__', 'node_modules', 'venv', '.venv', '.tox',
+             'build', 'dist', '.devkit_cache', '.pytest_cache'}
+# Hunk header of `git diff -U0`; captures the new start line and line count
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def _format_python_lines(code: str) -> str:
+    """
+    Line-based Python formatting, used as a fallback for code that does not parse
+    
+    Re-indents from line endings (':' opens a block) and applies regex
+    operator spacing, so it can repair lost indentation but may touch text
+    inside strings and comments.
+    """
+    lines = code.split('\n')
+    formatted_lines = []
+    indent_level = 0
+    in_multiline_string = False
+    string_delimiter = None
+
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+
+        # Handle empty lines
+        if not stripped:
+            formatted_lines.append('')
+            continue
+
+        # Detect multiline strings
+        if '"""' in stripped or "'''" in stripped:
+            if not in_multiline_string:
+                in_multiline_string = True
+                string_delimiter = '"""' if '"""' in stripped else "'''"
+                formatted_lines.append('    ' * indent_level + stripped)
+                if stripped.count(string_delimiter) >= 2:
+                    in_multiline_string = False
+                continue
+            else:
+                formatted_lines.append('    ' * indent_level + stripped)
+                if string_delimiter in stripped:
+                    in_multiline_string = False
+                continue
+
+        # Inside multiline string, keep as is
+        if in_multiline_string:
+            formatted_lines.append('    ' * indent_level + stripped)
+            continue
+
+        # Handle indentation reduction (else, elif, except, finally, case)
+        if stripped.startswith(('else:', 'elif ', 'except:', 'except ', 'finally:', 'case ', 'case:')):
+            indent_level = max(0, indent_level - 1)
+            formatted_lines.append('    ' * indent_level + stripped)
+            indent_level += 1
+            continue
+
+        # Handle closing brackets/braces
+        if stripped.startswith(('}', ']', ')')):
+            indent_level = max(0, indent_level - 1)
+
+        # Add formatted line
+        formatted_lines.append('    ' * indent_level + stripped)
+
+        # Handle indentation increase
+        if stripped.rstrip().endswith(':'):
+            # Function, class, if, for, while, with, try, etc.
+            indent_level += 1
+        elif stripped.rstrip().endswith(('{', '(')):
+            indent_level += 1
+        elif stripped.rstrip().endswith('[') and not stripped.rstrip().endswith('[]'):
+            indent_level += 1
+
+        # Handle indentation decrease - after single line statement
+        if indent_level > 0:
+            # Check if it is a single line statement (pass, return, break, continue, etc.)
+            if any(stripped.startswith(kw) for kw in ['pass', 'return ', 'break', 'continue', 'raise ']):
+                # Check next line, if not same level or deeper indentation, decrease indentation
+                if i + 1 < len(lines):
+                    next_line = lines[i + 1].strip()
+                    if next_line and not next_line.startswith(('else:', 'elif ', 'except:', 'except ', 'finally:')):
+                        # If next line is not empty and not control flow keyword, might need adjustment
+                        pass
+
+    # Post-processing: Remove excess empty lines, keep at most 2 consecutive empty lines
+    final_lines = []
+    empty_count = 0
+    for line in formatted_lines:
+        if not line.strip():
+            empty_count += 1
+            if empty_count <= 2:
+                final_lines.append(line)
+        else:
+            empty_count = 0
+            final_lines.append(line)
+
+    # Add spaces around operators
+    result = '\n'.join(final_lines)
+
+    # Format operator spaces (simple version)
+    # Add spaces around =
+    result = re.sub(r'(\w)=(\w)', r'\1 = \2', result)
+    result = re.sub(r'(\w)=(\()', r'\1 = \2', result)
+
+    # Add spaces around +, -, *, /
+    result = re.sub(r'(\w)\+(\w)', r'\1 + \2', result)
+    result = re.sub(r'(\w)-(\w)', r'\1 - \2', result)
+    result = re.sub(r'(\w)\*(\w)', r'\1 * \2', result)
+    result = re.sub(r'(\w)/(\w)', r'\1 / \2', result)
+
+    # Add space after comma
+    result = re.sub(r',(\w)', r', \1', result)
+
+    return result
+
+
+# Operators that get one space on each side when used as binary operators
+_PY_BINARY_OPS = frozenset((
+    '=', '==', '!=', '<', '>', '<=', '>=', '<>', '+', '-', '*', '/', '//', '%', '**', '@',
+    '|', '&', '^', '<<', '>>', '->', ':=', '+=', '-=', '*=', '/=', '//=', '%=', '**=',
+    '@=', '|=', '&=', '^=', '<<=', '>>=',
+))
+_PY_UNARY_OPS = frozenset(('-', '+', '~', '*', '**', '@'))
+_PY_OPEN = frozenset('([{')
+_PY_CLOSE = frozenset(')]}')
+_PY_NO_SPACE_BEFORE = frozenset((')', ']', '}', ',', ';', ':'))
+# Keywords after which an operator is unary and a bracket is not a call/subscript
+_PY_KEYWORDS = frozenset(keyword.kwlist) - {'True', 'False', 'None'}
+# Soft keywords that only act as keywords when they start a block statement
+_PY_SOFT_KEYWORDS = frozenset(('match', 'case'))
+_FSTRING_START = getattr(tokenize, 'FSTRING_START', None)
+_FSTRING_END = getattr(tokenize, 'FSTRING_END', None)
+
+
+def _is_block_header(tokens: Iterator[tuple], lookahead: 'deque') -> bool:
+    """
+    Read tokens up to the end of the logical line into lookahead and tell
+    whether the line is a block header (ends with ':' outside brackets)
+    """
+    level = 0
+    last = None
+    for token in tokens:
+        lookahead.append(token)
+        tok_type, tok_str = token[0], token[1]
+        if tok_type == tokenize.NEWLINE or tok_type == tokenize.ENDMARKER:
+            break
+        if tok_type == tokenize.OP:
+            if tok_str in _PY_OPEN:
+                level += 1
+            elif tok_str in _PY_CLOSE:
+                level -= 1
+        if tok_type != tokenize.COMMENT and tok_type != tokenize.NL:
+            last = (tok_type, tok_str, level)
+    return last == (tokenize.OP, ':', 0)
+
+
+def _format_python_tokens(code: str, base_indent: Optional[str] = None) -> str:
+    """
+    Format Python code in a single pass over its tokens
+    
+    Indentation is rebuilt from INDENT/DEDENT tokens (4 spaces per level),
+    continuation lines get one level per bracket line still open, and
+    spacing is decided from each pair of adjacent tokens. Strings,
+    f-strings and comment text are copied verbatim. At most two
+    consecutive blank lines are kept and trailing whitespace is removed.
+    
+    With base_indent, code is an indented fragment whose first line keeps
+    that indentation; nested levels are rebuilt relative to it and every
+    input line maps to exactly one output line (no blank line merging).
+    """
+    NAME, OP, STRING, NUMBER, COMMENT = tokenize.NAME, tokenize.OP, tokenize.STRING, tokenize.NUMBER, tokenize.COMMENT
+    NEWLINE, NL, INDENT, DEDENT = tokenize.NEWLINE, tokenize.NL, tokenize.INDENT, tokenize.DEDENT
+    unary_ops, keywords, no_space_before = _PY_UNARY_OPS, _PY_KEYWORDS, _PY_NO_SPACE_BEFORE
+    special_types = {NEWLINE, NL, INDENT, DEDENT, tokenize.ENDMARKER, tokenize.ENCODING, _FSTRING_START}
+    
+    out: List[str] = []
+    parts: List[str] = []
+    depth = 0
+    indent_widths = [0]
+    # Open brackets: [char, output line it was opened on, '(' parameter has an annotation]
+    brackets: List[list] = []
+    # Bracket depths of lambdas whose parameter list has not ended yet
+    lambdas: List[int] = []
+    # Indentation depths of the match statements whose case blocks are open
+    match_depths: List[int] = []
+    blank_run = 0
+    prev_type = prev_str = None
+    prev_unary = prev_kwarg = prev_keyword = prev_lambda_colon = False
+    last_row = 0
+    source_lines = None
+    keep_lines = base_indent is not None
+    if keep_lines and base_indent:
+        # The fragment's own INDENT token (level 1) maps to base_indent
+        pad = lambda level: base_indent + '    ' * (level - 1) if level > 0 else ''
+    else:
+        pad = lambda level: '    ' * level
+    
+    raw_tokens = tokenize.generate_tokens(io.StringIO(code).readline)
+    # Tokens read ahead to classify a soft keyword, replayed before the rest
+    lookahead: 'deque' = deque()
+    
+    def token_stream():
+        for token in raw_tokens:
+            yield token
+            while lookahead:
+                yield lookahead.popleft()
+    
+    # Only pay for the replay wrapper when a soft keyword can occur
+    tokens = token_stream() if 'match' in code or 'case' in code else raw_tokens
+    for tok_type, tok_str, start, end, _ in tokens:
+        soft_keyword = False
+        if tok_type in special_types:
+            if tok_type == NEWLINE or tok_type == NL:
+                if parts:
+                    out.append(''.join(parts))
+                    parts = []
+                    blank_run = 0
+                elif keep_lines:
+                    out.append('')
+                elif tok_type == NL and not brackets:
+                    blank_run += 1
+                    if blank_run <= 2:
+                        out.append('')
+                prev_type = None
+                last_row = end[0]
+                continue
+            if tok_type == INDENT:
+                depth += 1
+                indent_widths.append(len(tok_str.expandtabs(8)))
+                continue
+            if tok_type == DEDENT:
+                depth -= 1
+                indent_widths.pop()
+                continue
+            if tok_type != _FSTRING_START:
+                continue
+            
+            # Copy the whole (possibly nested) f-string from the source
+            if source_lines is None:
+                source_lines = code.splitlines(keepends=True)
+            nesting = 1
+            for inner in tokens:
+                if inner[0] == _FSTRING_START:
+                    nesting += 1
+                elif inner[0] == _FSTRING_END:
+                    nesting -= 1
+                    if not nesting:
+                        break
+            end = inner[3]
+            if start[0] == end[0]:
+                tok_str = source_lines[start[0] - 1][start[1]:end[1]]
+            else:
+                tok_str = ''.join(
+                    [source_lines[start[0] - 1][start[1]:]] + source_lines[start[0]:end[0] - 1]
+                    + [source_lines[end[0] - 1][:end[1]]]
+                )
+            tok_type = STRING
+        
+        if not parts:
+            # First token of an output line
+            if brackets:
+                first_close = tok_str in _PY_CLOSE
+                innermost_line = brackets[-1][1]
+                levels = len({b[1] for b in brackets if not (first_close and b[1] == innermost_line)})
+            else:
+                levels = 0
+            if tok_type == COMMENT and not brackets:
+                # Place own-line comments by their original column
+                column = start[1]
+                level = 0
+                while level + 1 < len(indent_widths) and indent_widths[level + 1] <= column:
+                    level += 1
+                if column > indent_widths[-1]:
+                    level = len(indent_widths)
+                parts.append(pad(level) + tok_str.rstrip())
+                last_row = end[0]
+                continue
+            parts.append(pad(depth + levels))
+            space = False
+            if not brackets:
+                while match_depths and depth <= match_depths[-1]:
+                    match_depths.pop()
+                if tok_type == NAME and tok_str in _PY_SOFT_KEYWORDS:
+                    # "case" directly inside a match block, otherwise a statement header
+                    soft_keyword = (
+                        (tok_str == 'case' and bool(match_depths) and depth == match_depths[-1] + 1)
+                        or _is_block_header(raw_tokens, lookahead)
+                    )
+                    if soft_keyword and tok_str == 'match':
+                        match_depths.append(depth)
+        elif tok_type == COMMENT:
+            parts.append('  ' + tok_str.rstrip())
+            last_row = end[0]
+            continue
+        else:
+            if start[0] > last_row:
+                # Explicit backslash continuation
+                out.append(''.join(parts) + ' \\')
+                levels = len({b[1] for b in brackets})
+                parts = [pad(depth + levels + 1)]
+                space = False
+            elif prev_unary:
+                space = False
+            elif tok_str in no_space_before:
+                space = False
+            elif prev_str in _PY_OPEN and prev_type == OP:
+                space = False
+            elif tok_str == '.':
+                space = prev_type == NUMBER or prev_str == 'from' or prev_str == 'import'
+            elif prev_str == '.' and prev_type == OP:
+                space = tok_str == 'import'
+            elif tok_str == '=' and (
+                (brackets and brackets[-1][0] == '(' and not brackets[-1][2])
+                or (lambdas and lambdas[-1] == len(brackets))
+            ):
+                space = False
+            elif prev_kwarg:
+                space = False
+            elif prev_str == ':' and prev_type == OP:
+                space = prev_lambda_colon or not (brackets and brackets[-1][0] == '[')
+            elif tok_str == '(' or tok_str == '[':
+                space = not (
+                    (prev_type == NAME and not prev_keyword)
+                    or prev_str in _PY_CLOSE or prev_type == STRING
+                )
+            else:
+                space = True
+            if space:
+                parts.append(' ')
+        
+        parts.append(tok_str)
+        
+        # Update state for the next token
+        prev_kwarg = False
+        prev_unary = False
+        prev_lambda_colon = False
+        if tok_type == OP:
+            if tok_str in _PY_OPEN:
+                brackets.append([tok_str, len(out), False])
+            elif tok_str in _PY_CLOSE:
+                if brackets:
+                    brackets.pop()
+            elif tok_str == ',':
+                if brackets:
+                    brackets[-1][2] = False
+            elif tok_str == ':':
+                if lambdas and lambdas[-1] == len(brackets):
+                    lambdas.pop()
+                    prev_lambda_colon = True
+                elif brackets and brackets[-1][0] == '(':
+                    brackets[-1][2] = True
+            elif tok_str == '=':
+                prev_kwarg = (
+                    (bool(brackets) and brackets[-1][0] == '(' and not brackets[-1][2])
+                    or (bool(lambdas) and lambdas[-1] == len(brackets))
+                )
+            if tok_str in unary_ops:
+                prev_unary = (
+                    prev_type is None
+                    or (prev_type == OP and prev_str not in _PY_CLOSE and prev_str != '...')
+                    or prev_keyword
+                )
+                if tok_str == '@' and prev_type is not None:
+                    prev_unary = False
+        elif tok_str == 'lambda' and tok_type == NAME:
+            lambdas.append(len(brackets))
+        prev_keyword = soft_keyword or (tok_type == NAME and tok_str in keywords)
+        prev_type = tok_type
+        prev_str = tok_str
+        last_row = end[0]
+    
+    if parts:
+        out.append(''.join(parts))
+    while out and not out[-1] and not keep_lines:
+        out.pop()
+    
+    result = '\n'.join(out)
+    if result and code.endswith('\n'):
+        result += '\n'
+    return result
 
 
 def format_python_code(code: str, ignore_errors: bool = False) -> Tuple[str, Optional[str]]:
@@ -12,6 +414,11 @@ def format_python_code(code: str, ignore_errors: bool = False) -> Tuple[str, Opt
     Format Python code
     Use intelligent indentation and spacing
     
+    Valid code is formatted by a single-pass tokenizer engine that leaves
+    strings and comments untouched. Code with syntax errors (when
+    ignore_errors is set) goes through the line-based engine, which can
+    also repair lost indentation.
+    
     Args:
         code: Code string to format
         ignore_errors: Whether to ignore syntax errors and attempt formatting
@@ -32,109 +439,391 @@ def format_python_code(code: str, ignore_errors: bool = False) -> Tuple[str, Opt
             return code, error_msg
     
     try:
-        lines = code.split('\n')
-        formatted_lines = []
-        indent_level = 0
-        in_multiline_string = False
-        string_delimiter = None
-        
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            
-            # Handle empty lines
-            if not stripped:
-                formatted_lines.append('')
+        if error_msg is None:
+            return _format_python_tokens(code), None
+        return _format_python_lines(code), error_msg
+        
+    except Exception as e:
+        if ignore_errors:
+            return code, f"Formatting error: {str(e)}"
+        return code, f"Formatting failed: {str(e)}"
+
+
+# JavaScript lexer tables
+_JS_TOKEN_RE = re.compile(
+    r'(?P<ws>[ \t\f\v\r﻿]+)'
+    r'|(?P<nl>\n)'
+    r'|(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|#![^\n]*)'
+    r'|(?P<number>(?:0[xXbBoO][\da-fA-F_]+|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?)n?)'
+    r'|(?P<name>#?(?:[^\W\d]|\$)[\w$]*)'
+    r'|(?P<punct>>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=|<=|>=|&&|\|\|'
+    r'|\?\?|\?\.(?!\d)|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|\*\*|<<|>>|[{}()\[\];,<>+\-*/%&|^!~?:=.@])'
+)
+_JS_STRING_RE = re.compile(r'"(?:[^"\\\n]|\\[\s\S])*"|\'(?:[^\'\\\n]|\\[\s\S])*\'')
+_JS_REGEX_RE = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_JS_TEMPLATE_CHUNK_RE = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*')
+_JS_JSX_TEXT_RE = re.compile(r'[^<{]*')
+_JS_JSX_TAG_RE = re.compile(r'[^>"\'{]*')
+_JS_OPEN = frozenset('([{')
+_JS_CLOSE = frozenset(')]}')
+_JS_PAIRS = {')': '(', ']': '[', '}': '{'}
+# Keywords after which an expression (and so a regex or a prefix operator) starts
+_JS_EXPRESSION_KEYWORDS = frozenset((
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw',
+    'case', 'do', 'else', 'yield', 'await', 'extends',
+))
+# Keywords separated by a space from a following '(' or '['
+_JS_SPACED_KEYWORDS = _JS_EXPRESSION_KEYWORDS | frozenset((
+    'if', 'for', 'while', 'switch', 'catch', 'with', 'try', 'finally',
+    'const', 'let', 'var', 'export', 'async',
+))
+# Keywords whose parenthesized head ends a statement prefix: `if (x) /re/.test(s)`
+_JS_HEAD_KEYWORDS = frozenset(('if', 'while', 'for', 'with'))
+
+
+class _JSLexer:
+    """
+    Linear JavaScript tokenizer
+    
+    Produces (kind, text) tokens where kind is one of nl, comment, string,
+    template, regex, jsx, number, name or punct. Whitespace is dropped.
+    Template literals (with nested ${...} expressions), regex literals and
+    JSX elements are returned as single verbatim tokens. A regex literal is
+    recognized where an expression may start, decided from the previous
+    significant token. The first lexical problem (unterminated literal,
+    unbalanced bracket) is kept in self.error as (line, message).
+    """
+    
+    def __init__(self, code: str):
+        self.code = code
+        self.error: Optional[Tuple[int, str]] = None
+    
+    def _fail(self, pos: int, message: str):
+        if self.error is None:
+            self.error = (self.code.count('\n', 0, pos) + 1, message)
+    
+    def tokens(self, pos: int = 0, until_close: bool = False) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Tokenize from pos
+        
+        With until_close, stop after the '}' that closes an embedded
+        expression and return the position following it.
+        """
+        code = self.code
+        n = len(code)
+        match_token = _JS_TOKEN_RE.match
+        out: List[Tuple[str, str]] = []
+        # Open brackets: (char, position)
+        stack: List[Tuple[str, int]] = []
+        # One flag per open '(': whether it is an if/while/for/with head
+        heads: List[bool] = []
+        regex_ok = True
+        prev_kind = prev_text = None
+        
+        while pos < n:
+            char = code[pos]
+            if char == '`':
+                end = self._template(pos)
+                out.append(('template', code[pos:end]))
+                pos = end
+                regex_ok = False
+                prev_kind, prev_text = 'template', None
                 continue
-            
-            # Detect multiline strings
-            if '"""' in stripped or "'''" in stripped:
-                if not in_multiline_string:
-                    in_multiline_string = True
-                    string_delimiter = '"""' if '"""' in stripped else "'''"
-                    formatted_lines.append('    ' * indent_level + stripped)
-                    if stripped.count(string_delimiter) >= 2:
-                        in_multiline_string = False
-                    continue
+            if char == '"' or char == "'":
+                match = _JS_STRING_RE.match(code, pos)
+                if match:
+                    end = match.end()
                 else:
-                    formatted_lines.append('    ' * indent_level + stripped)
-                    if string_delimiter in stripped:
-                        in_multiline_string = False
-                    continue
-            
-            # Inside multiline string, keep as is
-            if in_multiline_string:
-                formatted_lines.append('    ' * indent_level + stripped)
+                    self._fail(pos, "Unterminated string literal")
+                    end = code.find('\n', pos)
+                    end = n if end < 0 else end
+                out.append(('string', code[pos:end]))
+                pos = end
+                regex_ok = False
+                prev_kind, prev_text = 'string', None
                 continue
+            if regex_ok:
+                if char == '/':
+                    match = _JS_REGEX_RE.match(code, pos)
+                    if match:
+                        out.append(('regex', match.group()))
+                        pos = match.end()
+                        regex_ok = False
+                        prev_kind, prev_text = 'regex', None
+                        continue
+                elif char == '<':
+                    end = self._jsx(pos)
+                    if end is not None:
+                        out.append(('jsx', code[pos:end]))
+                        pos = end
+                        regex_ok = False
+                        prev_kind, prev_text = 'jsx', None
+                        continue
             
-            # Handle indentation reduction (else, elif, except, finally, case)
-            if stripped.startswith(('else:', 'elif ', 'except:', 'except ', 'finally:', 'case ', 'case:')):
-                indent_level = max(0, indent_level - 1)
-                formatted_lines.append('    ' * indent_level + stripped)
-                indent_level += 1
-                continue
-            
-            # Handle closing brackets/braces
-            if stripped.startswith(('}', ']', ')')):
-                indent_level = max(0, indent_level - 1)
-            
-            # Add formatted line
-            formatted_lines.append('    ' * indent_level + stripped)
+            match = match_token(code, pos)
+            if match is None:
+                # Unknown character (e.g. a stray backslash): keep it as punctuation
+                kind, text = 'punct', char
+                pos += 1
+            else:
+                kind, text = match.lastgroup, match.group()
+                pos = match.end()
             
-            # Handle indentation increase
-            if stripped.rstrip().endswith(':'):
-                # Function, class, if, for, while, with, try, etc.
-                indent_level += 1
-            elif stripped.rstrip().endswith(('{', '(')):
-                indent_level += 1
-            elif stripped.rstrip().endswith('[') and not stripped.rstrip().endswith('[]'):
-                indent_level += 1
+            if kind == 'ws':
+                continue
+            if kind == 'nl' or kind == 'comment':
+                if text.startswith('/*') and (len(text) < 4 or not text.endswith('*/')):
+                    self._fail(pos - len(text), "Unterminated comment")
+                out.append((kind, text))
+                continue
             
-            # Handle indentation decrease - after single line statement
-            if indent_level > 0:
-                # Check if it is a single line statement (pass, return, break, continue, etc.)
-                if any(stripped.startswith(kw) for kw in ['pass', 'return ', 'break', 'continue', 'raise ']):
-                    # Check next line, if not same level or deeper indentation, decrease indentation
-                    if i + 1 < len(lines):
-                        next_line = lines[i + 1].strip()
-                        if next_line and not next_line.startswith(('else:', 'elif ', 'except:', 'except ', 'finally:')):
-                            # If next line is not empty and not control flow keyword, might need adjustment
-                            pass
-        
-        # Post-processing: Remove excess empty lines, keep at most 2 consecutive empty lines
-        final_lines = []
-        empty_count = 0
-        for line in formatted_lines:
-            if not line.strip():
-                empty_count += 1
-                if empty_count <= 2:
-                    final_lines.append(line)
+            if kind == 'punct':
+                if text in _JS_OPEN:
+                    stack.append((text, pos - 1))
+                    if text == '(':
+                        heads.append(prev_kind == 'name' and prev_text in _JS_HEAD_KEYWORDS)
+                    regex_ok = True
+                elif text in _JS_CLOSE:
+                    if not stack:
+                        if until_close and text == '}':
+                            return out, pos
+                        self._fail(pos - 1, f"Unmatched '{text}'")
+                    elif stack.pop()[0] != _JS_PAIRS[text]:
+                        self._fail(pos - 1, f"Mismatched '{text}'")
+                    head = heads.pop() if text == ')' and heads else False
+                    regex_ok = text == '}' or head
+                else:
+                    regex_ok = text not in ('++', '--')
+            elif kind == 'name':
+                regex_ok = text in _JS_EXPRESSION_KEYWORDS
             else:
-                empty_count = 0
-                final_lines.append(line)
-        
-        # Add spaces around operators
-        result = '\n'.join(final_lines)
+                regex_ok = False
+            out.append((kind, text))
+            prev_kind, prev_text = kind, text
         
-        # Format operator spaces (simple version)
-        # Add spaces around =
-        result = re.sub(r'(\w)=(\w)', r'\1 = \2', result)
-        result = re.sub(r'(\w)=(\()', r'\1 = \2', result)
-        
-        # Add spaces around +, -, *, /
-        result = re.sub(r'(\w)\+(\w)', r'\1 + \2', result)
-        result = re.sub(r'(\w)-(\w)', r'\1 - \2', result)
-        result = re.sub(r'(\w)\*(\w)', r'\1 * \2', result)
-        result = re.sub(r'(\w)/(\w)', r'\1 / \2', result)
+        if until_close:
+            return out, n
+        if stack:
+            self._fail(stack[-1][1], f"Unclosed '{stack[-1][0]}'")
+        return out, n
+    
+    def _template(self, pos: int) -> int:
+        """End position of the template literal starting at pos"""
+        code = self.code
+        n = len(code)
+        i = pos + 1
+        while True:
+            i = _JS_TEMPLATE_CHUNK_RE.match(code, i).end()
+            if i < n and code[i] == '`':
+                return i + 1
+            if not code.startswith('${', i):
+                self._fail(pos, "Unterminated template literal")
+                return n
+            _, i = self.tokens(i + 2, until_close=True)
+    
+    def _jsx(self, pos: int) -> Optional[int]:
+        """End position of the JSX element starting at pos, or None if it is not one"""
+        code = self.code
+        n = len(code)
+        following = code[pos + 1:pos + 2]
+        if not (following == '>' or following.isalpha()):
+            return None
         
-        # Add space after comma
-        result = re.sub(r',(\w)', r', \1', result)
+        saved_error = self.error
+        depth = 0
+        i = pos
+        while i < n:
+            if code[i] == '<':
+                closing = code.startswith('</', i)
+                i += 1
+                while True:
+                    i = _JS_JSX_TAG_RE.match(code, i).end()
+                    if i >= n:
+                        self.error = saved_error
+                        return None
+                    char = code[i]
+                    if char == '>':
+                        break
+                    if char == '{':
+                        _, i = self.tokens(i + 1, until_close=True)
+                    else:
+                        end = code.find(char, i + 1)
+                        if end < 0:
+                            self.error = saved_error
+                            return None
+                        i = end + 1
+                self_closing = code[i - 1] == '/'
+                i += 1
+                if closing:
+                    depth -= 1
+                elif not self_closing:
+                    depth += 1
+                if depth <= 0:
+                    return i
+            else:
+                _, i = self.tokens(i + 1, until_close=True)
+            i = _JS_JSX_TEXT_RE.match(code, i).end()
+        self.error = saved_error
+        return None
+
+
+def _reindent_block_comment(text: str, indent: str) -> str:
+    """Align the ' * ' continuation lines of a block comment with its first line"""
+    lines = text.split('\n')
+    for index in range(1, len(lines)):
+        stripped = lines[index].lstrip()
+        if stripped.startswith('*'):
+            lines[index] = indent + ' ' + stripped
+    return '\n'.join(lines)
+
+
+def _js_error_message(lexer: _JSLexer) -> Optional[str]:
+    """Error message for the first lexical problem the lexer found, if any"""
+    if not lexer.error:
+        return None
+    line, message = lexer.error
+    return f"JavaScript Syntax Error (Line {line}): {message}"
+
+
+def _format_javascript_tokens(code: str, keep_lines: bool = False) -> Tuple[str, Optional[str]]:
+    """
+    Format JavaScript code in a single pass over its tokens
+    
+    Line breaks are kept. Each line is indented by 2 spaces per line that
+    still has an open bracket, and spacing is decided from each pair of
+    adjacent tokens. Strings, template literals, regex literals, JSX and
+    comment text are copied verbatim. At most two consecutive blank lines
+    are kept unless keep_lines is set, in which case every input line maps
+    to exactly one output line.
+    
+    Returns:
+        (formatted_code, error_message) - error_message describes the first
+        lexical problem, if any
+    """
+    lexer = _JSLexer(code)
+    tokens, _ = lexer.tokens()
+    
+    out: List[str] = []
+    parts: List[str] = []
+    # Open brackets: [char, output line it was opened on]
+    brackets: List[list] = []
+    # Pending ternary '?' per bracket level
+    ternaries = [0]
+    blank_run = 0
+    prev_kind = prev_text = None
+    prev_unary = prev_postfix = False
+    count = len(tokens)
+    
+    for index, (kind, text) in enumerate(tokens):
+        if kind == 'nl':
+            if parts:
+                out.append(''.join(parts))
+                parts = []
+                blank_run = 0
+            else:
+                blank_run += 1
+                if keep_lines or blank_run <= 2:
+                    out.append('')
+            prev_kind = prev_text = None
+            prev_unary = prev_postfix = False
+            continue
         
-        return result, error_msg
+        is_punct = kind == 'punct'
+        if not parts:
+            # First token of a line: closing brackets at the start dedent it
+            closers = 0
+            while (index + closers < count and tokens[index + closers][0] == 'punct'
+                   and tokens[index + closers][1] in _JS_CLOSE):
+                closers += 1
+            live = brackets[:len(brackets) - closers] if closers else brackets
+            indent = '  ' * len({entry[1] for entry in live})
+            parts.append(indent)
+            if kind == 'comment' and '\n' in text:
+                text = _reindent_block_comment(text, indent)
+        else:
+            if kind == 'comment':
+                space = True
+            elif prev_unary:
+                space = False
+            elif is_punct and text in (')', ']', ',', ';'):
+                space = False
+            elif is_punct and text == '}':
+                space = not (prev_kind == 'punct' and prev_text == '{')
+            elif prev_kind == 'punct' and prev_text in ('(', '['):
+                space = False
+            elif is_punct and text in ('.', '?.'):
+                space = prev_kind == 'number' and prev_text.isdigit()
+            elif prev_kind == 'punct' and prev_text in ('.', '?.'):
+                space = False
+            elif is_punct and text in ('++', '--') and not (
+                prev_kind is None or (prev_kind == 'punct' and prev_text not in _JS_CLOSE)
+                or (prev_kind == 'name' and prev_text in _JS_EXPRESSION_KEYWORDS)
+            ):
+                # Postfix increment
+                space = False
+            elif (is_punct and text in ('(', '[')) or kind == 'template':
+                space = not (
+                    (prev_kind == 'name' and prev_text not in _JS_SPACED_KEYWORDS)
+                    or (prev_kind == 'punct' and prev_text in (')', ']'))
+                    or (text == '[' and prev_kind in ('string', 'template', 'regex', 'number'))
+                )
+            elif is_punct and text == ':':
+                space = ternaries[-1] > 0
+            elif is_punct and text == '*' and prev_kind == 'name' and prev_text in ('function', 'yield'):
+                space = False
+            else:
+                space = True
+            if (not space and is_punct and prev_kind == 'punct'
+                    and text[0] in '+-' and prev_text[-1] == text[0]):
+                # Keep `- -x` and `+ +x` apart
+                space = True
+            if space:
+                parts.append(' ')
+        parts.append(text)
         
-    except Exception as e:
-        if ignore_errors:
-            return code, f"Formatting error: {str(e)}"
-        return code, f"Formatting failed: {str(e)}"
+        # Update state for the next token
+        prefix_position = (
+            prev_kind is None
+            or (prev_kind == 'punct' and prev_text not in _JS_CLOSE and not prev_postfix)
+            or (prev_kind == 'name' and prev_text in _JS_EXPRESSION_KEYWORDS)
+        )
+        prev_unary = prev_postfix = False
+        if is_punct:
+            if text in _JS_OPEN:
+                brackets.append([text, len(out)])
+                ternaries.append(0)
+            elif text in _JS_CLOSE:
+                if brackets:
+                    brackets.pop()
+                if len(ternaries) > 1:
+                    ternaries.pop()
+            elif text == '?':
+                ternaries[-1] += 1
+            elif text == ':':
+                if ternaries[-1]:
+                    ternaries[-1] -= 1
+            elif text in ('!', '~', '...', '@'):
+                prev_unary = True
+            elif text == '*' and prev_kind == 'name' and prev_text in ('function', 'yield'):
+                pass
+            elif text in ('+', '-', '*'):
+                prev_unary = prefix_position
+            elif text in ('++', '--'):
+                prev_unary = prefix_position
+                prev_postfix = not prefix_position
+        prev_kind = kind
+        prev_text = text
+    
+    if parts:
+        out.append(''.join(parts))
+    while out and not out[-1] and not keep_lines:
+        out.pop()
+    
+    result = '\n'.join(out)
+    if result and code.endswith('\n'):
+        result += '\n'
+    
+    return result, _js_error_message(lexer)
 
 
 def format_javascript_code(code: str, ignore_errors: bool = False) -> Tuple[str, Optional[str]]:
@@ -142,6 +831,11 @@ def format_javascript_code(code: str, ignore_errors: bool = False) -> Tuple[str,
     Format JavaScript code
     Intelligent indentation and spacing handling
     
+    The code is tokenized in one linear pass, so strings, template
+    literals, regex literals, URLs inside them and comments are never
+    modified. Unterminated literals or unbalanced brackets are reported as
+    syntax errors.
+    
     Args:
         code: Code string to format
         ignore_errors: Whether to ignore errors and continue formatting
@@ -150,80 +844,10 @@ def format_javascript_code(code: str, ignore_errors: bool = False) -> Tuple[str,
         (formatted_code, error_message) - Formatted code and error message (if any)
     """
     try:
-        lines = code.split('\n')
-        formatted_lines = []
-        indent_level = 0
-        in_multiline_comment = False
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Handle empty lines
-            if not stripped:
-                formatted_lines.append('')
-                continue
-            
-            # Handle multiline comments
-            if '/*' in stripped and '*/' not in stripped:
-                in_multiline_comment = True
-                formatted_lines.append('  ' * indent_level + stripped)
-                continue
-            elif '*/' in stripped:
-                formatted_lines.append('  ' * indent_level + stripped)
-                if in_multiline_comment:
-                    in_multiline_comment = False
-                continue
-            elif in_multiline_comment:
-                formatted_lines.append('  ' * indent_level + stripped)
-                continue
-            
-            # Handle closing braces
-            if stripped.startswith('}'):
-                indent_level = max(0, indent_level - 1)
-                formatted_lines.append('  ' * indent_level + stripped)
-                # Handle } else {, } catch {, } finally { etc.
-                if '{' in stripped:
-                    indent_level += 1
-                continue
-            
-            # Handle closing brackets and parentheses
-            if stripped.startswith((']', ')')):
-                indent_level = max(0, indent_level - 1)
-            
-            # Add formatted line
-            formatted_lines.append('  ' * indent_level + stripped)
-            
-            # Handle indentation increase
-            if stripped.rstrip().endswith('{'):
-                indent_level += 1
-            elif stripped.rstrip().endswith('(') and not stripped.startswith(('if', 'for', 'while', 'function')):
-                indent_level += 1
-            elif stripped.rstrip().endswith('[') and not stripped.rstrip().endswith('[]'):
-                indent_level += 1
-        
-        # Post-processing: Remove excess empty lines
-        final_lines = []
-        empty_count = 0
-        for line in formatted_lines:
-            if not line.strip():
-                empty_count += 1
-                if empty_count <= 2:
-                    final_lines.append(line)
-            else:
-                empty_count = 0
-                final_lines.append(line)
-        
-        result = '\n'.join(final_lines)
-        
-        # Format operator spaces
-        result = re.sub(r'(\w)=(\w)', r'\1 = \2', result)
-        result = re.sub(r'(\w)\+(\w)', r'\1 + \2', result)
-        result = re.sub(r'(\w)-(\w)', r'\1 - \2', result)
-        result = re.sub(r'(\w)\*(\w)', r'\1 * \2', result)
-        result = re.sub(r'(\w)/(\w)', r'\1 / \2', result)
-        result = re.sub(r',(\w)', r', \1', result)
-        
-        return result, None
+        formatted, error_msg = _format_javascript_tokens(code)
+        if error_msg and not ignore_errors:
+            return code, error_msg
+        return formatted, error_msg
         
     except Exception as e:
         if ignore_errors:
@@ -251,7 +875,297 @@ def format_code(code: str, language: str, ignore_errors: bool = False) -> Tuple[
         return code, f"Unsupported programming language: {language}"
 
 
-def format_file(file_path: str, language: Optional[str] = None, ignore_errors: bool = False) -> Tuple[str, Optional[str]]:
+# Comments, strings, backslash continuations and brackets: everything that
+# can carry a Python statement over to the next line
+_PY_LEXICAL_RE = re.compile(
+    r'#[^\n]*'
+    r'|"""(?:[^"\\]|\\.|"(?!""))*"""'
+    r"|'''(?:[^'\\]|\\.|'(?!''))*'''"
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r'|\\\n'
+    r'|[()\[\]{}]',
+    re.S,
+)
+# Clauses that continue the compound statement above them
+_PY_CLAUSE_RE = re.compile(r'(?:elif|else|except|finally)\b')
+# Failed statement starts tried before range formatting falls back to the whole file
+_MAX_FRAGMENT_ATTEMPTS = 32
+
+
+def _indent_width(line: str) -> int:
+    """Width of a line's leading whitespace, with tabs expanded"""
+    stripped = line.lstrip()
+    if '\t' in line:
+        return len(line.expandtabs(8)) - len(stripped.expandtabs(8))
+    return len(line) - len(stripped)
+
+
+class _LineContext:
+    """
+    Tells whether a line starts inside brackets, a multi-line string or
+    after a backslash continuation
+    
+    The source is scanned lazily with one regular expression and only as
+    far as the lines asked about.
+    """
+    
+    def __init__(self, code: str, lines: List[str]):
+        self.offsets = []
+        offset = 0
+        for line in lines:
+            self.offsets.append(offset)
+            offset += len(line) + 1
+        self._matches = _PY_LEXICAL_RE.finditer(code)
+        self._next = next(self._matches, None)
+        # Outermost continuation spans, in source order
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._depth = 0
+        self._opened = 0
+    
+    def _advance(self, offset: int):
+        """Consume every token that starts before offset"""
+        match = self._next
+        while match is not None and match.start() < offset:
+            text = match.group()
+            char = text[0]
+            if char in '([{':
+                if not self._depth:
+                    self._opened = match.start()
+                self._depth += 1
+            elif char in ')]}':
+                if self._depth:
+                    self._depth -= 1
+                    if not self._depth:
+                        self._starts.append(self._opened)
+                        self._ends.append(match.end())
+            elif char != '#' and not self._depth and '\n' in text:
+                self._starts.append(match.start())
+                self._ends.append(match.end())
+            match = next(self._matches, None)
+        self._next = match
+    
+    def continues(self, index: int) -> bool:
+        """Whether line index (0-based) belongs to a statement started above it"""
+        offset = self.offsets[index]
+        self._advance(offset)
+        if self._depth and self._opened < offset:
+            return True
+        span = bisect.bisect_left(self._starts, offset) - 1
+        return span >= 0 and offset <= self._ends[span]
+
+
+def _is_statement(lines: List[str], start: int, end: int) -> bool:
+    """Whether lines[start:end] parse as a run of complete statements"""
+    import ast
+    
+    text = '\n'.join(lines[start:end]) + '\n'
+    if lines[start][:1] in (' ', '\t'):
+        text = 'if 1:\n' + text
+    try:
+        ast.parse(text)
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
+def _python_fragment(lines: List[str], context: _LineContext,
+                     first: int, last: int) -> Optional[Tuple[int, int]]:
+    """
+    Find the statements enclosing lines[first:last + 1]
+    
+    Walks up from first to the nearest statement start indented no deeper
+    than the range (a sibling or the enclosing block header), then extends
+    the fragment down to the next statement at that indentation. Returns
+    (start, end) line indexes, or None if no fragment parses on its own.
+    """
+    def is_code(index):
+        stripped = lines[index].lstrip()
+        return bool(stripped) and stripped[0] != '#' and not context.continues(index)
+    
+    widths = [_indent_width(lines[index]) for index in range(first, last + 1) if is_code(index)]
+    limit = min(widths) if widths else float('inf')
+    
+    attempts = 0
+    start = first
+    while start >= 0 and attempts < _MAX_FRAGMENT_ATTEMPTS:
+        if is_code(start) and _indent_width(lines[start]) <= limit:
+            limit = _indent_width(lines[start])
+            end = start + 1
+            decorated = lines[start].lstrip().startswith('@')
+            while end < len(lines):
+                if is_code(end) and _indent_width(lines[end]) <= limit:
+                    stripped = lines[end].lstrip()
+                    clause = _indent_width(lines[end]) == limit and _PY_CLAUSE_RE.match(stripped)
+                    if end > last and not decorated and not clause:
+                        break
+                    decorated = stripped.startswith('@')
+                end += 1
+            if _is_statement(lines, start, end):
+                return start, end
+            attempts += 1
+        start -= 1
+    return None
+
+
+def _merge_ranges(ranges: Iterable[Tuple[int, int]], line_count: int) -> List[Tuple[int, int]]:
+    """Turn 1-based inclusive ranges into sorted, merged 0-based inclusive ranges"""
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid line range: {start}:{end}")
+        start, end = start - 1, min(end, line_count) - 1
+        if start > end:
+            continue
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def _format_python_range(code: str, ranges: List[Tuple[int, int]]) -> str:
+    """Format merged 0-based line ranges of Python code"""
+    lines = code.split('\n')
+    context = _LineContext(code, lines)
+    
+    # Statement fragments (start, end) with the ranges they enclose
+    fragments: List[Tuple[int, int, List[Tuple[int, int]]]] = []
+    for first, last in ranges:
+        covered = [(first, last)]
+        while True:
+            bounds = _python_fragment(lines, context, covered[0][0], last)
+            if bounds is None:
+                # Nothing smaller parses on its own: use the whole module
+                import ast
+                ast.parse(code)
+                bounds = (0, len(lines))
+            if fragments and bounds[0] < fragments[-1][1]:
+                covered = fragments.pop()[2] + covered
+                continue
+            break
+        fragments.append((bounds[0], bounds[1], covered))
+    
+    for start, end, covered in fragments:
+        first_line = lines[start]
+        base = first_line[:len(first_line) - len(first_line.lstrip())]
+        formatted = _format_python_tokens('\n'.join(lines[start:end]) + '\n', base).split('\n')
+        formatted.pop()
+        if len(formatted) != end - start:
+            # Line mapping lost; leave the fragment untouched
+            continue
+        
+        changed = [index for first, last in covered for index in range(first, min(last + 1, end))]
+        if any(lines[index].strip() and
+               _indent_width(lines[index]) != _indent_width(formatted[index - start])
+               for index in changed):
+            # A nested block is re-indented: rewrite the whole fragment to keep it consistent
+            changed = range(start, end)
+        for index in changed:
+            lines[index] = formatted[index - start]
+    return '\n'.join(lines)
+
+
+def format_code_range(code: str, language: str, ranges: Iterable[Tuple[int, int]],
+                      ignore_errors: bool = False) -> Tuple[str, Optional[str]]:
+    """
+    Format only the given line ranges of the code
+    
+    For Python, each range is widened to the statements enclosing it and
+    indentation is recovered from the first of them, so the work depends
+    on the size of the edit rather than the size of the file. Lines outside
+    the ranges are kept, unless a block in the fragment has to be
+    re-indented as a whole.
+    
+    JavaScript lexer state is only known by reading from the top, so the
+    file is formatted from its first line down to the last range: the cost
+    grows with the position of that range (O(prefix)), and the rest of the
+    file is only lexed when the cut leaves a construct open. Code with a
+    lexical error is returned unchanged unless ignore_errors is set.
+    
+    Args:
+        code: Code string to format
+        language: Programming language ('python' or 'javascript')
+        ranges: 1-based inclusive (start, end) line ranges
+        ignore_errors: Whether to ignore syntax errors and continue formatting
+        
+    Returns:
+        (formatted_code, error_message) - Formatted code and error message (if any)
+    """
+    try:
+        merged = _merge_ranges(ranges, code.count('\n') + 1)
+    except ValueError as e:
+        return code, str(e)
+    
+    language = language.lower()
+    try:
+        if language in ['python', 'py']:
+            try:
+                return _format_python_range(code, merged), None
+            except SyntaxError as e:
+                return code, f"Python Syntax Error (Line {e.lineno}): {e.msg}"
+        elif language in ['javascript', 'js']:
+            if not merged:
+                return code, None
+            # Lexer state is carried downwards: format up to the last range
+            lines = code.split('\n')
+            last = merged[-1][1]
+            formatted, error_msg = _format_javascript_tokens('\n'.join(lines[:last + 1]), keep_lines=True)
+            if error_msg and last + 1 < len(lines):
+                # The cut may fall inside a bracket, template or comment closed further down
+                lexer = _JSLexer(code)
+                lexer.tokens()
+                error_msg = _js_error_message(lexer)
+            if error_msg and not ignore_errors:
+                return code, error_msg
+            formatted = formatted.split('\n')
+            for first, end in merged:
+                lines[first:end + 1] = formatted[first:end + 1]
+            return '\n'.join(lines), error_msg
+        else:
+            return code, f"Unsupported programming language: {language}"
+    except Exception as e:
+        if ignore_errors:
+            return code, f"Formatting error: {str(e)}"
+        return code, f"Formatting failed: {str(e)}"
+
+
+def changed_line_ranges(file_path: str, ref: str) -> List[Tuple[int, int]]:
+    """
+    Line ranges of a file added or modified since a git ref
+    
+    Args:
+        file_path: File inside a git work tree
+        ref: Commit, branch or tag to compare the working tree against
+        
+    Returns:
+        1-based inclusive (start, end) ranges; pure deletions are skipped
+    """
+    file_path = os.path.abspath(file_path)
+    try:
+        completed = subprocess.run(
+            ['git', 'diff', '--no-color', '--no-ext-diff', '-U0', ref, '--', file_path],
+            cwd=os.path.dirname(file_path), capture_output=True, text=True, encoding='utf-8'
+        )
+    except FileNotFoundError:
+        raise RuntimeError("git executable not found")
+    if completed.returncode != 0:
+        raise RuntimeError(f"git diff failed: {completed.stderr.strip()}")
+    
+    ranges = []
+    for line in completed.stdout.splitlines():
+        match = _HUNK_HEADER.match(line)
+        if match:
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            if count:
+                ranges.append((start, start + count - 1))
+    return ranges
+
+
+def format_file(file_path: str, language: Optional[str] = None, ignore_errors: bool = False,
+                ranges: Optional[List[Tuple[int, int]]] = None) -> Tuple[str, Optional[str]]:
     """
     Format file
     
@@ -259,6 +1173,7 @@ def format_file(file_path: str, language: Optional[str] = None, ignore_errors: b
         file_path: File path
         language: Programming language, inferred from file extension if not provided
         ignore_errors: Whether to ignore syntax errors and continue formatting
+        ranges: Only format these 1-based inclusive line ranges (see format_code_range)
         
     Returns:
         (formatted_code, error_message) - Formatted code and error message (if any)
@@ -280,11 +1195,352 @@ def format_file(file_path: str, language: Optional[str] = None, ignore_errors: b
         with open(file_path, 'r', encoding='utf-8') as f:
             code = f.read()
         
+        if ranges is not None:
+            return format_code_range(code, language, ranges, ignore_errors)
         return format_code(code, language, ignore_errors)
     except Exception as e:
         return "", f"Failed to read file: {str(e)}"
 
 
+class FormatCache:
+    """
+    Set of content hashes known to be already formatted
+    
+    Keys cover the file content, its language and the tool version. The set
+    is stored as one digest per line and rewritten atomically on save, keeping
+    the max_entries most recently used hashes.
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.index_path = os.path.join(cache_dir, 'formatted.txt')
+        self._keys = None
+    
+    @staticmethod
+    def make_key(content: bytes, language: str) -> str:
+        """Build cache key for content formatted as language"""
+        digest = hashlib.sha256(f"{__version__}\0{language}\0".encode('utf-8'))
+        digest.update(content)
+        return digest.hexdigest()
+    
+    @property
+    def keys(self) -> dict:
+        """Known keys in least to most recently used order (loaded lazily)"""
+        if self._keys is None:
+            self._keys = {}
+            try:
+                with open(self.index_path, 'r', encoding='ascii') as f:
+                    self._keys = dict.fromkeys(line.strip() for line in f if line.strip())
+            except (OSError, ValueError):
+                pass
+        return self._keys
+    
+    def __contains__(self, key: str) -> bool:
+        if key in self.keys:
+            # Move to the most recent end
+            del self._keys[key]
+            self._keys[key] = None
+            return True
+        return False
+    
+    def add(self, key: str):
+        """Record key as formatted"""
+        self.keys.pop(key, None)
+        self._keys[key] = None
+    
+    def save(self):
+        """Write the index, dropping the least recently used keys beyond max_entries"""
+        if self._keys is None:
+            return
+        keys = list(self._keys)[-self.max_entries:]
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file first so a concurrent run never reads a partial index
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='ascii') as f:
+                f.write('\n'.join(keys))
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+    
+    def clear(self):
+        """Forget every known hash"""
+        self._keys = {}
+        try:
+            os.remove(self.index_path)
+        except OSError:
+            pass
+
+
+def collect_source_files(directory: str) -> List[str]:
+    """
+    Collect .py/.js/.jsx files under directory, sorted by path
+    
+    VCS, virtualenv, build and cache directories are pruned before descending.
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Directory not found: {directory}")
+    
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS:
+                found.append(os.path.join(root, name))
+    return sorted(found)
+
+
+def _format_path(task: Tuple[str, bool, bool]) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """
+    Format one file (runs in worker processes)
+    
+    Returns:
+        (file path, status, message, cache key); status is 'unchanged',
+        'reformatted' (or would be, in check mode) or 'error'. The cache key is
+        only set for unchanged files without syntax errors, i.e. content proven
+        to be a fixed point that a later run without --ignore-errors accepts.
+    """
+    file_path, check, ignore_errors = task
+    language = SOURCE_EXTENSIONS[os.path.splitext(file_path)[1].lower()]
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        code = raw.decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        return file_path, 'error', f"Failed to read file: {e}", None
+    
+    formatted, error_msg = format_code(code, language, ignore_errors)
+    if error_msg and not ignore_errors:
+        return file_path, 'error', error_msg, None
+    if formatted == code:
+        key = None if error_msg else FormatCache.make_key(raw, language)
+        return file_path, 'unchanged', error_msg, key
+    if check:
+        return file_path, 'reformatted', error_msg, None
+    
+    try:
+        with open(file_path, 'wb') as f:
+            f.write(formatted.encode('utf-8'))
+    except OSError as e:
+        return file_path, 'error', f"Failed to write file: {e}", None
+    return file_path, 'reformatted', error_msg, None
+
+
+def format_files(
+    file_paths: List[str],
+    jobs: int = 1,
+    check: bool = False,
+    ignore_errors: bool = False,
+    cache: Optional[FormatCache] = None
+) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Format files in place (or only check them), in input order
+    
+    Args:
+        file_paths: .py/.js/.jsx files
+        jobs: Number of worker processes (1 = serial, 0 = CPU count)
+        check: Only report files that would change; never write
+        ignore_errors: Format files with syntax errors anyway
+        cache: Optional cache of hashes already known to be formatted
+        
+    Yields:
+        (file path, status, message) with status 'unchanged', 'cached',
+        'reformatted' or 'error'
+    """
+    pending = []
+    cached: Set[str] = set()
+    if cache is not None:
+        for file_path in file_paths:
+            language = SOURCE_EXTENSIONS[os.path.splitext(file_path)[1].lower()]
+            try:
+                with open(file_path, 'rb') as f:
+                    key = FormatCache.make_key(f.read(), language)
+            except OSError:
+                key = None
+            if key is not None and key in cache:
+                cached.add(file_path)
+            else:
+                pending.append(file_path)
+    else:
+        pending = list(file_paths)
+    
+    if not jobs:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(pending))
+    tasks = [(file_path, check, ignore_errors) for file_path in pending]
+    
+    if jobs <= 1:
+        results = map(_format_path, tasks)
+        executor = None
+    else:
+        # Imported here to keep startup cheap for single files and --serve
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        # Several chunks per worker keeps the pool busy when file sizes are uneven
+        results = executor.map(_format_path, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+    
+    try:
+        for file_path in file_paths:
+            if file_path in cached:
+                yield file_path, 'cached', None
+                continue
+            _, status, message, key = next(results)
+            if cache is not None and key is not None:
+                cache.add(key)
+            yield file_path, status, message
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if cache is not None:
+            cache.save()
+
+
+class FormatServer:
+    """
+    Long-lived formatter answering length-prefixed JSON requests
+    
+    Each message is a 4-byte big-endian length followed by that many bytes
+    of UTF-8 JSON. A request is an object with "code" and "language" and
+    optionally "ranges" ([[start, end], ...], 1-based inclusive),
+    "ignore_errors" and an "id" that is echoed back. The response carries
+    "formatted", "error" and "cached". {"command": "shutdown"} stops the
+    server. Recent results are kept in an LRU cache keyed by the content
+    hash and options.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_SERVE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[str, Tuple[str, Optional[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.running = True
+    
+    @staticmethod
+    def read_message(stream) -> Optional[dict]:
+        """Read one message from a binary stream; None at end of stream"""
+        header = stream.read(4)
+        if len(header) < 4:
+            return None
+        size = int.from_bytes(header, 'big')
+        payload = stream.read(size)
+        if len(payload) < size:
+            return None
+        return json.loads(payload.decode('utf-8'))
+    
+    @staticmethod
+    def write_message(stream, message: dict):
+        """Write one message to a binary stream and flush it"""
+        payload = json.dumps(message, ensure_ascii=False).encode('utf-8')
+        stream.write(len(payload).to_bytes(4, 'big') + payload)
+        stream.flush()
+    
+    def handle(self, request: dict) -> dict:
+        """Answer a single request"""
+        response = {'id': request.get('id')}
+        if request.get('command') == 'shutdown':
+            self.running = False
+            response['status'] = 'shutting down'
+            return response
+        
+        code = request.get('code')
+        language = request.get('language')
+        if not isinstance(code, str) or not isinstance(language, str):
+            response['error'] = "Request needs string fields 'code' and 'language'"
+            return response
+        ranges = request.get('ranges')
+        ignore_errors = bool(request.get('ignore_errors'))
+        
+        digest = hashlib.sha256(code.encode('utf-8', 'surrogatepass'))
+        digest.update(json.dumps([language, ranges, ignore_errors]).encode('utf-8'))
+        key = digest.hexdigest()
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+        
+        response['cached'] = result is not None
+        if result is None:
+            if ranges is None:
+                result = format_code(code, language, ignore_errors)
+            else:
+                try:
+                    ranges = [(int(start), int(end)) for start, end in ranges]
+                except (TypeError, ValueError):
+                    response['error'] = "'ranges' must be a list of [start, end] pairs"
+                    return response
+                result = format_code_range(code, language, ranges, ignore_errors)
+            with self._lock:
+                self._cache[key] = result
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        
+        response['formatted'], response['error'] = result
+        return response
+    
+    def serve_stream(self, reader, writer):
+        """Answer requests from reader until it ends or a shutdown request"""
+        while self.running:
+            try:
+                request = self.read_message(reader)
+            except (ValueError, UnicodeDecodeError) as e:
+                self.write_message(writer, {'id': None, 'error': f"Invalid message: {e}"})
+                continue
+            if request is None:
+                break
+            if not isinstance(request, dict):
+                self.write_message(writer, {'id': None, 'error': "Request must be a JSON object"})
+                continue
+            self.write_message(writer, self.handle(request))
+    
+    def serve_unix(self, socket_path: str):
+        """Accept connections on a Unix socket, one thread per connection"""
+        import socket
+        import socketserver
+        
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Unix sockets are not supported on this platform")
+        if os.path.lexists(socket_path) and not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+            # Connecting to a regular file is refused too; never delete one
+            raise RuntimeError(f"{socket_path} exists and is not a socket")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+            except FileNotFoundError:
+                pass
+            except ConnectionRefusedError:
+                # Left behind by a server that is no longer running
+                os.unlink(socket_path)
+            else:
+                raise RuntimeError(f"Format server already running on {socket_path}")
+        
+        server = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    server.serve_stream(self.rfile, self.wfile)
+                finally:
+                    # Honour a shutdown even if the client hung up before the reply
+                    if not server.running:
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        
+        with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as unix_server:
+            unix_server.daemon_threads = True
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.unlink(socket_path)
+
+
+def _line_range(value: str) -> Tuple[int, int]:
+    """Parse a START:END command line range"""
+    match = re.match(r'^(\d+):(\d+)$', value)
+    if not match or int(match.group(1)) < 1 or int(match.group(2)) < int(match.group(1)):
+        raise argparse.ArgumentTypeError(f"invalid line range '{value}' (expected START:END)")
+    return int(match.group(1)), int(match.group(2))
+
+
 def register_parser(subparsers):
     """Register parser for formatter command"""
     parser = subparsers.add_parser(
@@ -292,6 +1548,8 @@ def register_parser(subparsers):
         help='Code Formatting Tool',
         description='Format Python and JavaScript code, supports error tolerance mode'
     )
+    parser.add_argument('path', nargs='?',
+                       help='File or directory to format (directories are formatted in place)')
     parser.add_argument('--file', '-f', help='File path to format')
     parser.add_argument('--language', '-l', choices=['python', 'py', 'javascript', 'js'],
                        help='Programming language (python/js)')
@@ -301,21 +1559,102 @@ def register_parser(subparsers):
                        help='Ignore syntax errors and try to format')
     parser.add_argument('--in-place', action='store_true',
                        help='Modify file in place (only for --file)')
+    parser.add_argument('--check', action='store_true',
+                       help='Only report files that would be reformatted; exit 1 if any')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Worker processes for directories (0 = CPU count, default: 1)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not skip files recorded as already formatted')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'Formatted-hash cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--lines', action='append', type=_line_range, metavar='START:END',
+                       help='Only format this 1-based inclusive line range (repeatable)')
+    parser.add_argument('--diff-against', metavar='REF',
+                       help='Only format lines added or changed since this git ref')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run as a server answering length-prefixed JSON requests on stdio')
+    parser.add_argument('--socket', metavar='PATH',
+                       help='With --serve, listen on this Unix socket instead of stdio')
     parser.set_defaults(func=main)
 
 
+def _format_directory_main(args) -> int:
+    """Format or check every source file under args.path"""
+    file_paths = collect_source_files(args.path)
+    cache = None if args.no_cache else FormatCache(args.cache_dir)
+    
+    counts = {'unchanged': 0, 'cached': 0, 'reformatted': 0, 'error': 0}
+    for file_path, status, message in format_files(
+        file_paths, args.jobs, args.check, args.ignore_errors, cache
+    ):
+        counts[status] += 1
+        if status == 'reformatted':
+            print(f"{'Would reformat' if args.check else 'Reformatted'}: {file_path}")
+        elif status == 'error':
+            print(f"❌ {file_path}: {message}")
+        if message and status != 'error':
+            print(f"⚠️ {file_path}: {message}")
+    
+    unchanged = counts['unchanged'] + counts['cached']
+    verb = 'would be reformatted' if args.check else 'reformatted'
+    print(f"\n{counts['reformatted']} file(s) {verb}, {unchanged} unchanged "
+          f"({counts['cached']} from cache), {counts['error']} error(s)")
+    
+    if counts['error'] or (args.check and counts['reformatted']):
+        return 1
+    return 0
+
+
 def main(args):
     """Main function for formatter tool"""
     try:
         formatted_code = None
         error_msg = None
         
+        if args.serve:
+            server = FormatServer()
+            if args.socket:
+                print(f"Serving on {args.socket}", file=sys.stderr)
+                server.serve_unix(args.socket)
+            else:
+                server.serve_stream(sys.stdin.buffer, sys.stdout.buffer)
+            return 0
+        
+        if args.path:
+            if os.path.isdir(args.path):
+                if args.lines or args.diff_against:
+                    print("❌ Error: --lines and --diff-against apply to a single file")
+                    return 1
+                return _format_directory_main(args)
+            args.file = args.path
+        
+        # Line ranges to format (None = whole document)
+        ranges = None
+        if args.lines or args.diff_against:
+            ranges = list(args.lines or [])
+            if args.diff_against:
+                if not args.file:
+                    print("❌ Error: --diff-against requires a file")
+                    return 1
+                ranges.extend(changed_line_ranges(args.file, args.diff_against))
+        
+        if args.file and args.check:
+            formatted_code, error_msg = format_file(args.file, args.language, args.ignore_errors, ranges)
+            if error_msg and not args.ignore_errors:
+                print(f"❌ {error_msg}")
+                return 1
+            with open(args.file, 'r', encoding='utf-8') as f:
+                changed = f.read() != formatted_code
+            print(f"Would reformat: {args.file}" if changed else f"✓ Already formatted: {args.file}")
+            return 1 if changed else 0
+        
         if args.file:
             # Format file
             formatted_code, error_msg = format_file(
                 args.file, 
                 args.language,
-                args.ignore_errors
+                args.ignore_errors,
+                ranges
             )
             
             if error_msg and not args.ignore_errors:
@@ -344,11 +1683,16 @@ def main(args):
                 print("❌ Error: Language must be specified when inputting code directly (--language python/js)")
                 return 1
             
-            formatted_code, error_msg = format_code(
-                args.input, 
-                args.language,
-                args.ignore_errors
-            )
+            if ranges is not None:
+                formatted_code, error_msg = format_code_range(
+                    args.input, args.language, ranges, args.ignore_errors
+                )
+            else:
+                formatted_code, error_msg = format_code(
+                    args.input, 
+                    args.language,
+                    args.ignore_errors
+                )
             
             if error_msg and not args.ignore_errors:
                 print(f"❌ {error_msg}")
@@ -1,15 +1,158 @@
 import argparse
 import ast
+import ctypes
+import ctypes.util
+import hashlib
+import heapq
 import os
 import json
-from typing import List, Dict, Any
+import re
+import select
+import shutil
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO, Tuple
 from pathlib import Path
 
+try:
+    from ..__version__ import __version__
+except ImportError:
+    # Running as a standalone script
+    __version__ = "standalone"
+
+
+DEFAULT_CACHE_DIR = os.path.join('.devkit_cache', 'lint')
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+DEFAULT_SOCKET_PATH = os.path.join('.devkit_cache', 'lint.sock')
+DAEMON_MAX_ENTRIES = 2048
+# Seconds the daemon waits for a request line before dropping the client
+DAEMON_READ_TIMEOUT = 2.0
+
+# Directories never descended into by watch mode
+WATCH_SKIP_DIRS = {'.git', '.hg', '.svn', '__pycache__', '.devkit_cache', '.mypy_cache', '.pytest_cache'}
+
+# Unified diff hunk header, capturing the new-file start line and count
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+# C-style escapes git uses in quoted path names
+_GIT_PATH_ESCAPES = {'a': 7, 'b': 8, 't': 9, 'n': 10, 'v': 11, 'f': 12, 'r': 13, '"': 34, '\\': 92}
+
+# Issue severity -> SARIF result level
+SARIF_LEVELS = {
+    'error': 'error',
+    'warning': 'warning',
+    'info': 'note',
+}
+
+
+# Marker pushed on the traversal stack to close a function scope
+_SCOPE_EXIT = object()
+
+
+class RuleProfile:
+    """Cumulative wall time and invocation count per lint rule"""
+    
+    def __init__(self):
+        # Rule name -> [total seconds, invocation count]
+        self.stats: Dict[str, List[float]] = {}
+    
+    def record(self, rule: str, seconds: float, calls: int = 1):
+        """Add timing for a rule"""
+        entry = self.stats.setdefault(rule, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+    
+    def timed(self, rule: str, func):
+        """Wrap func so every call is recorded under rule"""
+        entry = self.stats.setdefault(rule, [0.0, 0])
+        
+        def wrapper(*args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                entry[0] += time.perf_counter() - start
+                entry[1] += 1
+        
+        return wrapper
+    
+    def merge(self, other: 'RuleProfile'):
+        """Merge another profile, e.g. from a worker process"""
+        for rule, (seconds, calls) in other.stats.items():
+            self.record(rule, seconds, calls)
+    
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Return stats sorted by total time, slowest first"""
+        ordered = sorted(self.stats.items(), key=lambda item: item[1][0], reverse=True)
+        return {
+            rule: {'seconds': seconds, 'calls': int(calls)}
+            for rule, (seconds, calls) in ordered
+        }
+    
+    def format_table(self) -> str:
+        """Format stats as a text table, slowest rule first"""
+        stats = self.to_dict()
+        total = sum(entry['seconds'] for entry in stats.values()) or 1.0
+        
+        lines = [
+            f"{'Rule':<28} {'Calls':>10} {'Total ms':>10} {'Avg us':>10} {'Share':>7}",
+            '-' * 69,
+        ]
+        for rule, entry in stats.items():
+            avg_us = entry['seconds'] / entry['calls'] * 1e6 if entry['calls'] else 0.0
+            lines.append(
+                f"{rule:<28} {entry['calls']:>10} {entry['seconds'] * 1000:>10.2f} "
+                f"{avg_us:>10.2f} {entry['seconds'] / total:>7.1%}"
+            )
+        return '\n'.join(lines)
+
 
 class CodeLinter:
-    def __init__(self, config: dict = None):
+    # Rule name -> (node type, check method name) handlers for the AST pass.
+    # Handlers run in this order, so a node's issues keep a stable order.
+    RULES = {
+        'naming_convention': (
+            (ast.FunctionDef, 'check_function_naming'),
+            (ast.ClassDef, 'check_class_def'),
+            (ast.Name, 'check_name_usage'),
+        ),
+        'missing_docstring': ((ast.FunctionDef, 'check_docstring'),),
+        'mutable_default_argument': ((ast.FunctionDef, 'check_mutable_defaults'),),
+        'import_style': (
+            (ast.Import, 'check_import'),
+            (ast.ImportFrom, 'check_import_from'),
+        ),
+    }
+    
+    # Rules that need more than a per-node handler
+    COMPLEXITY_RULE = 'complexity'
+    LINE_LENGTH_RULE = 'line_too_long'
+    
+    RULE_NAMES = tuple(RULES) + (COMPLEXITY_RULE, LINE_LENGTH_RULE)
+    
+    # Node type -> complexity added to the enclosing function
+    COMPLEXITY_INCREMENTS = {
+        ast.If: lambda node: 1,
+        ast.While: lambda node: 1,
+        ast.For: lambda node: 1,
+        ast.ExceptHandler: lambda node: 1,
+        ast.BoolOp: lambda node: len(node.values) - 1,
+        ast.And: lambda node: 1,
+        ast.Or: lambda node: 1,
+    }
+    
+    def __init__(self, config: dict = None, profile: Optional[RuleProfile] = None):
         self.issues = []
-        # Default configuration
+        # Default configuration; set a rule's severity to 'off' to disable it
         self.config = {
             'naming_convention': 'warning',
             'missing_docstring': 'info',
@@ -24,6 +167,11 @@ class CodeLinter:
         }
         if config:
             self.config.update(config)
+        self.profile = profile
+    
+    def is_rule_enabled(self, rule: str) -> bool:
+        """Check whether a rule is enabled in the config"""
+        return self.config.get(rule) != 'off'
     
     def _add_issue(self, issue_type: str, message: str, node: ast.AST):
         """Helper to add an issue with severity from config."""
@@ -52,13 +200,12 @@ class CodeLinter:
         """Check Python code"""
         self.issues = []
         
+        parse = ast.parse
+        if self.profile is not None:
+            parse = self.profile.timed('<parse>', parse)
+        
         try:
-            tree = ast.parse(code, filename=filename)
-            self.visit_node(tree)
-            
-            # Check line length
-            self.check_line_lengths(code)
-            
+            tree = parse(code, filename)
         except SyntaxError as e:
             self.issues.append({
                 'type': 'syntax_error',
@@ -67,37 +214,92 @@ class CodeLinter:
                 'column': e.offset,
                 'severity': 'error'
             })
+            return self.issues
+        
+        return self.check_python_tree(tree, code)
+    
+    def check_python_tree(self, tree: ast.AST, code: str) -> List[Dict[str, Any]]:
+        """Check an already parsed module; code is its source, used for line checks"""
+        self.issues = []
+        self.visit_node(tree)
+        
+        # Check line length
+        if self.is_rule_enabled(self.LINE_LENGTH_RULE):
+            check_line_lengths = self.check_line_lengths
+            if self.profile is not None:
+                check_line_lengths = self.profile.timed(self.LINE_LENGTH_RULE, check_line_lengths)
+            check_line_lengths(code)
         
         return self.issues
     
+    def _build_dispatch(self) -> Dict[type, list]:
+        """Map node types to the handlers of enabled rules"""
+        dispatch = {}
+        for rule, handlers in self.RULES.items():
+            if not self.is_rule_enabled(rule):
+                continue
+            for node_type, method_name in handlers:
+                handler = getattr(self, method_name)
+                if self.profile is not None:
+                    handler = self.profile.timed(rule, handler)
+                dispatch.setdefault(node_type, []).append(handler)
+        return dispatch
+    
     def visit_node(self, node: ast.AST):
-        """Visit AST node"""
-        # Check function definition
-        if isinstance(node, ast.FunctionDef):
-            self.check_function_def(node)
+        """
+        Visit AST tree in a single iterative pre-order pass
         
-        # Check class definition
-        elif isinstance(node, ast.ClassDef):
-            self.check_class_def(node)
+        Each node is dispatched to the check methods registered for its type
+        in RULES. Cyclomatic complexity is accumulated on a stack of
+        enclosing function scopes during the same pass; when a function scope
+        closes its total is folded into the parent scope, matching a full
+        walk of the outer function without walking nested bodies again.
+        """
+        dispatch = self._build_dispatch()
+        track_complexity = self.is_rule_enabled(self.COMPLEXITY_RULE)
+        # Each scope is [function node, complexity, index for its complexity issue]
+        scopes = []
+        stack = [node]
         
-        # Check import statement
-        elif isinstance(node, ast.Import):
-            self.check_import(node)
+        def enter_complexity(current):
+            if scopes:
+                increment = self.COMPLEXITY_INCREMENTS.get(type(current))
+                if increment is not None:
+                    scopes[-1][1] += increment(current)
+            
+            if type(current) is ast.FunctionDef:
+                scopes.append([current, 1, len(self.issues)])
+                stack.append(_SCOPE_EXIT)
         
-        elif isinstance(node, ast.ImportFrom):
-            self.check_import_from(node)
+        def leave_complexity():
+            func_node, complexity, issue_index = scopes.pop()
+            self._check_complexity(func_node, complexity, issue_index)
+            if scopes:
+                scopes[-1][1] += complexity - 1
         
-        # Check variable usage
-        elif isinstance(node, ast.Name):
-            self.check_name_usage(node)
+        if self.profile is not None and track_complexity:
+            enter_complexity = self.profile.timed(self.COMPLEXITY_RULE, enter_complexity)
+            leave_complexity = self.profile.timed(self.COMPLEXITY_RULE, leave_complexity)
         
-        # Recursively visit child nodes
-        for child in ast.iter_child_nodes(node):
-            self.visit_node(child)
+        while stack:
+            current = stack.pop()
+            
+            if current is _SCOPE_EXIT:
+                leave_complexity()
+                continue
+            
+            for handler in dispatch.get(type(current), ()):
+                handler(current)
+            
+            if track_complexity:
+                enter_complexity(current)
+            
+            children = list(ast.iter_child_nodes(current))
+            children.reverse()
+            stack.extend(children)
     
-    def check_function_def(self, node: ast.FunctionDef):
-        """Check function definition"""
-        # Check function naming convention
+    def check_function_naming(self, node: ast.FunctionDef):
+        """Check function naming convention"""
         if not node.name.islower() and '_' not in node.name:
             if not node.name.startswith('_'):
                 self._add_issue(
@@ -105,16 +307,18 @@ class CodeLinter:
                     f"Function name '{node.name}' should use lowercase letters and underscores",
                     node
                 )
-        
-        # Check docstring
+    
+    def check_docstring(self, node: ast.FunctionDef):
+        """Check function docstring"""
         if not ast.get_docstring(node):
             self._add_issue(
                 'missing_docstring',
                 f"Function '{node.name}' missing docstring",
                 node
             )
-        
-        # Check mutable default arguments
+    
+    def check_mutable_defaults(self, node: ast.FunctionDef):
+        """Check mutable default arguments"""
         for arg in node.args.defaults:
             if isinstance(arg, (ast.List, ast.Dict, ast.Set)):
                 self._add_issue(
@@ -122,15 +326,22 @@ class CodeLinter:
                     f"Do not use mutable types (list, dict, set) as default arguments for function '{node.name}'",
                     arg
                 )
-        
-        # Check complexity
-        complexity = self.calculate_complexity(node)
+    
+    def check_function_def(self, node: ast.FunctionDef):
+        """Check function definition (naming, docstring and mutable defaults)"""
+        self.check_function_naming(node)
+        self.check_docstring(node)
+        self.check_mutable_defaults(node)
+    
+    def _check_complexity(self, node: ast.FunctionDef, complexity: int, issue_index: int):
+        """Check function complexity, keeping the issue next to the other function issues"""
         if complexity > 10:
             self._add_issue(
                 'complexity',
                 f"Function '{node.name}' is too complex (complexity: {complexity})",
                 node
             )
+            self.issues.insert(issue_index, self.issues.pop())
     
     def check_class_def(self, node: ast.ClassDef):
         """Check class definition"""
@@ -215,43 +426,992 @@ class CodeLinter:
         return complexity
 
 
-def lint_file(file_path: str) -> List[Dict[str, Any]]:
-    """Lint file"""
-    linter = CodeLinter()
-    return linter.check_python_file(file_path)
+class LintCache:
+    """
+    On-disk cache of lint results
+    
+    Entries are keyed by file content hash, the effective linter config and
+    the tool version, so a cached result is reused only when all three match.
+    Hits refresh the entry mtime; eviction removes the least recently used
+    entries once the cache grows beyond max_bytes.
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+    
+    def make_key(self, content: bytes, config: dict = None) -> str:
+        """Build cache key for file content linted with config"""
+        salt = json.dumps(
+            {'version': __version__, 'config': CodeLinter(config).config}, sort_keys=True
+        )
+        digest = hashlib.sha256(salt.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content)
+        return digest.hexdigest()
+    
+    def _entry_path(self, key: str) -> str:
+        """Return entry file path, sharded by key prefix"""
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+    
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached issues, or None on a miss"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                issues = json.load(f)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        return issues
+    
+    def put(self, key: str, issues: List[Dict[str, Any]]):
+        """Store issues for key"""
+        entry_path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            # Write to a temp file first so concurrent workers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(issues, f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            pass
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        entries = []
+        total = 0
+        if not os.path.isdir(self.cache_dir):
+            return
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        
+        if total <= self.max_bytes:
+            return
+        for _, size, entry_path in sorted(entries):
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+    
+    def clear(self):
+        """Delete all cache entries"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def _read_source(file_path: str) -> bytes:
+    """Read raw file content"""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+    
+    with open(file_path, 'rb') as f:
+        return f.read()
+
 
+def lint_file(file_path: str, cache: Optional[LintCache] = None, config: dict = None,
+              profile: Optional[RuleProfile] = None) -> List[Dict[str, Any]]:
+    """Lint file, reusing cached results when a cache is given"""
+    linter = CodeLinter(config, profile)
+    if cache is None:
+        return linter.check_python_file(file_path)
+    
+    content = _read_source(file_path)
+    key = cache.make_key(content, config)
+    issues = cache.get(key)
+    if issues is None:
+        # Match text-mode reading: decode and normalize newlines
+        code = content.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        issues = linter.check_python_code(code, file_path)
+        cache.put(key, issues)
+    return issues
 
-def lint_code(code: str, filename: str = "<string>") -> List[Dict[str, Any]]:
+
+def lint_code(code: str, filename: str = "<string>", config: dict = None,
+              profile: Optional[RuleProfile] = None) -> List[Dict[str, Any]]:
     """Lint code"""
-    linter = CodeLinter()
+    linter = CodeLinter(config, profile)
     return linter.check_python_code(code, filename)
 
 
-def lint_directory(directory: str, recursive: bool = True) -> Dict[str, List[Dict[str, Any]]]:
-    """Lint all Python files in directory"""
-    results = {}
+def _lint_file_safe(file_path: str, cache: Optional[LintCache] = None, config: dict = None,
+                    profile: Optional[RuleProfile] = None) -> List[Dict[str, Any]]:
+    """Lint file, converting failures into a single error issue"""
+    try:
+        return lint_file(file_path, cache, config, profile)
+    except Exception as e:
+        return [{
+            'type': 'error',
+            'message': f"Cannot lint file: {e}",
+            'line': 0,
+            'column': 0,
+            'severity': 'error'
+        }]
+
+
+def _lint_chunk(
+    file_paths: List[str],
+    cache: Optional[LintCache] = None,
+    config: dict = None,
+    profile_rules: bool = False
+) -> Tuple[List[Tuple[str, List[Dict[str, Any]]]], Optional[RuleProfile]]:
+    """Lint a chunk of files inside a worker process, returning results and rule profile"""
+    profile = RuleProfile() if profile_rules else None
+    results = [
+        (file_path, _lint_file_safe(file_path, cache, config, profile))
+        for file_path in file_paths
+    ]
+    return results, profile
+
+
+def _split_by_size(file_paths: List[str], chunk_count: int) -> List[List[str]]:
+    """
+    Split files into chunks of roughly equal total size
+    
+    Largest files are assigned first, each to the currently lightest chunk,
+    so one huge module does not leave the other workers idle.
+    """
+    sizes = {}
+    for file_path in file_paths:
+        try:
+            sizes[file_path] = os.path.getsize(file_path)
+        except OSError:
+            sizes[file_path] = 0
+    
+    chunks = [[] for _ in range(chunk_count)]
+    heap = [(0, index) for index in range(chunk_count)]
+    for file_path in sorted(file_paths, key=lambda p: sizes[p], reverse=True):
+        load, index = heapq.heappop(heap)
+        chunks[index].append(file_path)
+        heapq.heappush(heap, (load + sizes[file_path], index))
+    
+    return [chunk for chunk in chunks if chunk]
+
+
+def _collect_python_files(directory: str, recursive: bool = True) -> List[str]:
+    """Collect Python files in directory, sorted by path"""
     path = Path(directory)
     
     if not path.exists():
         raise FileNotFoundError(f"Directory not found: {directory}")
     
     pattern = "**/*.py" if recursive else "*.py"
+    return sorted(str(py_file) for py_file in path.glob(pattern) if py_file.is_file())
+
+
+def iter_lint_files(
+    file_paths: List[str],
+    workers: int = 1,
+    cache: Optional[LintCache] = None,
+    config: dict = None,
+    profile: Optional[RuleProfile] = None
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Lint the given files, yielding results as files finish
+    
+    Args:
+        file_paths: Python files to lint
+        workers: Number of worker processes (1 = serial, 0 or None = CPU count)
+        cache: Optional result cache, evicted down to size after the run
+        config: Optional CodeLinter config overrides
+        profile: Optional rule profile, merged across worker processes
+        
+    Yields:
+        (file path, issues) tuples; in input order when serial, in
+        completion order when using worker processes
+    """
+    if not workers:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(file_paths))
+    
+    if workers <= 1:
+        for file_path in file_paths:
+            yield file_path, _lint_file_safe(file_path, cache, config, profile)
+    else:
+        # Several chunks per worker keeps the pool busy when sizes are uneven
+        chunks = _split_by_size(file_paths, workers * 4)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_lint_chunk, chunk, cache, config, profile is not None)
+                for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                results, chunk_profile = future.result()
+                if profile is not None:
+                    profile.merge(chunk_profile)
+                yield from results
+    
+    if cache is not None:
+        cache.evict()
+
+
+def iter_lint_directory(
+    directory: str,
+    recursive: bool = True,
+    workers: int = 1,
+    cache: Optional[LintCache] = None,
+    config: dict = None,
+    profile: Optional[RuleProfile] = None
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Lint all Python files in directory, yielding results as files finish
+    
+    Args:
+        directory: Directory to lint
+        recursive: Whether to descend into subdirectories
+        workers: Number of worker processes (1 = serial, 0 or None = CPU count)
+        cache: Optional result cache, evicted down to size after the run
+        config: Optional CodeLinter config overrides
+        profile: Optional rule profile, merged across worker processes
+        
+    Yields:
+        (file path, issues) tuples; in path order when serial, in
+        completion order when using worker processes
+    """
+    file_paths = _collect_python_files(directory, recursive)
+    return iter_lint_files(file_paths, workers, cache, config, profile)
+
+
+def _run_git(args: List[str], cwd: str) -> str:
+    """Run a git command and return its stdout"""
+    try:
+        completed = subprocess.run(
+            ['git', '-c', 'core.quotePath=false'] + args,
+            cwd=cwd, capture_output=True, text=True, encoding='utf-8'
+        )
+    except FileNotFoundError:
+        raise RuntimeError("git executable not found")
+    
+    if completed.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {completed.stderr.strip()}")
+    return completed.stdout
+
+
+def _git_diff_args(ref: Optional[str], staged: bool) -> List[str]:
+    """Build git diff arguments for the requested change set"""
+    diff_args = ['diff', '--no-color', '--no-ext-diff', '--diff-filter=ACMR']
+    if staged:
+        diff_args.append('--cached')
+    if ref:
+        diff_args.append(ref)
+    return diff_args
+
+
+def _git_paths(path: str) -> Tuple[str, str]:
+    """Return (working directory for git, absolute pathspec) for a path"""
+    path = os.path.abspath(path)
+    cwd = path if os.path.isdir(path) else os.path.dirname(path)
+    toplevel = _run_git(['rev-parse', '--show-toplevel'], cwd).strip()
+    return toplevel, path
+
+
+def _git_untracked_files(toplevel: str, pathspec: str) -> List[str]:
+    """List untracked, non-ignored files under pathspec, relative to toplevel"""
+    output = _run_git(['ls-files', '-z', '--others', '--exclude-standard', '--', pathspec], toplevel)
+    return [name for name in output.split('\0') if name]
+
+
+def _diff_header_path(name: str) -> str:
+    """
+    Decode the path of a ---/+++ diff header line
+    
+    git appends a TAB to names containing spaces and C-quotes names with
+    control characters, quotes or backslashes.
+    """
+    name = name.rstrip('\t')
+    if len(name) < 2 or not (name.startswith('"') and name.endswith('"')):
+        return name
+    
+    decoded = bytearray()
+    i, end = 1, len(name) - 1
+    while i < end:
+        char = name[i]
+        if char == '\\' and i + 1 < end:
+            escape = name[i + 1]
+            if escape in '01234567':
+                decoded.append(int(name[i + 1:i + 4], 8))
+                i += 4
+                continue
+            decoded.append(_GIT_PATH_ESCAPES.get(escape, ord(escape)))
+            i += 2
+            continue
+        decoded += char.encode('utf-8')
+        i += 1
+    return decoded.decode('utf-8', 'replace')
+
+
+def _changed_python_file(toplevel: str, name: str) -> Optional[str]:
+    """Resolve a git path to a local path if it is an existing Python file"""
+    if not name.endswith('.py'):
+        return None
+    file_path = os.path.join(toplevel, name)
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        return os.path.relpath(file_path)
+    except ValueError:
+        # Different drive on Windows
+        return file_path
+
+
+def git_changed_files(ref: Optional[str] = None, staged: bool = False, path: str = '.') -> List[str]:
+    """
+    List Python files changed according to git
+    
+    Untracked files that are not ignored count as changed unless staged
+    is set.
+    
+    Args:
+        ref: Compare the working tree against this ref (e.g. origin/main)
+        staged: Use staged changes (git diff --cached) instead
+        path: Only report files under this path
+        
+    Returns:
+        Sorted list of changed Python file paths
+    """
+    toplevel, pathspec = _git_paths(path)
+    output = _run_git(_git_diff_args(ref, staged) + ['--name-only', '-z', '--', pathspec], toplevel)
+    
+    names = [name for name in output.split('\0') if name]
+    if not staged:
+        names.extend(_git_untracked_files(toplevel, pathspec))
+    files = {_changed_python_file(toplevel, name) for name in names}
+    return sorted(file_path for file_path in files if file_path)
+
+
+def git_changed_lines(ref: Optional[str] = None, staged: bool = False,
+                      path: str = '.') -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Map changed Python files to their added or modified line ranges
+    
+    Untracked files that are not ignored are reported whole unless staged
+    is set.
+    
+    Args:
+        ref: Compare the working tree against this ref (e.g. origin/main)
+        staged: Use staged changes (git diff --cached) instead
+        path: Only report files under this path
+        
+    Returns:
+        Mapping of file path to inclusive (start, end) line ranges
+    """
+    toplevel, pathspec = _git_paths(path)
+    output = _run_git(_git_diff_args(ref, staged) + ['-U0', '--', pathspec], toplevel)
+    
+    changed = {}
+    current = None
+    # Only look for file names between "diff --git" and the first hunk, so
+    # an added line starting with "++ " is not taken for a header
+    in_header = False
+    # Split on newlines only: source lines may contain form feeds and the like
+    for line in output.split('\n'):
+        if line.startswith('diff --git '):
+            in_header = True
+            current = None
+        elif in_header and line.startswith('+++ '):
+            name = _diff_header_path(line[4:])
+            name = name[2:] if name.startswith('b/') else None
+            current = _changed_python_file(toplevel, name) if name else None
+            if current:
+                changed.setdefault(current, [])
+        elif line.startswith('@@'):
+            in_header = False
+            match = _HUNK_HEADER.match(line)
+            if not match or not current:
+                continue
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            if count:
+                changed[current].append((start, start + count - 1))
+    
+    if not staged:
+        for name in _git_untracked_files(toplevel, pathspec):
+            current = _changed_python_file(toplevel, name)
+            if current and current not in changed:
+                with open(current, 'rb') as f:
+                    line_count = sum(1 for _ in f)
+                changed[current] = [(1, max(line_count, 1))]
+    
+    return dict(sorted(changed.items()))
+
+
+def filter_issues_by_lines(issues: List[Dict[str, Any]],
+                           ranges: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    """
+    Keep issues that fall on the given line ranges
+    
+    Syntax errors and file-level issues without a line are always kept,
+    since they affect the whole file.
+    """
+    kept = []
+    for issue in issues:
+        line = issue.get('line')
+        if not line or issue['type'] in ('syntax_error', 'error'):
+            kept.append(issue)
+        elif any(start <= line <= end for start, end in ranges):
+            kept.append(issue)
+    return kept
+
+
+def iter_lint_changed(
+    ref: Optional[str] = None,
+    staged: bool = False,
+    path: str = '.',
+    changed_lines_only: bool = False,
+    workers: int = 1,
+    cache: Optional[LintCache] = None,
+    config: dict = None,
+    profile: Optional[RuleProfile] = None
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Lint only the Python files changed according to git
+    
+    Args:
+        ref: Compare the working tree against this ref
+        staged: Use staged changes instead
+        path: Only lint changed files under this path
+        changed_lines_only: Only report issues on added or modified lines
+        workers: Number of worker processes
+        cache: Optional result cache
+        config: Optional CodeLinter config overrides
+        profile: Optional rule profile
+        
+    Yields:
+        (file path, issues) tuples
+    """
+    if changed_lines_only:
+        ranges = git_changed_lines(ref, staged, path)
+        file_paths = list(ranges)
+    else:
+        ranges = None
+        file_paths = git_changed_files(ref, staged, path)
+    
+    for file_path, issues in iter_lint_files(file_paths, workers, cache, config, profile):
+        if ranges is not None:
+            issues = filter_issues_by_lines(issues, ranges[file_path])
+        yield file_path, issues
+
+
+def lint_directory(directory: str, recursive: bool = True, workers: int = 1,
+                   cache: Optional[LintCache] = None, config: dict = None,
+                   profile: Optional[RuleProfile] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Lint all Python files in directory
+    
+    Args:
+        directory: Directory to lint
+        recursive: Whether to descend into subdirectories
+        workers: Number of worker processes (1 = serial, 0 or None = CPU count)
+        cache: Optional result cache, evicted down to size after the run
+        config: Optional CodeLinter config overrides
+        profile: Optional rule profile, merged across worker processes
+        
+    Returns:
+        Mapping of file path to issues, ordered by file path
+    """
+    return dict(sorted(iter_lint_directory(directory, recursive, workers, cache, config, profile)))
+
+
+class LintDaemon:
+    """
+    Long-lived lint server on a Unix domain socket
+    
+    Keeps parsed trees and results in memory keyed by path and
+    (mtime, size), so repeated requests for an unchanged file skip both
+    reading and parsing. The protocol is one JSON request line per
+    connection, answered with one JSON response line:
+    
+        {"op": "lint", "path": "...", "config": {...}}
+        {"op": "lint", "code": "...", "filename": "..."}
+        {"op": "ping"} / {"op": "shutdown"}
+    
+    Responses are {"ok": true, "issues": [...]} or {"ok": false, "error": "..."}.
+    Requests are answered one at a time, so a client that does not send
+    its request line within DAEMON_READ_TIMEOUT seconds is disconnected
+    rather than holding up every other client.
+    """
+    
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH,
+                 max_entries: int = DAEMON_MAX_ENTRIES):
+        self.socket_path = socket_path
+        self.max_entries = max_entries
+        # Path -> {'stamp', 'code', 'tree', 'results'}, least recently used first
+        self._entries = OrderedDict()
+        self._stopping = False
+    
+    def lint_path(self, file_path: str, config: dict = None) -> List[Dict[str, Any]]:
+        """Lint file, reusing the warm tree and results if it is unchanged"""
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        
+        entry = self._entries.get(file_path)
+        if entry is None or entry['stamp'] != stamp:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                code = f.read()
+            try:
+                tree = ast.parse(code, filename=file_path)
+            except SyntaxError:
+                tree = None
+            entry = {'stamp': stamp, 'code': code, 'tree': tree, 'results': {}}
+            self._entries[file_path] = entry
+        self._entries.move_to_end(file_path)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        
+        config_key = json.dumps(config or {}, sort_keys=True)
+        issues = entry['results'].get(config_key)
+        if issues is None:
+            linter = CodeLinter(config)
+            if entry['tree'] is None:
+                issues = linter.check_python_code(entry['code'], file_path)
+            else:
+                issues = linter.check_python_tree(entry['tree'], entry['code'])
+            entry['results'][config_key] = issues
+        return issues
+    
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a decoded request and return the response"""
+        op = request.get('op', 'lint')
+        try:
+            if op == 'ping':
+                return {'ok': True, 'entries': len(self._entries)}
+            if op == 'shutdown':
+                self._stopping = True
+                return {'ok': True}
+            if op != 'lint':
+                return {'ok': False, 'error': f"Unknown op: {op}"}
+            if 'code' in request:
+                issues = lint_code(request['code'], request.get('filename', '<string>'),
+                                   config=request.get('config'))
+            else:
+                issues = self.lint_path(request['path'], request.get('config'))
+            return {'ok': True, 'issues': issues}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
     
-    for py_file in path.glob(pattern):
-        if py_file.is_file():
+    def serve(self):
+        """Serve requests until a shutdown request arrives"""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Lint daemon requires Unix domain socket support")
+        
+        daemon = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            timeout = DAEMON_READ_TIMEOUT
+            
+            def handle(self):
+                """Answer one JSON request line"""
+                try:
+                    line = self.rfile.readline()
+                except socket.timeout:
+                    return
+                try:
+                    response = daemon.handle(json.loads(line))
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Invalid request: {e}"}
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+        
+        socket_dir = os.path.dirname(self.socket_path)
+        if socket_dir:
+            os.makedirs(socket_dir, exist_ok=True)
+        _remove_stale_socket(self.socket_path)
+        
+        server = socketserver.UnixStreamServer(self.socket_path, Handler)
+        try:
+            while not self._stopping:
+                server.handle_request()
+        finally:
+            server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def _remove_stale_socket(socket_path: str):
+    """
+    Remove a socket file left by a daemon that is no longer running
+    
+    Raises:
+        RuntimeError: If socket_path is not a socket, or a daemon is still
+            accepting connections on it
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        # Connecting to a regular file is refused too; never delete one
+        raise RuntimeError(f"{socket_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            os.remove(socket_path)
+            return
+    raise RuntimeError(f"Lint daemon already running on {socket_path}")
+
+
+def daemon_request(request: Dict[str, Any], socket_path: str = DEFAULT_SOCKET_PATH,
+                   timeout: float = 10.0) -> Dict[str, Any]:
+    """
+    Send a request to a running lint daemon
+    
+    Raises:
+        OSError: If no daemon is listening on socket_path
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise OSError("Unix domain sockets are not supported on this platform")
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with client.makefile('rb') as reader:
+            line = reader.readline()
+    
+    if not line:
+        raise OSError("Lint daemon closed the connection without a response")
+    return json.loads(line)
+
+
+def lint_via_daemon(file_path: str, socket_path: str = DEFAULT_SOCKET_PATH,
+                    config: dict = None) -> List[Dict[str, Any]]:
+    """Lint file through a running daemon, falling back to in-process lint if none is listening"""
+    try:
+        response = daemon_request(
+            {'op': 'lint', 'path': os.path.abspath(file_path), 'config': config}, socket_path
+        )
+    except (OSError, ValueError):
+        # No daemon, or a reply that is not valid JSON
+        return lint_file(file_path, config=config)
+    
+    if not isinstance(response, dict):
+        return lint_file(file_path, config=config)
+    if not response.get('ok'):
+        raise RuntimeError(response.get('error', 'Lint daemon request failed'))
+    return response['issues']
+
+
+class _Inotify:
+    """Minimal inotify binding through ctypes (Linux only)"""
+    
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+    
+    _EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # Watch descriptor -> directory path
+        self.watches: Dict[int, str] = {}
+    
+    def add_watch(self, directory: str):
+        """Watch a directory; raises OSError e.g. when the watch limit is reached"""
+        wd = self._add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self.watches[wd] = directory
+    
+    def read_dirty(self, timeout: float) -> Optional[set]:
+        """
+        Wait for events and return the set of directories that changed
+        
+        Returns None if the kernel queue overflowed and a full rescan is needed.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        dirty = set()
+        while ready:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = self._EVENT_HEADER.unpack_from(data, offset)
+                offset += self._EVENT_HEADER.size + name_len
+                if mask & self.IN_Q_OVERFLOW:
+                    return None
+                directory = self.watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & self.IN_IGNORED:
+                    # Directory was removed; its parent sees the deletion
+                    del self.watches[wd]
+                    continue
+                dirty.add(directory)
+        return dirty
+    
+    def close(self):
+        """Close the inotify descriptor"""
+        os.close(self.fd)
+
+
+class FileStateIndex:
+    """
+    Index of Python file states (mtime, size, content hash) under a directory
+    
+    A scan only stats files; contents are read and hashed only when mtime or
+    size changed, so a touched-but-identical file is not reported. Scans can
+    cover the whole tree or just a set of directories reported by inotify.
+    """
+    
+    def __init__(self, root: str, recursive: bool = True):
+        self.root = os.path.abspath(root)
+        self.recursive = recursive
+        # File path -> (mtime_ns, size, sha256 digest)
+        self.states: Dict[str, Tuple[int, int, bytes]] = {}
+        # Directory -> Python files / subdirectories last seen in it
+        self._files: Dict[str, set] = {}
+        self._subdirs: Dict[str, set] = {}
+    
+    def scan(self, directories: Optional[Iterable[str]] = None) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Rescan the tree, or only the given directories
+        
+        Returns:
+            (changed files, removed files, newly found directories)
+        """
+        changed, removed, new_dirs = [], [], []
+        if directories is None:
+            self._scan_dir(self.root, True, changed, removed, new_dirs)
+        else:
+            for directory in sorted(set(directories)):
+                if directory in self._files:
+                    self._scan_dir(directory, False, changed, removed, new_dirs)
+        return sorted(changed), sorted(removed), new_dirs
+    
+    def _scan_dir(self, directory: str, recursive: bool, changed: List[str],
+                  removed: List[str], new_dirs: List[str]):
+        """Scan one directory, descending into subdirectories if recursive or unseen"""
+        if directory not in self._files:
+            new_dirs.append(directory)
+        seen_files, seen_dirs = set(), set()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        
+        for entry in entries:
             try:
-                issues = lint_file(str(py_file))
-                results[str(py_file)] = issues
-            except Exception as e:
-                results[str(py_file)] = [{
-                    'type': 'error',
-                    'message': f"Cannot lint file: {e}",
-                    'line': 0,
-                    'column': 0,
-                    'severity': 'error'
-                }]
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in WATCH_SKIP_DIRS or not self.recursive:
+                        continue
+                    seen_dirs.add(entry.path)
+                    if recursive or entry.path not in self._files:
+                        self._scan_dir(entry.path, True, changed, removed, new_dirs)
+                elif entry.name.endswith('.py') and entry.is_file():
+                    if self._update(entry.path, entry.stat()):
+                        changed.append(entry.path)
+                    seen_files.add(entry.path)
+            except OSError:
+                continue
+        
+        for file_path in self._files.get(directory, set()) - seen_files:
+            del self.states[file_path]
+            removed.append(file_path)
+        for subdir in self._subdirs.get(directory, set()) - seen_dirs:
+            self._forget_dir(subdir, removed)
+        self._files[directory] = seen_files
+        self._subdirs[directory] = seen_dirs
     
-    return results
+    def _update(self, file_path: str, stat: os.stat_result) -> bool:
+        """Refresh a file's state, returning True if its content changed"""
+        old = self.states.get(file_path)
+        if old is not None and old[:2] == (stat.st_mtime_ns, stat.st_size):
+            return False
+        with open(file_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).digest()
+        self.states[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return old is None or old[2] != digest
+    
+    def _forget_dir(self, directory: str, removed: List[str]):
+        """Drop a deleted directory and everything below it"""
+        for file_path in self._files.pop(directory, set()):
+            del self.states[file_path]
+            removed.append(file_path)
+        for subdir in self._subdirs.pop(directory, set()):
+            self._forget_dir(subdir, removed)
+
+
+def _issue_key(issue: Dict[str, Any]) -> Tuple:
+    """Identity of an issue for delta reporting"""
+    return (issue['type'], issue['message'], issue.get('line'), issue.get('column'))
+
+
+def diff_issues(old: List[Dict[str, Any]],
+                new: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Return (new issues, resolved issues) between two issue lists of a file"""
+    old_counts = Counter(_issue_key(issue) for issue in old)
+    new_counts = Counter(_issue_key(issue) for issue in new)
+    
+    added, resolved = [], []
+    for issue in new:
+        key = _issue_key(issue)
+        if old_counts[key] > 0:
+            old_counts[key] -= 1
+        else:
+            added.append(issue)
+    for issue in old:
+        key = _issue_key(issue)
+        if new_counts[key] > 0:
+            new_counts[key] -= 1
+        else:
+            resolved.append(issue)
+    return added, resolved
+
+
+class LintWatcher:
+    """
+    Re-lint only modified files under a directory and report issue deltas
+    
+    Uses inotify through ctypes when available, so a tick only rescans
+    directories the kernel reported; otherwise each tick stats the tree with
+    os.scandir. Either way file contents are read only when stat changed.
+    """
+    
+    def __init__(self, directory: str, recursive: bool = True, config: dict = None,
+                 use_inotify: bool = True):
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Directory not found: {directory}")
+        self.index = FileStateIndex(directory, recursive)
+        self.config = config
+        self.issues: Dict[str, List[Dict[str, Any]]] = {}
+        self._inotify = None
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+    
+    @property
+    def mode(self) -> str:
+        """Change detection mode: 'inotify' or 'poll'"""
+        return 'inotify' if self._inotify is not None else 'poll'
+    
+    def _watch_dirs(self, directories: List[str]):
+        """Add inotify watches, falling back to polling if the kernel refuses"""
+        if self._inotify is None:
+            return
+        try:
+            for directory in directories:
+                self._inotify.add_watch(directory)
+        except OSError:
+            # Typically fs.inotify.max_user_watches exhausted on huge trees
+            self._inotify.close()
+            self._inotify = None
+    
+    def _relint(self, changed: List[str], removed: List[str]) -> List[Tuple[str, List, List]]:
+        """Lint changed files and compute per-file deltas"""
+        deltas = []
+        for file_path in changed:
+            new = _lint_file_safe(file_path, config=self.config)
+            added, resolved = diff_issues(self.issues.get(file_path, []), new)
+            self.issues[file_path] = new
+            if added or resolved:
+                deltas.append((file_path, added, resolved))
+        for file_path in removed:
+            old = self.issues.pop(file_path, [])
+            if old:
+                deltas.append((file_path, [], old))
+        return deltas
+    
+    def start(self, workers: int = 1) -> Dict[str, List[Dict[str, Any]]]:
+        """Index and lint the whole tree once, returning the initial results"""
+        changed, _, new_dirs = self.index.scan()
+        self._watch_dirs(new_dirs)
+        for file_path, issues in iter_lint_files(changed, workers, config=self.config):
+            self.issues[file_path] = issues
+        return self.issues
+    
+    def poll(self, timeout: float = 0.0) -> List[Tuple[str, List, List]]:
+        """
+        Wait up to timeout for changes and re-lint modified files
+        
+        Returns:
+            List of (file path, new issues, resolved issues)
+        """
+        if self._inotify is not None:
+            dirty = self._inotify.read_dirty(timeout)
+            changed, removed, new_dirs = self.index.scan(dirty)
+        else:
+            if timeout:
+                time.sleep(timeout)
+            changed, removed, new_dirs = self.index.scan()
+        self._watch_dirs(new_dirs)
+        return self._relint(changed, removed)
+    
+    def close(self):
+        """Release the inotify descriptor"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def format_issue_delta(file_path: str, added: List[Dict[str, Any]],
+                       resolved: List[Dict[str, Any]]) -> str:
+    """Format new and resolved issues of one file"""
+    lines = [f"🔄 {file_path}"]
+    for prefix, issues in (('+', added), ('-', resolved)):
+        for issue in issues:
+            line_info = f" (Line {issue['line']})" if issue.get('line') else ""
+            lines.append(f"  {prefix} [{issue['severity'].upper()}] {issue['type']}: "
+                         f"{issue['message']}{line_info}")
+    return '\n'.join(lines)
+
+
+def watch_directory(directory: str, recursive: bool = True, interval: float = 1.0,
+                    workers: int = 1, config: dict = None, stream: TextIO = None):
+    """Watch directory and print issue deltas until interrupted"""
+    stream = stream or sys.stdout
+    watcher = LintWatcher(directory, recursive, config)
+    try:
+        results = watcher.start(workers)
+        total = sum(len(issues) for issues in results.values())
+        print(f"👀 Watching {len(results)} files in {directory} ({watcher.mode}), "
+              f"{total} issues. Press Ctrl+C to stop.", file=stream, flush=True)
+        while True:
+            for file_path, added, resolved in watcher.poll(interval):
+                print(format_issue_delta(file_path, added, resolved), file=stream, flush=True)
+    finally:
+        watcher.close()
 
 
 def format_issues(issues: List[Dict[str, Any]]) -> str:
@@ -336,9 +1496,105 @@ def format_directory_results(results: Dict[str, List[Dict[str, Any]]], format_ty
     return '\n'.join(output)
 
 
-def register_parser(subparsers):
-    """Register linter command parser"""
-    parser = subparsers.add_parser('lint', help='Static Code Analysis Tool')
+def _count_severities(counts: Dict[str, int], issues: List[Dict[str, Any]]):
+    """Add issues to per-severity counts"""
+    for issue in issues:
+        counts[issue['severity']] = counts.get(issue['severity'], 0) + 1
+
+
+def write_ndjson(results: Iterable[Tuple[str, List[Dict[str, Any]]]], stream: TextIO) -> Dict[str, int]:
+    """
+    Stream lint results as newline-delimited JSON, one issue per line
+    
+    Args:
+        results: Iterable of (file path, issues), e.g. from iter_lint_directory
+        stream: Text stream to write to, flushed after every file
+        
+    Returns:
+        Issue count per severity
+    """
+    counts = {}
+    for file_path, issues in results:
+        for issue in issues:
+            stream.write(json.dumps(dict(issue, file=file_path), ensure_ascii=False))
+            stream.write('\n')
+        stream.flush()
+        _count_severities(counts, issues)
+    return counts
+
+
+def _sarif_result(file_path: str, issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an issue to a SARIF result object"""
+    region = {}
+    if issue.get('line'):
+        region['startLine'] = issue['line']
+        if isinstance(issue.get('column'), int):
+            # SARIF columns are 1-based, AST column offsets are 0-based
+            region['startColumn'] = issue['column'] + 1
+    
+    location = {'artifactLocation': {'uri': Path(file_path).as_posix()}}
+    if region:
+        location['region'] = region
+    
+    return {
+        'ruleId': issue['type'],
+        'level': SARIF_LEVELS.get(issue['severity'], 'none'),
+        'message': {'text': issue['message']},
+        'locations': [{'physicalLocation': location}],
+    }
+
+
+def write_sarif(results: Iterable[Tuple[str, List[Dict[str, Any]]]], stream: TextIO) -> Dict[str, int]:
+    """
+    Stream lint results as a SARIF 2.1.0 log
+    
+    The log header is written first and each result is written as soon as
+    its file is linted, so the whole report is never held in memory.
+    
+    Args:
+        results: Iterable of (file path, issues), e.g. from iter_lint_directory
+        stream: Text stream to write to, flushed after every file
+        
+    Returns:
+        Issue count per severity
+    """
+    header = json.dumps({
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {'name': 'devkit-zero-lint', 'version': __version__}},
+            'results': [],
+        }],
+    })
+    # Split the header just inside the empty results array
+    prefix, suffix = header.rsplit('[]', 1)
+    stream.write(prefix + '[')
+    stream.flush()
+    
+    counts = {}
+    first = True
+    for file_path, issues in results:
+        for issue in issues:
+            if not first:
+                stream.write(',')
+            stream.write('\n' + json.dumps(_sarif_result(file_path, issue), ensure_ascii=False))
+            first = False
+        stream.flush()
+        _count_severities(counts, issues)
+    
+    stream.write('\n]' + suffix + '\n')
+    stream.flush()
+    return counts
+
+
+STREAM_WRITERS = {
+    'ndjson': write_ndjson,
+    'sarif': write_sarif,
+}
+
+
+def _add_arguments(parser):
+    """Add lint arguments shared by the subcommand and standalone parsers"""
     parser.add_argument('path', nargs='?', help='Path to file or directory to lint')
     parser.add_argument('--file', '-f', help='Path to file to lint')
     parser.add_argument('--dir', '-d', help='Path to directory to lint')
@@ -347,14 +1603,55 @@ def register_parser(subparsers):
                        help='Recursively lint directory (default: enabled)')
     parser.add_argument('--no-recursive', dest='recursive', action='store_false',
                        help='Do not recursively lint directory')
-    parser.add_argument('--format', choices=['detailed', 'summary', 'json'], default='detailed',
-                       help='Output format')
+    parser.add_argument('--format', choices=['detailed', 'summary', 'json', 'ndjson', 'sarif'],
+                       default='detailed',
+                       help='Output format (ndjson and sarif are streamed as files finish)')
+    parser.add_argument('--output', '-o', help='Write output to file instead of stdout')
     parser.add_argument(
         '--min-severity',
         choices=['info', 'warning', 'error'],
         default='warning',
         help='Set minimum severity level for non-zero exit code'
     )
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Number of worker processes for directory lint (0 = CPU count, default: 1)')
+    parser.add_argument('--changed-since', metavar='REF',
+                       help='Only lint Python files changed since git REF (e.g. origin/main), plus untracked files')
+    parser.add_argument('--staged', action='store_true',
+                       help='Only lint Python files with staged changes')
+    parser.add_argument('--changed-lines', action='store_true',
+                       help='With --changed-since/--staged, only report issues on changed lines')
+    parser.add_argument('--no-cache', dest='cache', action='store_false', default=True,
+                       help='Do not read or write the lint result cache')
+    parser.add_argument('--clear-cache', action='store_true',
+                       help='Delete the lint result cache before running')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                       help=f'Lint result cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--disable-rule', action='append', choices=CodeLinter.RULE_NAMES,
+                       metavar='RULE', default=[],
+                       help=f"Disable a rule (repeatable): {', '.join(CodeLinter.RULE_NAMES)}")
+    parser.add_argument('--profile-rules', action='store_true',
+                       help='Print cumulative time and call count per rule to stderr')
+    parser.add_argument('--profile-output', metavar='FILE',
+                       help='Write per-rule profile data as JSON to FILE')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Run a lint server on a Unix socket, keeping parsed files warm')
+    parser.add_argument('--client', action='store_true',
+                       help='Send file lint requests to the running daemon (falls back to local lint)')
+    parser.add_argument('--stop-daemon', action='store_true',
+                       help='Ask the running daemon to exit')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH,
+                       help=f'Daemon socket path (default: {DEFAULT_SOCKET_PATH})')
+    parser.add_argument('--watch', metavar='DIR',
+                       help='Watch DIR and re-lint modified files, printing new and resolved issues')
+    parser.add_argument('--interval', type=float, default=1.0,
+                       help='Watch mode polling interval in seconds (default: 1.0)')
+
+
+def register_parser(subparsers):
+    """Register linter command parser"""
+    parser = subparsers.add_parser('lint', help='Static Code Analysis Tool')
+    _add_arguments(parser)
     parser.set_defaults(func=main_function)
 
 
@@ -364,10 +1661,48 @@ def main_function(args):
         issues = []
         output = ""
         
+        cache = LintCache(args.cache_dir)
+        if args.clear_cache:
+            cache.clear()
+            if not (args.code or args.file or args.dir or args.path):
+                print(f"✓ Lint cache cleared: {args.cache_dir}")
+                return 0
+        if not args.cache:
+            cache = None
+        
+        config = {rule: 'off' for rule in args.disable_rule}
+        profile = RuleProfile() if args.profile_rules or args.profile_output else None
+        
+        if args.daemon:
+            print(f"🚀 Lint daemon listening on {args.socket}", file=sys.stderr)
+            LintDaemon(args.socket).serve()
+            return 0
+        
+        if args.watch:
+            watch_directory(args.watch, args.recursive, args.interval, args.jobs, config)
+            return 0
+        
+        if args.stop_daemon:
+            daemon_request({'op': 'shutdown'}, args.socket)
+            print("✓ Lint daemon stopped")
+            return 0
+        
+        if args.format in STREAM_WRITERS:
+            exit_code = _stream_main(args, cache, config, profile)
+            _report_profile(args, profile)
+            return exit_code
+        
         # Determine lint target
-        if args.code:
+        if args.changed_since or args.staged:
+            # Lint files changed in git
+            results = dict(sorted(_iter_changed(args, cache, config, profile)))
+            output = format_directory_results(results, args.format)
+            for file_issues in results.values():
+                issues.extend(file_issues)
+        
+        elif args.code:
             # Lint code string
-            issues = lint_code(args.code)
+            issues = lint_code(args.code, config=config, profile=profile)
             if args.format == 'json':
                 output = format_issues_json(issues)
             elif args.format == 'summary':
@@ -380,7 +1715,7 @@ def main_function(args):
         
         elif args.file:
             # Lint single file
-            issues = lint_file(args.file)
+            issues = _lint_target_file(args, args.file, cache, config, profile)
             if args.format == 'json':
                 output = format_issues_json(issues)
             elif args.format == 'summary':
@@ -393,7 +1728,7 @@ def main_function(args):
         
         elif args.dir:
             # Lint directory
-            results = lint_directory(args.dir, args.recursive)
+            results = lint_directory(args.dir, args.recursive, args.jobs, cache, config, profile)
             output = format_directory_results(results, args.format)
             # Collect all issues for exit code
             for file_issues in results.values():
@@ -403,13 +1738,13 @@ def main_function(args):
             # Auto-detect path type
             path = Path(args.path)
             if path.is_file():
-                issues = lint_file(args.path)
+                issues = _lint_target_file(args, args.path, cache, config, profile)
                 if args.format == 'json':
                     output = format_issues_json(issues)
                 else:
                     output = format_issues(issues)
             elif path.is_dir():
-                results = lint_directory(args.path, args.recursive)
+                results = lint_directory(args.path, args.recursive, args.jobs, cache, config, profile)
                 output = format_directory_results(results, args.format)
                 for file_issues in results.values():
                     issues.extend(file_issues)
@@ -422,43 +1757,102 @@ def main_function(args):
             return 1
         
         # Output result
-        print(output)
-        
-        # Determine exit code based on severity
-        severity_levels = {'info': 0, 'warning': 1, 'error': 2}
-        min_level = severity_levels.get(args.min_severity, 1)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        else:
+            print(output)
         
-        for issue in issues:
-            issue_level = severity_levels.get(issue['severity'], 0)
-            if issue_level >= min_level:
-                return 1
+        _report_profile(args, profile)
         
-        return 0
+        return _exit_code((issue['severity'] for issue in issues), args.min_severity)
             
     except Exception as e:
         print(f"❌ Lint failed: {e}")
         return 1
 
 
+def _exit_code(severities: Iterable[str], min_severity: str) -> int:
+    """Return 1 if any severity reaches min_severity, else 0"""
+    severity_levels = {'info': 0, 'warning': 1, 'error': 2}
+    min_level = severity_levels.get(min_severity, 1)
+    
+    for severity in severities:
+        if severity_levels.get(severity, 0) >= min_level:
+            return 1
+    
+    return 0
+
+
+def _lint_target_file(args, file_path: str, cache: Optional[LintCache], config: dict,
+                      profile: Optional[RuleProfile]) -> List[Dict[str, Any]]:
+    """Lint a single target file, through the daemon in client mode"""
+    if args.client:
+        return lint_via_daemon(file_path, args.socket, config)
+    return lint_file(file_path, cache, config, profile)
+
+
+def _report_profile(args, profile: Optional[RuleProfile]):
+    """Print the rule profile table and/or write it as JSON"""
+    if profile is None:
+        return
+    if args.profile_rules:
+        print("\n⏱️ Rule profile", file=sys.stderr)
+        print(profile.format_table(), file=sys.stderr)
+    if args.profile_output:
+        with open(args.profile_output, 'w', encoding='utf-8') as f:
+            json.dump(profile.to_dict(), f, indent=2)
+
+
+def _iter_changed(args, cache: Optional[LintCache], config: dict,
+                  profile: Optional[RuleProfile]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Lint files changed in git, restricted to the path argument if given"""
+    return iter_lint_changed(
+        ref=args.changed_since,
+        staged=args.staged,
+        path=args.path or args.dir or '.',
+        changed_lines_only=args.changed_lines,
+        workers=args.jobs,
+        cache=cache,
+        config=config,
+        profile=profile
+    )
+
+
+def _stream_main(args, cache: Optional[LintCache], config: dict,
+                 profile: Optional[RuleProfile]) -> int:
+    """Lint target and stream results with a streaming writer"""
+    if args.changed_since or args.staged:
+        results = _iter_changed(args, cache, config, profile)
+    elif args.code:
+        results = [("<string>", lint_code(args.code, config=config, profile=profile))]
+    else:
+        target = args.file or args.dir or args.path
+        if not target:
+            print("❌ Please provide file (--file), directory (--dir), path, or code (--code) to lint")
+            return 1
+        if Path(target).is_file():
+            results = [(target, _lint_target_file(args, target, cache, config, profile))]
+        elif Path(target).is_dir():
+            results = iter_lint_directory(target, args.recursive, args.jobs, cache, config, profile)
+        else:
+            print(f"❌ Path not found: {target}")
+            return 1
+    
+    writer = STREAM_WRITERS[args.format]
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            counts = writer(results, f)
+    else:
+        counts = writer(results, sys.stdout)
+    
+    return _exit_code((severity for severity, count in counts.items() if count), args.min_severity)
+
+
 def main():
     """Standalone entry point"""
     parser = argparse.ArgumentParser(description='Static Code Analysis Tool')
-    parser.add_argument('path', nargs='?', help='Path to file or directory to lint')
-    parser.add_argument('--file', '-f', help='Path to file to lint')
-    parser.add_argument('--dir', '-d', help='Path to directory to lint')
-    parser.add_argument('--code', '-c', help='Code string to lint')
-    parser.add_argument('--recursive', '-r', action='store_true', default=True,
-                       help='Recursively lint directory (default: enabled)')
-    parser.add_argument('--no-recursive', dest='recursive', action='store_false',
-                       help='Do not recursively lint directory')
-    parser.add_argument('--format', choices=['detailed', 'summary', 'json'], default='detailed',
-                       help='Output format')
-    parser.add_argument(
-        '--min-severity',
-        choices=['info', 'warning', 'error'],
-        default='warning',
-        help='Set minimum severity level for non-zero exit code'
-    )
+    _add_arguments(parser)
     
     args = parser.parse_args()
     exit_code = main_function(args)
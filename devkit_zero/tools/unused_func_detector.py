@@ -1,12 +1,35 @@
 import argparse
 import ast
+import hashlib
+import io
+import os
+import re
+import sqlite3
 import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional
-from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Set, TextIO, Tuple, Optional
+from collections import defaultdict, deque
+
+try:
+    from ..__version__ import __version__
+except ImportError:
+    # Running as a standalone script
+    __version__ = "standalone"
+
+# Symbol indexes live under the user cache directory, never inside the analyzed tree
+INDEX_CACHE_DIR = os.path.join('devkit_zero', 'unused_func')
+
+DEFAULT_EXCLUDE_DIRS = [
+    'venv', '.venv', '__pycache__', '.git', 'build', 'dist', '.pytest_cache',
+    '.tox', 'node_modules', '.devkit_cache',
+]
 
 class FunctionInfo:
     """Function information"""
+    __slots__ = ('name', 'file_path', 'line_no', 'is_method', 'class_name', 'called_count')
+    
     def __init__(self, name: str, file_path: str, line_no: int, 
                  is_method: bool = False, class_name: Optional[str] = None):
         self.name = name
@@ -27,12 +50,93 @@ class FunctionInfo:
         return f"<FunctionInfo {self.full_name} at {self.file_path}:{self.line_no}>"
 
 
+class FunctionTable:
+    """
+    Struct-of-arrays store of function definitions
+    
+    File paths, names and class names are interned once into a string table
+    and rows hold only integer IDs in typed arrays. Definitions are keyed by
+    a packed (file, class, name) integer, so a later definition with the same
+    full name in the same file replaces the earlier one in place.
+    FunctionInfo objects are only created for the rows that are reported.
+    """
+    
+    __slots__ = ('strings', '_string_ids', 'file_ids', 'name_ids', 'class_ids', 'line_nos', '_rows')
+    
+    def __init__(self):
+        # ID 0 is reserved for "no class"
+        self.strings: List[str] = ['']
+        self._string_ids: Dict[str, int] = {'': 0}
+        self.file_ids = array('q')
+        self.name_ids = array('q')
+        self.class_ids = array('q')
+        self.line_nos = array('q')
+        self._rows: Dict[int, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.name_ids)
+    
+    def intern(self, value: str) -> int:
+        """Return the integer ID of a string, adding it to the table if needed"""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+    
+    def add(self, file_path: str, name: str, line_no: int, class_name: Optional[str] = None) -> int:
+        """
+        Add a definition
+        
+        Returns:
+            Row number of the definition
+        """
+        file_id = self.intern(file_path)
+        name_id = self.intern(name)
+        class_id = self.intern(class_name) if class_name else 0
+        key = (file_id << 64) | (class_id << 32) | name_id
+        row = self._rows.get(key)
+        if row is not None:
+            self.line_nos[row] = line_no
+            return row
+        
+        row = len(self.name_ids)
+        self._rows[key] = row
+        self.file_ids.append(file_id)
+        self.name_ids.append(name_id)
+        self.class_ids.append(class_id)
+        self.line_nos.append(line_no)
+        return row
+    
+    def function_info(self, row: int) -> FunctionInfo:
+        """Materialize one row as a FunctionInfo"""
+        class_name = self.strings[self.class_ids[row]] if self.class_ids[row] else None
+        return FunctionInfo(
+            self.strings[self.name_ids[row]], self.strings[self.file_ids[row]],
+            self.line_nos[row], class_name is not None, class_name
+        )
+    
+    def functions(self) -> List[FunctionInfo]:
+        """Materialize every row, in insertion order"""
+        return [self.function_info(row) for row in range(len(self))]
+    
+    def uncalled(self, called_names: Set[str]) -> List[FunctionInfo]:
+        """Return definitions whose name is not in called_names"""
+        called_ids = {self._string_ids[name] for name in called_names if name in self._string_ids}
+        return [
+            self.function_info(row)
+            for row, name_id in enumerate(self.name_ids)
+            if name_id not in called_ids
+        ]
+
+
 # =============================================================================
 # AST Analyzer
 # =============================================================================
 
-class FunctionDefVisitor(ast.NodeVisitor):
-    """Function definition visitor"""
+class FunctionVisitor(ast.NodeVisitor):
+    """Collect function definitions and function calls in a single traversal"""
     
     # Excluded special functions
     EXCLUDED_FUNCTIONS = {
@@ -41,9 +145,13 @@ class FunctionDefVisitor(ast.NodeVisitor):
         'main', 'setUp', 'tearDown', 'test_.*'  # Test functions
     }
     
+    # All exclusion patterns combined, matched at the start of the name like re.match
+    _EXCLUDED_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in sorted(EXCLUDED_FUNCTIONS)))
+    
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.functions: List[FunctionInfo] = []
+        self.calls: Set[str] = set()
         self.current_class: Optional[str] = None
     
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
@@ -68,21 +176,6 @@ class FunctionDefVisitor(ast.NodeVisitor):
         
         self.generic_visit(node)
     
-    def _should_exclude(self, func_name: str) -> bool:
-        """Check if function should be excluded"""
-        import re
-        for pattern in self.EXCLUDED_FUNCTIONS:
-            if re.match(pattern, func_name):
-                return True
-        return False
-
-
-class FunctionCallVisitor(ast.NodeVisitor):
-    """Function call visitor"""
-    
-    def __init__(self):
-        self.calls: Set[str] = set()
-    
     def visit_Call(self, node: ast.Call) -> None:
         """Visit function call"""
         # Handle simple call: func()
@@ -94,6 +187,10 @@ class FunctionCallVisitor(ast.NodeVisitor):
             self.calls.add(node.func.attr)
         
         self.generic_visit(node)
+    
+    def _should_exclude(self, func_name: str) -> bool:
+        """Check if function should be excluded"""
+        return self._EXCLUDED_RE.match(func_name) is not None
 
 
 # =============================================================================
@@ -116,15 +213,11 @@ def analyze_file(file_path: Path) -> Tuple[List[FunctionInfo], Set[str]]:
         
         tree = ast.parse(content, filename=str(file_path))
         
-        # Extract function definitions
-        def_visitor = FunctionDefVisitor(str(file_path))
-        def_visitor.visit(tree)
+        # Extract function definitions and calls in one pass
+        visitor = FunctionVisitor(str(file_path))
+        visitor.visit(tree)
         
-        # Extract function calls
-        call_visitor = FunctionCallVisitor()
-        call_visitor.visit(tree)
-        
-        return def_visitor.functions, call_visitor.calls
+        return visitor.functions, visitor.calls
         
     except SyntaxError as e:
         print(f"Warning: Syntax error in {file_path}: {e}", file=sys.stderr)
@@ -134,36 +227,342 @@ def analyze_file(file_path: Path) -> Tuple[List[FunctionInfo], Set[str]]:
         return [], set()
 
 
-def find_python_files(root_path: Path, exclude_patterns: List[str]) -> List[Path]:
+def _analyze_file_compact(file_path: Path) -> Tuple[List[Tuple[str, int, Optional[str]]], Set[str]]:
     """
-    Find all Python files
+    Analyze a file into plain (name, line_no, class_name) tuples
+    
+    Compact tuples are cheap to pickle back from worker processes and go
+    straight into a FunctionTable without intermediate FunctionInfo objects.
+    """
+    functions, calls = analyze_file(file_path)
+    return [(f.name, f.line_no, f.class_name) for f in functions], calls
+
+
+def _iter_analyzed(
+    python_files: List[Path], workers: int
+) -> Iterator[Tuple[List[Tuple[str, int, Optional[str]]], Set[str]]]:
+    """Analyze files serially or across a process pool, yielding compact results"""
+    if not workers:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(python_files))
+    
+    if workers <= 1:
+        for py_file in python_files:
+            yield _analyze_file_compact(py_file)
+        return
+    
+    # Several chunks per worker keeps the pool busy when file sizes are uneven
+    chunksize = max(1, len(python_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_analyze_file_compact, python_files, chunksize=chunksize)
+
+
+def default_index_path(project_path: Path) -> str:
+    """
+    Symbol index location for a project under the user cache directory
+    
+    Uses $XDG_CACHE_HOME (default ~/.cache), with one file per project
+    keyed by a hash of its absolute path.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    key = hashlib.sha256(str(project_path).encode('utf-8', 'surrogatepass')).hexdigest()[:16]
+    return os.path.join(cache_home, INDEX_CACHE_DIR, f"{project_path.name or 'root'}-{key}.sqlite")
+
+
+class SymbolIndex:
+    """
+    Persistent SQLite index of per-file function definitions and calls
+    
+    Files are keyed by path with their (mtime_ns, size) and content hash, so
+    an update re-analyzes only files whose content changed. The unused set
+    is computed from the stored rows with a single SQL anti-join.
+    """
+    
+    SCHEMA_VERSION = '1'
+    
+    def __init__(self, db_path: str):
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self._init_schema()
+    
+    def _init_schema(self):
+        """Create tables, rebuilding them if the schema or tool version changed"""
+        version = f"{self.SCHEMA_VERSION}:{__version__}"
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != version:
+                self.conn.executescript("""
+                    DROP TABLE IF EXISTS files;
+                    DROP TABLE IF EXISTS functions;
+                    DROP TABLE IF EXISTS calls;
+                """)
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, hash TEXT
+                );
+                CREATE TABLE IF NOT EXISTS functions (
+                    file_path TEXT, ordinal INTEGER, name TEXT, line_no INTEGER, class_name TEXT
+                );
+                CREATE TABLE IF NOT EXISTS calls (file_path TEXT, name TEXT);
+                CREATE INDEX IF NOT EXISTS idx_functions_file ON functions (file_path);
+                CREATE INDEX IF NOT EXISTS idx_calls_file ON calls (file_path);
+                CREATE INDEX IF NOT EXISTS idx_calls_name ON calls (name);
+            """)
+    
+    def update(self, python_files: List[Path], workers: int = 1) -> int:
+        """
+        Bring the index in line with python_files
+        
+        Returns:
+            Number of files that were (re-)analyzed
+        """
+        stored = {
+            path: (mtime_ns, size, digest)
+            for path, mtime_ns, size, digest in self.conn.execute("SELECT * FROM files")
+        }
+        
+        changed: List[Tuple[Path, int, int, str]] = []
+        touched: List[Tuple[int, int, str]] = []
+        current = set()
+        for py_file in python_files:
+            path = str(py_file)
+            current.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            old = stored.get(path)
+            if old is not None and old[:2] == (stat.st_mtime_ns, stat.st_size):
+                continue
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            if old is not None and old[2] == digest:
+                # Touched but unchanged: refresh stat data only
+                touched.append((stat.st_mtime_ns, stat.st_size, path))
+            else:
+                changed.append((py_file, stat.st_mtime_ns, stat.st_size, digest))
+        
+        removed = [(path,) for path in stored if path not in current]
+        
+        with self.conn:
+            self.conn.executemany("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", touched)
+            for table, column in (('files', 'path'), ('functions', 'file_path'), ('calls', 'file_path')):
+                self.conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", removed)
+                self.conn.executemany(
+                    f"DELETE FROM {table} WHERE {column} = ?", [(str(c[0]),) for c in changed]
+                )
+            
+            analyzed = _iter_analyzed([c[0] for c in changed], workers)
+            for (py_file, mtime_ns, size, digest), (functions, calls) in zip(changed, analyzed):
+                path = str(py_file)
+                self.conn.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (path, mtime_ns, size, digest))
+                self.conn.executemany(
+                    "INSERT INTO functions VALUES (?, ?, ?, ?, ?)",
+                    [(path, ordinal, name, line_no, class_name)
+                     for ordinal, (name, line_no, class_name) in enumerate(functions)]
+                )
+                self.conn.executemany("INSERT INTO calls VALUES (?, ?)", [(path, name) for name in calls])
+        
+        return len(changed)
+    
+    def unused_functions(self, file_order: Optional[List[Path]] = None) -> List[FunctionInfo]:
+        """Return indexed functions whose name is never called anywhere in the index"""
+        rows = self.conn.execute("""
+            SELECT fn.file_path, fn.name, fn.line_no, fn.class_name
+            FROM functions fn
+            WHERE NOT EXISTS (SELECT 1 FROM calls c WHERE c.name = fn.name)
+            ORDER BY fn.file_path, fn.ordinal
+        """).fetchall()
+        
+        if file_order is not None:
+            position = {str(path): index for index, path in enumerate(file_order)}
+            rows.sort(key=lambda row: position.get(row[0], len(position)))
+        
+        # Same table as the in-memory scan: a later definition replaces an earlier one
+        table = FunctionTable()
+        for file_path, name, line_no, class_name in rows:
+            table.add(file_path, name, line_no, class_name)
+        return table.functions()
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore-style glob into a regex body ('**' may span directories)"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            parts.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+            end = pattern.index(']', i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            parts.append(f'[{body}]')
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+
+class IgnoreRule:
+    """A single exclusion rule with gitignore matching semantics"""
+    
+    def __init__(self, pattern: str, base: str = ''):
+        self.negated = pattern.startswith('!')
+        if self.negated:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        # A slash at the start or in the middle anchors the pattern to its base
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+        body = _glob_to_regex(pattern)
+        self.base = base
+        self.regex = re.compile(('^' if anchored else '(?:^|.*/)') + body + '$')
+    
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Check rule against a '/'-separated path relative to the walk root"""
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def _read_gitignore(directory: str, base: str) -> List[IgnoreRule]:
+    """Load rules from directory/.gitignore, if present"""
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+    
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('\\#') or line.startswith('\\!'):
+            line = line[1:]
+        rules.append(IgnoreRule(line, base))
+    return rules
+
+
+def _is_ignored(rules: List[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Apply rules in order; the last matching rule decides"""
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, is_dir):
+            ignored = not rule.negated
+    return ignored
+
+
+def iter_python_files(
+    root_path: Path,
+    exclude_patterns: List[str],
+    use_gitignore: bool = True
+) -> Iterator[Path]:
+    """
+    Lazily walk root_path for Python files, pruning excluded directories
+    
+    Excluded directories are never descended into. Exclusion patterns are
+    globs: patterns without '/' match any file or directory name, patterns
+    with '/' match the path relative to root_path. With use_gitignore,
+    .gitignore files found during the walk are applied to their subtree.
     
     Args:
         root_path: Root directory
-        exclude_patterns: Excluded directory patterns
+        exclude_patterns: Excluded directory/file glob patterns
+        use_gitignore: Whether to honour .gitignore files
         
-    Returns:
-        List of Python files
+    Yields:
+        Python file paths, in sorted order per directory
     """
-    python_files = []
+    base_rules = [IgnoreRule(pattern) for pattern in exclude_patterns if pattern]
+    root = str(root_path)
     
-    for py_file in root_path.rglob('*.py'):
-        # Check if should exclude
-        should_exclude = False
-        for pattern in exclude_patterns:
-            if pattern in str(py_file):
-                should_exclude = True
-                break
+    # Stack of (directory, path relative to root, rules in effect)
+    stack = [(root, '', base_rules)]
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        if use_gitignore:
+            local_rules = _read_gitignore(directory, rel_dir)
+            if local_rules:
+                rules = rules + local_rules
+        
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
         
-        if not should_exclude:
-            python_files.append(py_file)
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if _is_ignored(rules, rel_path, is_dir):
+                continue
+            if is_dir:
+                subdirs.append((entry.path, rel_path, rules))
+            elif entry.name.endswith('.py') and entry.is_file():
+                yield Path(entry.path)
+        
+        # Reverse so subdirectories are visited in sorted order
+        stack.extend(reversed(subdirs))
+
+
+def find_python_files(root_path: Path, exclude_patterns: List[str],
+                      use_gitignore: bool = True) -> List[Path]:
+    """
+    Find all Python files
     
-    return python_files
+    Args:
+        root_path: Root directory
+        exclude_patterns: Excluded directory/file glob patterns
+        use_gitignore: Whether to honour .gitignore files
+        
+    Returns:
+        List of Python files
+    """
+    return list(iter_python_files(root_path, exclude_patterns, use_gitignore))
 
 
 def detect_unused_functions(
     project_path: Path,
-    exclude_dirs: Optional[List[str]] = None
+    exclude_dirs: Optional[List[str]] = None,
+    workers: int = 1,
+    index_path: Optional[str] = None,
+    use_gitignore: bool = True
 ) -> List[FunctionInfo]:
     """
     Detect unused functions in the project
@@ -171,114 +570,869 @@ def detect_unused_functions(
     Args:
         project_path: Project root directory
         exclude_dirs: List of excluded directories
+        workers: Number of worker processes (1 = serial, 0 = CPU count)
+        index_path: Optional SQLite symbol index; only changed files are re-analyzed
+        use_gitignore: Whether to skip files ignored by .gitignore
         
     Returns:
         List of unused functions
     """
     if exclude_dirs is None:
-        exclude_dirs = ['venv', '__pycache__', '.git', 'build', 'dist', '.pytest_cache']
+        exclude_dirs = DEFAULT_EXCLUDE_DIRS
     
     # Find all Python files
-    python_files = find_python_files(project_path, exclude_dirs)
+    python_files = find_python_files(project_path, exclude_dirs, use_gitignore)
     
     if not python_files:
         print(f"No Python files found in {project_path}")
         return []
     
+    if index_path is not None:
+        index = None
+        try:
+            index = SymbolIndex(index_path)
+            analyzed = index.update(python_files, workers)
+            print(f"Analyzed {analyzed} of {len(python_files)} Python files (others unchanged)")
+            return index.unused_functions(python_files)
+        except (OSError, sqlite3.Error) as e:
+            # Unwritable location or corrupted index: a full scan gives the same answer
+            print(f"⚠️ Warning: symbol index {index_path} unavailable ({e}); scanning all files",
+                  file=sys.stderr)
+        finally:
+            if index is not None:
+                index.close()
+    
     print(f"Analyzing {len(python_files)} Python files...")
     
     # Collect all function definitions and calls
-    all_functions: Dict[str, FunctionInfo] = {}
+    table = FunctionTable()
     all_calls: Set[str] = set()
     
-    for py_file in python_files:
-        functions, calls = analyze_file(py_file)
-        
+    for py_file, (functions, calls) in zip(python_files, _iter_analyzed(python_files, workers)):
         # Record function definitions
-        for func in functions:
-            key = f"{func.file_path}:{func.full_name}"
-            all_functions[key] = func
+        file_path = str(py_file)
+        for name, line_no, class_name in functions:
+            table.add(file_path, name, line_no, class_name)
         
         # Record function calls
         all_calls.update(calls)
     
-    # Mark called functions
-    for func_info in all_functions.values():
-        if func_info.name in all_calls:
-            func_info.called_count += 1
-    
     # Return unused functions
-    unused = [f for f in all_functions.values() if f.called_count == 0]
-    
-    return unused
+    return table.uncalled(all_calls)
 
 
 # =============================================================================
-# Report Generation
+# Call Graph Analysis
 # =============================================================================
 
-def format_text_report(unused_functions: List[FunctionInfo]) -> str:
-    """Generate text report"""
-    if not unused_functions:
-        return "✅ No unused functions found!"
+# Console script / entry point declarations: "name = package.module:function"
+_ENTRY_POINT_RE = re.compile(r'([\w.-]+)\s*=\s*["\']?\s*([A-Za-z_][\w.]*)\s*:\s*([A-Za-z_][\w.]*)')
+
+# Decorators that do not register the decorated function anywhere
+PASSIVE_DECORATORS = {
+    'property', 'cached_property', 'staticmethod', 'classmethod', 'abstractmethod',
+    'setter', 'getter', 'deleter', 'wraps', 'lru_cache', 'cache', 'overload',
+}
+
+
+def _is_test_module(rel_path: str) -> bool:
+    """Check whether a project-relative path looks like a test module"""
+    parts = rel_path.split('/')
+    name = parts[-1]
+    return (
+        name.startswith('test_') or name.endswith('_test.py') or name == 'conftest.py'
+        or any(part in ('test', 'tests') for part in parts[:-1])
+    )
+
+
+class CallGraphCollector(ast.NodeVisitor):
+    """
+    Collect qualified definitions, scopes and references of one module
     
-    report = []
-    report.append(f"🔍 Found {len(unused_functions)} unused function(s):\n")
-    report.append("=" * 80)
+    References are kept unresolved (scope + dotted name) so that imports
+    across modules can be resolved once every module has been collected.
+    """
     
-    # Group by file
-    by_file: Dict[str, List[FunctionInfo]] = defaultdict(list)
-    for func in unused_functions:
-        by_file[func.file_path].append(func)
+    def __init__(self, module: str, is_package: bool):
+        self.module = module
+        self.package = module if is_package else module.rpartition('.')[0]
+        self.defs: List[Tuple[str, str, str, int, Optional[str]]] = []
+        self.scopes: Dict[str, dict] = {}
+        self.refs: Dict[str, List[Tuple[Optional[str], Tuple[str, ...]]]] = {}
+        self.self_refs: Dict[str, List[Tuple[str, str]]] = {}
+        self.instance_refs: Dict[str, List[Tuple[str, Tuple[str, ...], Tuple[str, ...]]]] = {}
+        self.attr_refs: Dict[str, Set[str]] = {}
+        self.imports: Dict[str, List[str]] = {}
+        self.registered: Dict[str, List[str]] = {}
+        self.bases: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+        self.external_bases: Set[str] = set()
+        self.has_main_guard = False
+        self._stack: List[str] = []
+        self._self_names: List[Dict[str, str]] = [{}]
+        self._push_scope(module, 'module', None)
+    
+    def _push_scope(self, qname: str, kind: str, parent: Optional[str]) -> None:
+        self.scopes[qname] = {'kind': kind, 'parent': parent, 'locals': {}, 'stars': []}
+        self._stack.append(qname)
+    
+    @property
+    def owner(self) -> str:
+        return self._stack[-1]
+    
+    def _bind(self, name: str, target: Optional[str]) -> None:
+        targets = self.scopes[self.owner]['locals'].setdefault(name, [])
+        if target is not None:
+            targets.append(target)
+    
+    def _resolve_relative(self, module: Optional[str], level: int) -> str:
+        """Turn a (possibly relative) from-import module into an absolute name"""
+        if not level:
+            return module or ''
+        base = self.package.split('.') if self.package else []
+        base = base[:len(base) - (level - 1)] if level > 1 else base
+        if module:
+            base.append(module)
+        return '.'.join(base)
+    
+    def visit_Module(self, node: ast.Module) -> None:
+        for stmt in node.body:
+            if (isinstance(stmt, ast.If) and isinstance(stmt.test, ast.Compare)
+                    and isinstance(stmt.test.left, ast.Name) and stmt.test.left.id == '__name__'):
+                self.has_main_guard = True
+        self.generic_visit(node)
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.asname:
+                self._bind(alias.asname, alias.name)
+            else:
+                head = alias.name.split('.')[0]
+                self._bind(head, head)
+            self.imports.setdefault(self.owner, []).append(alias.name)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        base = self._resolve_relative(node.module, node.level)
+        imports = self.imports.setdefault(self.owner, [])
+        imports.append(base)
+        for alias in node.names:
+            if alias.name == '*':
+                self.scopes[self.owner]['stars'].append(base)
+                continue
+            target = f"{base}.{alias.name}" if base else alias.name
+            self._bind(alias.asname or alias.name, target)
+            # Importing a submodule executes it; plain names are only used when referenced
+            imports.append(target)
     
-    for file_path in sorted(by_file.keys()):
-        report.append(f"\n📄 File: {file_path}")
-        report.append("-" * 80)
+    def _visit_function(self, node) -> None:
+        owner = self.owner
+        owner_kind = self.scopes[owner]['kind']
+        qname = f"{owner}.{node.name}"
+        is_method = owner_kind == 'class'
+        self.defs.append((qname, 'method' if is_method else 'function', node.name, node.lineno,
+                          owner if is_method else None))
+        self._bind(node.name, qname)
         
-        for func in sorted(by_file[file_path], key=lambda f: f.line_no):
-            func_type = "method" if func.is_method else "function"
-            report.append(f"  Line {func.line_no:4d}: {func_type:8s} {func.full_name}")
+        # Decorators and defaults are evaluated in the enclosing scope
+        decorator_names = set()
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if isinstance(target, ast.Attribute):
+                decorator_names.add(target.attr)
+            elif isinstance(target, ast.Name):
+                decorator_names.add(target.id)
+            else:
+                decorator_names.add('')
+        if decorator_names - PASSIVE_DECORATORS:
+            self.registered.setdefault(owner, []).append(qname)
+        for default in node.args.defaults + [d for d in node.args.kw_defaults if d is not None]:
+            self.visit(default)
+        
+        self_names = dict(self._self_names[-1])
+        positional = node.args.posonlyargs + node.args.args
+        if is_method and positional and 'staticmethod' not in decorator_names:
+            self_names[positional[0].arg] = owner
+        
+        self._push_scope(qname, 'function', owner)
+        self._self_names.append(self_names)
+        all_args = positional + node.args.kwonlyargs + [a for a in (node.args.vararg, node.args.kwarg) if a]
+        for arg in all_args:
+            if arg.arg not in self_names:
+                self._bind(arg.arg, None)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._self_names.pop()
+        self._stack.pop()
     
-    report.append("\n" + "=" * 80)
-    report.append(f"Total: {len(unused_functions)} unused functions")
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        owner = self.owner
+        qname = f"{owner}.{node.name}"
+        self.defs.append((qname, 'class', node.name, node.lineno, None))
+        self._bind(node.name, qname)
+        
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        if node.decorator_list:
+            self.registered.setdefault(owner, []).append(qname)
+        bases = self.bases.setdefault(qname, [])
+        for base in node.bases:
+            self.visit(base)
+            parts = self._dotted(base)
+            if parts is None:
+                self.external_bases.add(qname)
+            elif parts != ('object',):
+                bases.append((owner, parts))
+        for keyword in node.keywords:
+            self.visit(keyword.value)
+        
+        self._push_scope(qname, 'class', owner)
+        self._self_names.append({})
+        for stmt in node.body:
+            self.visit(stmt)
+        self._self_names.pop()
+        self._stack.pop()
+    
+    @staticmethod
+    def _dotted(node: ast.AST) -> Optional[Tuple[str, ...]]:
+        """Return ('a', 'b', 'c') for a.b.c, or None for other expressions"""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        parts.append(node.id)
+        return tuple(reversed(parts))
+    
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.refs.setdefault(self.owner, []).append((self.owner, (node.id,)))
+        elif self.scopes[self.owner]['kind'] == 'function':
+            # Assignment makes the name local to the function
+            self._bind(node.id, None)
+    
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        parts = []
+        base = node
+        while isinstance(base, ast.Attribute):
+            parts.append(base.attr)
+            base = base.value
+        parts.reverse()
+        if not isinstance(node.ctx, ast.Load):
+            parts.pop()
+        
+        owner = self.owner
+        if isinstance(base, ast.Name) and base.id in self._self_names[-1]:
+            if parts:
+                self.self_refs.setdefault(owner, []).append((self._self_names[-1][base.id], parts[0]))
+                self.attr_refs.setdefault(owner, set()).update(parts[1:])
+        elif isinstance(base, ast.Name):
+            self.refs.setdefault(owner, []).append((owner, (base.id, *parts)))
+        elif isinstance(base, ast.Call) and parts and self._dotted(base.func) is not None:
+            # Cls(...).method: resolvable once Cls is known to be a project class
+            self.instance_refs.setdefault(owner, []).append((owner, self._dotted(base.func), tuple(parts)))
+            self.visit(base)
+        else:
+            self.attr_refs.setdefault(owner, set()).update(parts)
+            self.visit(base)
     
-    return "\n".join(report)
+    def to_dict(self) -> dict:
+        """Plain data for pickling across processes"""
+        return {
+            'module': self.module,
+            'defs': self.defs,
+            'scopes': self.scopes,
+            'refs': self.refs,
+            'self_refs': self.self_refs,
+            'instance_refs': self.instance_refs,
+            'attr_refs': self.attr_refs,
+            'imports': self.imports,
+            'registered': self.registered,
+            'bases': self.bases,
+            'external_bases': self.external_bases,
+            'has_main_guard': self.has_main_guard,
+        }
 
 
-def format_json_report(unused_functions: List[FunctionInfo]) -> str:
-    """Generate JSON report"""
-    import json
+def collect_module(file_path: Path, module: str, is_package: bool) -> Optional[dict]:
+    """
+    Collect call graph data for a single module
     
-    data = {
-        "total_count": len(unused_functions),
-        "unused_functions": [
-            {
-                "name": f.full_name,
-                "file": f.file_path,
-                "line": f.line_no,
-                "type": "method" if f.is_method else "function",
-                "class": f.class_name
-            }
-            for f in unused_functions
-        ]
-    }
+    Args:
+        file_path: Python file path
+        module: Dotted module name
+        is_package: Whether the file is a package __init__.py
+        
+    Returns:
+        Collected module data, or None if the file cannot be parsed
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=str(file_path))
+    except SyntaxError as e:
+        print(f"Warning: Syntax error in {file_path}: {e}", file=sys.stderr)
+        return None
+    except Exception as e:
+        print(f"Warning: Error analyzing {file_path}: {e}", file=sys.stderr)
+        return None
     
-    return json.dumps(data, indent=2)
+    collector = CallGraphCollector(module, is_package)
+    collector.visit(tree)
+    return collector.to_dict()
 
 
-def format_html_report(unused_functions: List[FunctionInfo]) -> str:
-    """Generate HTML report"""
-    html = """
+def _collect_module_task(task: Tuple[Path, str, bool]) -> Optional[dict]:
+    """Process pool wrapper for collect_module"""
+    return collect_module(*task)
+
+
+def module_names(project_path: Path, python_files: List[Path]) -> Dict[Path, Tuple[str, bool]]:
+    """
+    Map each file to its dotted module name
+    
+    Package roots are found by walking up while directories contain an
+    __init__.py, so src/ layouts resolve to the names used in imports.
+    
+    Returns:
+        {file path: (module name, is_package)}
+    """
+    package_dirs: Dict[Path, bool] = {}
+    
+    def is_package_dir(directory: Path) -> bool:
+        if directory not in package_dirs:
+            package_dirs[directory] = (directory / '__init__.py').is_file()
+        return package_dirs[directory]
+    
+    names: Dict[Path, Tuple[str, bool]] = {}
+    taken: Set[str] = set()
+    for py_file in python_files:
+        is_package = py_file.name == '__init__.py'
+        parts = [] if is_package else [py_file.stem]
+        directory = py_file.parent
+        while is_package_dir(directory) and directory != directory.parent:
+            parts.append(directory.name)
+            directory = directory.parent
+        module = '.'.join(reversed(parts)) or py_file.stem
+        if module in taken:
+            # Same name in two places (e.g. several conftest.py): fall back to the path
+            try:
+                rel = py_file.relative_to(project_path).with_suffix('')
+            except ValueError:
+                rel = py_file.with_suffix('')
+            module = '.'.join(rel.parts)
+        taken.add(module)
+        names[py_file] = (module, is_package)
+    return names
+
+
+def find_entry_points(project_path: Path) -> List[str]:
+    """Read console/GUI script entry points from setup.py, setup.cfg and pyproject.toml"""
+    entry_points = []
+    for config_name in ('setup.py', 'setup.cfg', 'pyproject.toml'):
+        config_file = project_path / config_name
+        if not config_file.is_file():
+            continue
+        try:
+            content = config_file.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        for _, module, attr in _ENTRY_POINT_RE.findall(content):
+            entry_point = f"{module}:{attr}"
+            if entry_point not in entry_points:
+                entry_points.append(entry_point)
+    return entry_points
+
+
+class CallGraph:
+    """
+    Project-wide graph of qualified definitions and the references between them
+    
+    Nodes are modules, classes, functions and methods named by their
+    qualified path (package.module.Class.method). Calls through imports,
+    aliases and self/cls are resolved to nodes; calls on receivers whose
+    type is unknown are kept as attribute names and bound only to methods
+    of classes that are themselves reachable.
+    """
+    
+    def __init__(self):
+        self.nodes: Dict[str, dict] = {}
+        self.edges: Dict[str, Set[str]] = defaultdict(set)
+        self.attr_calls: Dict[str, Set[str]] = defaultdict(set)
+        self.parents: Dict[str, str] = {}
+        self.class_bases: Dict[str, List[str]] = {}
+        self.class_members: Dict[str, List[str]] = defaultdict(list)
+        self.subclasses: Dict[str, List[str]] = defaultdict(list)
+        self.methods_by_name: Dict[str, List[str]] = defaultdict(list)
+        self.open_classes: Set[str] = set()
+        self.roots: Set[str] = set()
+        self.entry_points: List[str] = []
+        self._scopes: Dict[str, dict] = {}
+        self._aliases: Dict[str, str] = {}
+    
+    @classmethod
+    def build(cls, project_path: Path, python_files: List[Path], workers: int = 1) -> 'CallGraph':
+        """
+        Build the call graph for a set of project files
+        
+        Args:
+            project_path: Project root directory
+            python_files: Files to include
+            workers: Number of worker processes (1 = serial, 0 = CPU count)
+            
+        Returns:
+            Resolved call graph
+        """
+        names = module_names(project_path, python_files)
+        tasks = [(py_file, *names[py_file]) for py_file in python_files]
+        
+        if not workers:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(tasks))
+        if workers <= 1:
+            collected = [_collect_module_task(task) for task in tasks]
+        else:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                collected = list(executor.map(_collect_module_task, tasks, chunksize=chunksize))
+        
+        graph = cls()
+        modules = []
+        for (py_file, module, _), data in zip(tasks, collected):
+            if data is None:
+                continue
+            modules.append(data)
+            graph._add_module(py_file, project_path, data)
+        graph.entry_points = find_entry_points(project_path)
+        for data in modules:
+            graph._link_aliases(data)
+        for data in modules:
+            graph._link_bases(data)
+        graph._propagate_open_classes()
+        for data in modules:
+            graph._link_refs(data)
+        return graph
+    
+    def _add_node(self, qname: str, kind: str, file_path: str, line_no: int,
+                  name: str, class_name: Optional[str] = None) -> None:
+        self.nodes[qname] = {
+            'kind': kind, 'file': file_path, 'line': line_no,
+            'name': name, 'class': class_name,
+        }
+    
+    def _add_module(self, py_file: Path, project_path: Path, data: dict) -> None:
+        """Register the nodes and scopes of one collected module"""
+        module = data['module']
+        file_path = str(py_file)
+        self._add_node(module, 'module', file_path, 0, module.rpartition('.')[2])
+        package = module.rpartition('.')[0]
+        if package:
+            self.parents[module] = package
+        self._scopes.update(data['scopes'])
+        
+        for qname, kind, name, line_no, class_qname in data['defs']:
+            class_name = class_qname.rpartition('.')[2] if class_qname else None
+            self._add_node(qname, kind, file_path, line_no, name, class_name)
+            self.parents[qname] = qname.rpartition('.')[0]
+            if class_qname:
+                self.class_members[class_qname].append(qname)
+                self.methods_by_name[name].append(qname)
+        
+        try:
+            rel_path = py_file.relative_to(project_path).as_posix()
+        except ValueError:
+            rel_path = py_file.name
+        if py_file.name == '__main__.py' or data['has_main_guard']:
+            self.roots.add(module)
+        if _is_test_module(rel_path):
+            self.roots.add(module)
+            for qname, kind, name, _, class_qname in data['defs']:
+                in_test_class = class_qname and class_qname.rpartition('.')[2].startswith('Test')
+                if kind != 'class' and (name.startswith('test') or in_test_class):
+                    self.roots.add(qname)
+    
+    def _link_aliases(self, data: dict) -> None:
+        """Names imported at module level are aliases for other modules' symbols"""
+        module = data['module']
+        for name, targets in self._scopes[module]['locals'].items():
+            qname = f"{module}.{name}"
+            if targets and qname not in self.nodes and targets[0] != qname:
+                self._aliases[qname] = targets[0]
+    
+    def _link_bases(self, data: dict) -> None:
+        """Resolve base classes; classes with bases outside the project are open"""
+        for qname, bases in data['bases'].items():
+            resolved = []
+            for scope, parts in bases:
+                target = self.resolve_name(scope, parts)
+                if target is not None and self.nodes[target]['kind'] == 'class':
+                    resolved.append(target)
+                else:
+                    self.open_classes.add(qname)
+            self.class_bases[qname] = resolved
+            for base in resolved:
+                self.subclasses[base].append(qname)
+        self.open_classes.update(data['external_bases'])
+    
+    def _propagate_open_classes(self) -> None:
+        """Subclasses of open classes may also be called back by external code"""
+        queue = deque(self.open_classes)
+        while queue:
+            for subclass in self.subclasses.get(queue.popleft(), ()):
+                if subclass not in self.open_classes:
+                    self.open_classes.add(subclass)
+                    queue.append(subclass)
+    
+    def _link_refs(self, data: dict) -> None:
+        """Turn the collected references of one module into edges"""
+        for owner, refs in data['refs'].items():
+            for scope, parts in refs:
+                targets, attrs = self._resolve_ref(scope, parts)
+                self.edges[owner].update(targets)
+                if attrs:
+                    self.attr_calls[owner].update(attrs)
+        
+        for owner, refs in data['self_refs'].items():
+            for class_qname, attr in refs:
+                targets = self._self_targets(class_qname, attr)
+                if targets:
+                    self.edges[owner].update(targets)
+                else:
+                    self.attr_calls[owner].add(attr)
+        
+        for owner, refs in data['instance_refs'].items():
+            for scope, func_parts, attrs in refs:
+                target = self.resolve_name(scope, func_parts)
+                member = None
+                if target is not None and self.nodes[target]['kind'] == 'class':
+                    member = self.lookup_member(target, attrs[0])
+                if member is not None:
+                    self.edges[owner].add(member)
+                    attrs = attrs[1:]
+                if attrs:
+                    self.attr_calls[owner].update(attrs)
+        
+        for owner, attrs in data['attr_refs'].items():
+            if attrs:
+                self.attr_calls[owner].update(attrs)
+        
+        for owner, qnames in data['registered'].items():
+            self.edges[owner].update(qnames)
+        
+        # Importing a module executes it (and its parent packages)
+        for owner, paths in data['imports'].items():
+            for path in paths:
+                parts = path.split('.')
+                for end in range(1, len(parts) + 1):
+                    target = self.resolve('.'.join(parts[:end]))
+                    if target is not None and self.nodes[target]['kind'] == 'module':
+                        self.edges[owner].add(target)
+    
+    def _self_targets(self, class_qname: str, attr: str) -> List[str]:
+        """Resolve self.attr: the inherited definition plus overrides in subclasses"""
+        targets = []
+        member = self.lookup_member(class_qname, attr)
+        if member is not None:
+            targets.append(member)
+        queue = deque(self.subclasses.get(class_qname, ()))
+        seen = set()
+        while queue:
+            subclass = queue.popleft()
+            if subclass in seen:
+                continue
+            seen.add(subclass)
+            override = f"{subclass}.{attr}"
+            if override in self.nodes:
+                targets.append(override)
+            queue.extend(self.subclasses.get(subclass, ()))
+        return targets
+    
+    def _lookup(self, scope: str, name: str) -> Optional[List[str]]:
+        """Find what a bare name refers to from inside a scope (LEGB, skipping class bodies)"""
+        current = scope
+        first = True
+        while current is not None:
+            info = self._scopes[current]
+            if info['kind'] != 'class' or first:
+                if name in info['locals']:
+                    return info['locals'][name]
+                if info['kind'] == 'module':
+                    for star in info['stars']:
+                        if self.resolve(f"{star}.{name}"):
+                            return [f"{star}.{name}"]
+            first = False
+            current = info['parent']
+        return None
+    
+    def resolve(self, dotted: str) -> Optional[str]:
+        """
+        Resolve an absolute dotted name to a node, following import aliases
+        
+        Args:
+            dotted: Absolute dotted name, e.g. package.module.Class.method
+            
+        Returns:
+            Qualified node name, or None if it is not defined in the project
+        """
+        for _ in range(16):
+            if dotted in self.nodes:
+                return dotted
+            if dotted in self._aliases:
+                dotted = self._aliases[dotted]
+                continue
+            parts = dotted.split('.')
+            for i in range(len(parts) - 1, 0, -1):
+                prefix = '.'.join(parts[:i])
+                rest = '.'.join(parts[i:])
+                if prefix in self._aliases:
+                    dotted = f"{self._aliases[prefix]}.{rest}"
+                    break
+                if prefix in self.nodes:
+                    if self.nodes[prefix]['kind'] == 'class' and i == len(parts) - 1:
+                        return self.lookup_member(prefix, parts[-1])
+                    return None
+            else:
+                return None
+        return None
+    
+    def lookup_member(self, class_qname: str, attr: str) -> Optional[str]:
+        """Find attr on a class or its project base classes (breadth-first MRO approximation)"""
+        queue = deque([class_qname])
+        seen = set()
+        while queue:
+            current = queue.popleft()
+            if current in seen:
+                continue
+            seen.add(current)
+            candidate = f"{current}.{attr}"
+            if candidate in self.nodes:
+                return candidate
+            queue.extend(self.class_bases.get(current, ()))
+        return None
+    
+    def _resolve_ref(self, scope: Optional[str], parts: Tuple[str, ...]) -> Tuple[List[str], List[str]]:
+        """
+        Resolve a dotted reference made from a scope
+        
+        Returns:
+            (nodes referenced by the prefixes of parts, attribute names
+            that could not be resolved statically)
+        """
+        heads = [parts[0]] if scope is None else self._lookup(scope, parts[0])
+        if not heads:
+            # Local variable, parameter or unknown global: only attribute names are known
+            return [], list(parts[1:])
+        
+        found = []
+        unresolved: List[str] = []
+        for head in heads:
+            last = 0
+            for end in range(1, len(parts) + 1):
+                target = self.resolve('.'.join((head,) + parts[1:end]))
+                if target is not None:
+                    found.append(target)
+                    last = end
+            if last:
+                unresolved.extend(parts[last:])
+        return found, unresolved
+    
+    def resolve_name(self, scope: str, parts: Tuple[str, ...]) -> Optional[str]:
+        """Resolve a full dotted reference made from a scope to a single node"""
+        heads = self._lookup(scope, parts[0])
+        for head in heads or ():
+            target = self.resolve('.'.join((head,) + parts[1:]))
+            if target is not None:
+                return target
+        return None
+    
+    def root_nodes(self, entry_points: Optional[List[str]] = None) -> Set[str]:
+        """
+        Collect BFS roots
+        
+        Roots are console/GUI scripts from the packaging config, modules that
+        run as __main__, test modules and their tests, plus entry_points given
+        as "package.module" or "package.module:function".
+        """
+        roots = set(self.roots)
+        for entry in self.entry_points + list(entry_points or []):
+            module, _, attr = entry.partition(':')
+            found = False
+            for dotted in (module, f"{module}.{attr}" if attr else None):
+                target = self.resolve(dotted) if dotted else None
+                if target is not None:
+                    roots.add(target)
+                    found = True
+            if not found:
+                print(f"Warning: Entry point not found in project: {entry}", file=sys.stderr)
+        return roots
+    
+    def reachable_from(self, roots: Iterable[str]) -> Set[str]:
+        """
+        Breadth-first search over the graph
+        
+        Attribute calls on unknown receivers bind lazily: a method becomes
+        reachable once both its class and a call of its name are reachable.
+        Dunder methods of reachable classes, and all methods of classes that
+        extend classes outside the project, are treated as implicitly called.
+        
+        Args:
+            roots: Starting nodes
+            
+        Returns:
+            Set of reachable node names
+        """
+        reachable: Set[str] = set()
+        live_classes: Set[str] = set()
+        pending_attrs: Set[str] = set()
+        queue = deque(root for root in roots if root in self.nodes)
+        
+        while queue:
+            node = queue.popleft()
+            if node in reachable:
+                continue
+            reachable.add(node)
+            queue.extend(self.edges.get(node, ()))
+            parent = self.parents.get(node)
+            if parent in self.nodes:
+                queue.append(parent)
+            
+            for attr in self.attr_calls.get(node, ()):
+                if attr not in pending_attrs:
+                    pending_attrs.add(attr)
+                    queue.extend(
+                        method for method in self.methods_by_name.get(attr, ())
+                        if self.parents[method] in live_classes
+                    )
+            
+            if self.nodes[node]['kind'] == 'class':
+                live_classes.add(node)
+                queue.extend(self.class_bases.get(node, ()))
+                is_open = node in self.open_classes
+                for member in self.class_members.get(node, ()):
+                    name = self.nodes[member]['name']
+                    if is_open or name in pending_attrs or (name.startswith('__') and name.endswith('__')):
+                        queue.append(member)
+        
+        return reachable
+    
+    def unreachable_functions(self, entry_points: Optional[List[str]] = None) -> List[FunctionInfo]:
+        """
+        Return functions and methods not reachable from any entry point
+        
+        Args:
+            entry_points: Extra entry points ("package.module[:function]")
+            
+        Returns:
+            List of unreachable functions, in file and definition order
+        """
+        reachable = self.reachable_from(self.root_nodes(entry_points))
+        unreachable = []
+        for qname, node in self.nodes.items():
+            if node['kind'] not in ('function', 'method') or qname in reachable:
+                continue
+            if FunctionVisitor._EXCLUDED_RE.match(node['name']):
+                continue
+            unreachable.append(FunctionInfo(
+                node['name'], node['file'], node['line'],
+                node['kind'] == 'method', node['class']
+            ))
+        return unreachable
+    
+    def find_nodes(self, name: str) -> List[str]:
+        """Find nodes by qualified name or by a trailing part of it (e.g. Class.method)"""
+        if name in self.nodes:
+            return [name]
+        suffix = '.' + name
+        return [qname for qname in self.nodes if qname.endswith(suffix)]
+    
+    def callers_of(self, qname: str) -> Dict[str, str]:
+        """
+        Answer "who calls X"
+        
+        Returns:
+            {caller: 'direct' | 'attribute'}; 'attribute' callers call a
+            method of that name on a receiver whose type is unknown
+        """
+        callers = {caller: 'direct' for caller, targets in self.edges.items() if qname in targets}
+        node = self.nodes.get(qname)
+        if node is not None and node['kind'] == 'method':
+            for caller, attrs in self.attr_calls.items():
+                if node['name'] in attrs:
+                    callers.setdefault(caller, 'attribute')
+        return dict(sorted(callers.items()))
+    
+    def to_dict(self, entry_points: Optional[List[str]] = None) -> dict:
+        """Export the graph (with reachability) as JSON-serializable data"""
+        roots = self.root_nodes(entry_points)
+        reachable = self.reachable_from(roots)
+        return {
+            'roots': sorted(roots),
+            'nodes': {
+                qname: dict(node, reachable=qname in reachable)
+                for qname, node in self.nodes.items()
+            },
+            'edges': {caller: sorted(targets) for caller, targets in self.edges.items() if targets},
+            'attribute_calls': {caller: sorted(attrs) for caller, attrs in self.attr_calls.items() if attrs},
+        }
+
+
+def detect_unreachable_functions(
+    project_path: Path,
+    exclude_dirs: Optional[List[str]] = None,
+    entry_points: Optional[List[str]] = None,
+    workers: int = 1,
+    use_gitignore: bool = True
+) -> List[FunctionInfo]:
+    """
+    Detect functions that cannot be reached from the project's entry points
+    
+    Args:
+        project_path: Project root directory
+        exclude_dirs: List of excluded directories
+        entry_points: Extra entry points ("package.module[:function]")
+        workers: Number of worker processes (1 = serial, 0 = CPU count)
+        use_gitignore: Whether to skip files ignored by .gitignore
+        
+    Returns:
+        List of unreachable functions
+    """
+    if exclude_dirs is None:
+        exclude_dirs = DEFAULT_EXCLUDE_DIRS
+    python_files = find_python_files(project_path, exclude_dirs, use_gitignore)
+    if not python_files:
+        print(f"No Python files found in {project_path}")
+        return []
+    
+    print(f"Building call graph for {len(python_files)} Python files...")
+    graph = CallGraph.build(project_path, python_files, workers)
+    return graph.unreachable_functions(entry_points)
+
+
+# =============================================================================
+# Report Generation
+# =============================================================================
+
+# Functions per HTML page, and the size up to which file sections start expanded
+HTML_PAGE_SIZE = 500
+HTML_EXPAND_LIMIT = 200
+
+_HTML_HEAD = """
 <!DOCTYPE html>
 <html>
 <head>
+    <meta charset="utf-8">
     <title>Unused Functions Report</title>
     <style>
         body { font-family: Arial, sans-serif; margin: 20px; }
         h1 { color: #333; }
         .summary { background: #f0f0f0; padding: 10px; border-radius: 5px; }
+        .pager { margin: 10px 0; }
+        .pager a { margin-right: 6px; }
+        .page { content-visibility: auto; }
         .file-section { margin: 20px 0; }
-        .file-name { background: #4CAF50; color: white; padding: 10px; }
+        .file-name { background: #4CAF50; color: white; padding: 10px; cursor: pointer; }
         .function-list { list-style: none; padding: 0; }
         .function-item { padding: 5px 10px; border-bottom: 1px solid #ddd; }
         .function-item:hover { background: #f9f9f9; }
@@ -289,39 +1443,163 @@ def format_html_report(unused_functions: List[FunctionInfo]) -> str:
 <body>
     <h1>🔍 Unused Functions Report</h1>
 """
+
+# Show one page at a time (selected by #page-N); without JavaScript every page stays visible
+_HTML_PAGER_SCRIPT = """
+    <script>
+    (function () {
+        var pages = document.querySelectorAll('.page');
+        function show() {
+            var id = location.hash.slice(1) || pages[0].id;
+            for (var i = 0; i < pages.length; i++) { pages[i].hidden = pages[i].id !== id; }
+        }
+        window.addEventListener('hashchange', show);
+        show();
+    })();
+    </script>
+"""
+
+
+def _group_by_file(unused_functions: List[FunctionInfo]) -> List[Tuple[str, List[FunctionInfo]]]:
+    """Group findings by file, sorted by path and line"""
+    by_file: Dict[str, List[FunctionInfo]] = defaultdict(list)
+    for func in unused_functions:
+        by_file[func.file_path].append(func)
+    return [
+        (file_path, sorted(by_file[file_path], key=lambda f: f.line_no))
+        for file_path in sorted(by_file.keys())
+    ]
+
+
+def write_text_report(unused_functions: List[FunctionInfo], stream: TextIO) -> None:
+    """Stream the text report to a file handle"""
+    if not unused_functions:
+        stream.write("✅ No unused functions found!")
+        return
+    
+    stream.write(f"🔍 Found {len(unused_functions)} unused function(s):\n\n")
+    stream.write("=" * 80)
+    
+    for file_path, functions in _group_by_file(unused_functions):
+        stream.write(f"\n\n📄 File: {file_path}\n")
+        stream.write("-" * 80)
+        for func in functions:
+            func_type = "method" if func.is_method else "function"
+            stream.write(f"\n  Line {func.line_no:4d}: {func_type:8s} {func.full_name}")
+    
+    stream.write("\n\n" + "=" * 80)
+    stream.write(f"\nTotal: {len(unused_functions)} unused functions")
+
+
+def write_json_report(unused_functions: List[FunctionInfo], stream: TextIO) -> None:
+    """Stream the JSON report to a file handle, one finding at a time"""
+    import json
     
+    stream.write(f'{{\n  "total_count": {len(unused_functions)},\n  "unused_functions": [')
+    for index, f in enumerate(unused_functions):
+        item = json.dumps({
+            "name": f.full_name,
+            "file": f.file_path,
+            "line": f.line_no,
+            "type": "method" if f.is_method else "function",
+            "class": f.class_name
+        }, indent=2)
+        stream.write(",\n    " if index else "\n    ")
+        stream.write(item.replace("\n", "\n    "))
+    stream.write("\n  ]\n}" if unused_functions else "]\n}")
+
+
+def write_html_report(unused_functions: List[FunctionInfo], stream: TextIO,
+                      page_size: int = HTML_PAGE_SIZE) -> None:
+    """
+    Stream the HTML report to a file handle
+    
+    Files are collapsible <details> sections (collapsed for large reports)
+    and are split into pages of about page_size functions, so browsers only
+    lay out one page at a time.
+    
+    Args:
+        unused_functions: Findings to report
+        stream: Writable text file handle
+        page_size: Approximate number of functions per page
+    """
+    from html import escape
+    
+    stream.write(_HTML_HEAD)
     if not unused_functions:
-        html += "    <div class='summary'>✅ No unused functions found!</div>"
-    else:
-        html += f"    <div class='summary'>Found {len(unused_functions)} unused function(s)</div>"
-        
-        # Group by file
-        by_file: Dict[str, List[FunctionInfo]] = defaultdict(list)
-        for func in unused_functions:
-            by_file[func.file_path].append(func)
-        
-        for file_path in sorted(by_file.keys()):
-            html += f"""
-    <div class='file-section'>
-        <div class='file-name'>📄 {file_path}</div>
-        <ul class='function-list'>
-"""
-            for func in sorted(by_file[file_path], key=lambda f: f.line_no):
+        stream.write("    <div class='summary'>✅ No unused functions found!</div>")
+        stream.write("\n</body>\n</html>\n")
+        return
+    
+    groups = _group_by_file(unused_functions)
+    stream.write(
+        f"    <div class='summary'>Found {len(unused_functions)} unused function(s) "
+        f"in {len(groups)} file(s)</div>\n"
+    )
+    
+    # Pages break between files once page_size functions are reached
+    pages: List[List[Tuple[str, List[FunctionInfo]]]] = [[]]
+    page_count = 0
+    for group in groups:
+        if page_count >= page_size:
+            pages.append([])
+            page_count = 0
+        pages[-1].append(group)
+        page_count += len(group[1])
+    
+    if len(pages) > 1:
+        links = " ".join(f"<a href='#page-{number}'>{number}</a>" for number in range(1, len(pages) + 1))
+        stream.write(f"    <nav class='pager'>Pages: {links}</nav>\n")
+    
+    expanded = " open" if len(unused_functions) <= HTML_EXPAND_LIMIT else ""
+    for number, page in enumerate(pages, 1):
+        stream.write(f"    <section class='page' id='page-{number}'>\n")
+        for file_path, functions in page:
+            stream.write(
+                f"    <details class='file-section'{expanded}>\n"
+                f"        <summary class='file-name'>📄 {escape(file_path)} ({len(functions)})</summary>\n"
+                f"        <ul class='function-list'>\n"
+            )
+            for func in functions:
                 func_type = "method" if func.is_method else "function"
-                html += f"""
-            <li class='function-item'>
-                <span class='line-no'>Line {func.line_no}</span> - 
-                <span class='func-type'>{func_type}</span> 
-                <strong>{func.full_name}</strong>
-            </li>
-"""
-            html += "        </ul>\n    </div>"
+                stream.write(
+                    f"            <li class='function-item'><span class='line-no'>Line {func.line_no}</span> - "
+                    f"<span class='func-type'>{func_type}</span> <strong>{escape(func.full_name)}</strong></li>\n"
+                )
+            stream.write("        </ul>\n    </details>\n")
+        stream.write("    </section>\n")
     
-    html += """
-</body>
-</html>
-"""
-    return html
+    if len(pages) > 1:
+        stream.write(_HTML_PAGER_SCRIPT)
+    stream.write("</body>\n</html>\n")
+
+
+REPORT_WRITERS = {
+    'text': write_text_report,
+    'json': write_json_report,
+    'html': write_html_report,
+}
+
+
+def format_text_report(unused_functions: List[FunctionInfo]) -> str:
+    """Generate text report"""
+    buffer = io.StringIO()
+    write_text_report(unused_functions, buffer)
+    return buffer.getvalue()
+
+
+def format_json_report(unused_functions: List[FunctionInfo]) -> str:
+    """Generate JSON report"""
+    buffer = io.StringIO()
+    write_json_report(unused_functions, buffer)
+    return buffer.getvalue()
+
+
+def format_html_report(unused_functions: List[FunctionInfo]) -> str:
+    """Generate HTML report"""
+    buffer = io.StringIO()
+    write_html_report(unused_functions, buffer)
+    return buffer.getvalue()
 
 
 # =============================================================================
@@ -358,23 +1636,53 @@ def main_function(args: argparse.Namespace) -> int:
             if exclude_dirs:
                 print(f"Excluding directories: {', '.join(exclude_dirs)}")
         
-        unused_functions = detect_unused_functions(project_path, exclude_dirs)
-        
-        # Generate report
-        if args.format == 'json':
-            report = format_json_report(unused_functions)
-        elif args.format == 'html':
-            report = format_html_report(unused_functions)
+        if args.reachability or args.who_calls or args.export_graph:
+            if exclude_dirs is None:
+                exclude_dirs = DEFAULT_EXCLUDE_DIRS
+            python_files = find_python_files(project_path, exclude_dirs, args.gitignore)
+            print(f"Building call graph for {len(python_files)} Python files...")
+            graph = CallGraph.build(project_path, python_files, args.jobs)
+            
+            if args.export_graph:
+                import json
+                graph_path = Path(args.export_graph)
+                graph_path.write_text(json.dumps(graph.to_dict(args.entry_point), indent=2), encoding='utf-8')
+                print(f"Call graph saved to: {graph_path}")
+            
+            if args.who_calls:
+                matches = graph.find_nodes(args.who_calls)
+                if not matches:
+                    print(f"Error: No definition named {args.who_calls}", file=sys.stderr)
+                    return 1
+                for qname in matches:
+                    callers = graph.callers_of(qname)
+                    print(f"\n{qname} is called by {len(callers)} caller(s):")
+                    for caller, kind in callers.items():
+                        suffix = " (by attribute name)" if kind == 'attribute' else ""
+                        print(f"  {caller}{suffix}")
+                return None
+            
+            if not args.reachability:
+                return None
+            unused_functions = graph.unreachable_functions(args.entry_point)
         else:
-            report = format_text_report(unused_functions)
+            index_path = None
+            if args.index or args.index_path:
+                index_path = args.index_path or default_index_path(project_path)
+            unused_functions = detect_unused_functions(
+                project_path, exclude_dirs, args.jobs, index_path, args.gitignore
+            )
         
-        # Output report
+        # Stream the report to the output file or the terminal
+        write_report = REPORT_WRITERS[args.format]
         if args.output:
             output_path = Path(args.output)
-            output_path.write_text(report, encoding='utf-8')
+            with open(output_path, 'w', encoding='utf-8') as f:
+                write_report(unused_functions, f)
             print(f"Report saved to: {output_path}")
         else:
-            print(report)
+            write_report(unused_functions, sys.stdout)
+            sys.stdout.write("\n")
         
         # Return None to avoid CLI printing exit code
         return None
@@ -413,7 +1721,14 @@ def register_parser(subparsers) -> None:
     parser.add_argument(
         '-e', '--exclude',
         type=str,
-        help='Excluded directories (comma separated, default: venv,__pycache__,.git)'
+        help='Excluded directory/file glob patterns (comma separated, default: venv,.venv,__pycache__,.git,...)'
+    )
+    
+    parser.add_argument(
+        '--no-gitignore',
+        dest='gitignore',
+        action='store_false',
+        help='Also analyze files ignored by .gitignore'
     )
     
     parser.add_argument(
@@ -429,6 +1744,63 @@ def register_parser(subparsers) -> None:
         help='Output file path (default: print to terminal)'
     )
     
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes (0 = CPU count, default: 1)'
+    )
+    
+    parser.add_argument(
+        '--index',
+        dest='index',
+        action='store_true',
+        help='Keep a persistent symbol index so only changed files are re-analyzed'
+    )
+    
+    parser.add_argument(
+        '--no-index',
+        dest='index',
+        action='store_false',
+        help='Re-analyze every file without a symbol index (default)'
+    )
+    
+    parser.add_argument(
+        '--index-path',
+        type=str,
+        help=f'Symbol index location, implies --index (default: $XDG_CACHE_HOME/{INDEX_CACHE_DIR}/)'
+    )
+    
+    parser.add_argument(
+        '--reachability',
+        action='store_true',
+        help='Report functions unreachable from entry points (qualified call graph) '
+             'instead of functions whose name is never called'
+    )
+    
+    parser.add_argument(
+        '--entry-point',
+        action='append',
+        default=[],
+        metavar='MODULE[:FUNC]',
+        help='Additional call graph entry point (can be repeated); console scripts, '
+             '__main__ modules and tests are always used'
+    )
+    
+    parser.add_argument(
+        '--export-graph',
+        type=str,
+        metavar='FILE',
+        help='Write the call graph as JSON to FILE'
+    )
+    
+    parser.add_argument(
+        '--who-calls',
+        type=str,
+        metavar='NAME',
+        help='Print the callers of a function (qualified name or suffix, e.g. Class.method)'
+    )
+    
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -450,6 +1822,8 @@ Examples:
   %(prog)s /path/to/project         # Analyze specific project
   %(prog)s -f json -o report.json   # JSON output to file
   %(prog)s -e venv,tests            # Exclude specific directories
+  %(prog)s --reachability           # Dead code from entry points
+  %(prog)s --who-calls lint_file    # Query the call graph
         """
     )
     
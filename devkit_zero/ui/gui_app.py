@@ -104,6 +104,9 @@ class PlaceholderEntry(ttk.Entry):
 class DevKitZeroGUI:
     """DevKit-Zero GUI Main Class"""
 
+    # Unused function reports longer than this are saved to a file instead of shown
+    UNUSED_FUNC_DISPLAY_LIMIT = 2000
+
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("DevKit-Zero - Zero Dependency Developer Toolkit")
@@ -684,6 +687,20 @@ Total Changes: {stats['total_changes']}"""
             
             # Generate report
             output_format = self.unused_func_format_var.get()
+            if len(unused_functions) > self.UNUSED_FUNC_DISPLAY_LIMIT:
+                # Large reports are streamed to a file instead of being rendered in the text widget
+                import tempfile
+                write_report = unused_func_detector.REPORT_WRITERS[output_format]
+                suffix = {'json': '.json', 'html': '.html'}.get(output_format, '.txt')
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix=suffix,
+                                                 prefix='unused_functions_', delete=False) as f:
+                    write_report(unused_functions, f)
+                self.display_result(
+                    f"Found {len(unused_functions)} unused function(s).\n"
+                    f"The report is too large to display and was saved to:\n{f.name}\n"
+                )
+                return
+            
             if output_format == 'json':
                 result = unused_func_detector.format_json_report(unused_functions)
             elif output_format == 'html':
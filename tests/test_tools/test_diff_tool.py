@@ -0,0 +1,372 @@
+"""
+测试文本差异对比工具
+"""
+
+import argparse
+import difflib
+import os
+import random
+import subprocess
+import sys
+import time
+
+import pytest
+from devkit_zero.tools import diff_tool
+
+
+def parse_args(*argv):
+    """Parse diff subcommand arguments with the tool's own parser"""
+    parser = argparse.ArgumentParser()
+    diff_tool.register_parser(parser.add_subparsers())
+    return parser.parse_args(["diff", *argv])
+
+
+class TestDiffTool:
+
+    @pytest.mark.parametrize("algorithm", diff_tool.ALGORITHMS)
+    def test_opcodes_rebuild_second_text(self, algorithm):
+        """Test every engine yields opcodes that turn lines1 into lines2"""
+        rng = random.Random(7)
+        for _ in range(200):
+            lines1 = [rng.choice("abcdef") for _ in range(rng.randint(0, 25))]
+            lines2 = list(lines1)
+            for _ in range(rng.randint(0, 6)):
+                position = rng.randint(0, len(lines2))
+                if rng.random() < 0.5:
+                    lines2.insert(position, rng.choice("abcxyz"))
+                elif lines2:
+                    del lines2[min(position, len(lines2) - 1)]
+
+            rebuilt, i, j = [], 0, 0
+            for tag, i1, i2, j1, j2 in diff_tool.diff_opcodes(lines1, lines2, algorithm):
+                assert (i1, j1) == (i, j)
+                if tag == "equal":
+                    assert lines1[i1:i2] == lines2[j1:j2]
+                rebuilt += lines2[j1:j2]
+                i, j = i2, j2
+            assert (i, j) == (len(lines1), len(lines2))
+            assert rebuilt == lines2
+
+    @pytest.mark.parametrize("algorithm", ["histogram", "myers"])
+    def test_unrelated_inputs_stay_fast(self, algorithm):
+        """Test the Myers cost limit keeps dissimilar inputs with repeated lines near linear"""
+        rng = random.Random(0)
+        lines1 = ["" if i % 3 == 0 else f"alpha {rng.random()}" for i in range(20000)]
+        lines2 = ["" if i % 4 == 0 else f"beta {rng.random()}" for i in range(20000)]
+
+        start = time.perf_counter()
+        opcodes = diff_tool.diff_opcodes(lines1, lines2, algorithm)
+        assert time.perf_counter() - start < 5
+        assert opcodes[0][1::2] == (0, 0) and opcodes[-1][2::2] == (len(lines1), len(lines2))
+
+    def test_unified_output_matches_difflib_format(self):
+        """Test unified diff hunks use difflib's layout with one header line each"""
+        text1 = "".join(f"line {i}\n" for i in range(20))
+        text2 = text1.replace("line 5\n", "line five\n").replace("line 15\n", "")
+
+        expected = "".join(
+            line if line.endswith("\n") else line + "\n"
+            for line in difflib.unified_diff(
+                text1.splitlines(keepends=True), text2.splitlines(keepends=True),
+                "text1", "text2", lineterm="",
+            )
+        )
+        for algorithm in diff_tool.ALGORITHMS:
+            assert diff_tool.compare_text(text1, text2, algorithm=algorithm) == expected
+        assert diff_tool.compare_text("a\nb", "a\nc").endswith("-b\n+c\n")
+        assert diff_tool.compare_text("same", "same") == ""
+
+        stats = diff_tool.analyze_changes(text1, text2)
+        assert (stats["modifications"], stats["deletions"]) == (1, 1)
+        assert stats["similarity"] == pytest.approx(
+            difflib.SequenceMatcher(None, text1.splitlines(), text2.splitlines()).ratio()
+        )
+
+    def test_file_diff_reads_once_and_reports_line_similarity(self, tmp_path, monkeypatch, capsys):
+        """Test the CLI path reads each file once and derives similarity from the line diff"""
+        old = tmp_path / "old.txt"
+        new = tmp_path / "new.txt"
+        old.write_text("".join(f"行 {i}\n" for i in range(10)), encoding="utf-8")
+        new.write_text("".join(f"行 {i}\n" for i in range(1, 11)), encoding="utf-8")
+        (tmp_path / "empty.txt").write_bytes(b"")
+
+        # Force the memory-mapped path for every non-empty file
+        monkeypatch.setattr(diff_tool, "MMAP_THRESHOLD", 0)
+        assert diff_tool.read_text(str(old)) == old.read_text(encoding="utf-8")
+        assert diff_tool.read_text(str(tmp_path / "empty.txt")) == ""
+
+        reads = []
+        original = diff_tool.read_text
+        monkeypatch.setattr(diff_tool, "read_text", lambda path: reads.append(path) or original(path))
+        monkeypatch.setattr(diff_tool, "get_similarity", None)
+
+        args = parse_args("--file1", str(old), "--file2", str(new))
+        assert diff_tool.main_function(args) == 0
+        assert reads == [str(old), str(new)]
+
+        output = capsys.readouterr().out
+        assert f"--- {old}\n+++ {new}\n" in output
+        assert "-行 0\n" in output and "+行 10\n" in output
+        assert "Similarity: 90.00%" in output
+
+    def test_check_similarity_uses_cheapest_deciding_bound(self):
+        """Test threshold checks exit on bounds and only match exactly when undecided"""
+        short_check = diff_tool.check_similarity("abc", "abc" * 10, 0.5)
+        assert short_check["method"] == "real_quick_ratio"
+        assert short_check["similar"] is False and short_check["ratio"] is None
+
+        disjoint = diff_tool.check_similarity("aaaa", "bbbb", 0.1)
+        assert (disjoint["method"], disjoint["upper"]) == ("quick_ratio", 0.0)
+
+        text1, text2 = "the quick brown fox", "the quick brown cat"
+        exact = diff_tool.check_similarity(text1, text2, 0.5)
+        assert exact["method"] == "exact" and exact["similar"] is True
+        assert exact["ratio"] == pytest.approx(diff_tool.get_similarity(text1, text2))
+
+    def test_check_similarity_approximates_large_inputs(self):
+        """Test large inputs get a MinHash estimate whose interval covers the true similarity"""
+        rng = random.Random(11)
+        words = [rng.choice(["alpha", "beta", "gamma", "delta", "omega"]) + str(rng.randrange(500))
+                 for _ in range(4000)]
+        text1 = " ".join(words)
+        text2 = " ".join(words[1000:] + words[:1000][::-1])
+
+        trigrams1 = set(zip(words, words[1:], words[2:]))
+        moved = words[1000:] + words[:1000][::-1]
+        trigrams2 = set(zip(moved, moved[1:], moved[2:]))
+        jaccard = len(trigrams1 & trigrams2) / len(trigrams1 | trigrams2)
+
+        result = diff_tool.check_similarity(text1, text2, 0.5, approximate_above=1000)
+        assert result["method"] == "minhash" and result["exact"] is False
+        # The estimate is of shingle similarity and is never reported as the ratio
+        assert result["ratio"] is None and result["lower"] == 0.0
+        assert result["shingle_lower"] <= 2 * jaccard / (1 + jaccard) <= result["shingle_upper"]
+        assert result["similar"] is True
+
+        # Shingle hashes do not depend on the per-process hash() seed
+        script = ("import sys; from devkit_zero.tools import diff_tool; "
+                  "print(diff_tool.check_similarity(sys.argv[1], sys.argv[2], 0.5, 1000)['shingle_similarity'])")
+        outputs = {
+            subprocess.run([sys.executable, "-c", script, text1, text2], capture_output=True, text=True,
+                           env={**os.environ, "PYTHONHASHSEED": seed}, check=True,
+                           cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))).stdout
+            for seed in ("1", "2")
+        }
+        assert outputs == {f"{result['shingle_similarity']}\n"}
+
+    def test_compare_directories_short_circuits_on_stat(self, tmp_path):
+        """Test tree diff trusts matching size and mtime and hashes only the other candidates"""
+        old, new = tmp_path / "old", tmp_path / "new"
+        files = {
+            "same.txt": ("keep\n", "keep\n"),
+            "sub/grown.txt": ("a\n", "a\nb\n"),
+            "sub/edited.txt": ("abc\n", "xyz\n"),
+            "sub/stale.txt": ("abc\n", "xyz\n"),
+            "gone.txt": ("bye\n", None),
+            "deep/new.txt": (None, "hi\n"),
+        }
+        for name, contents in files.items():
+            for root, content in zip((old, new), contents):
+                if content is not None:
+                    (root / name).parent.mkdir(parents=True, exist_ok=True)
+                    (root / name).write_text(content)
+        for name in files:
+            if (old / name).exists() and (new / name).exists():
+                os.utime(new / name, ns=(0, (old / name).stat().st_mtime_ns))
+        # Same size, different content, different mtime: must be hashed
+        os.utime(new / "sub" / "edited.txt", ns=(0, 10 ** 9))
+
+        result = diff_tool.compare_directories(str(old), str(new), jobs=2)
+        assert result["added"] == [os.path.join("deep", "new.txt")]
+        assert result["removed"] == ["gone.txt"]
+        # stale.txt matches on size and mtime, so only --checksum notices it
+        assert result["modified"] == [os.path.join("sub", "edited.txt"), os.path.join("sub", "grown.txt")]
+        assert result["unchanged"] == 2
+
+        result = diff_tool.compare_directories(str(old), str(new), checksum=True)
+        assert os.path.join("sub", "stale.txt") in result["modified"]
+        assert result["unchanged"] == 1
+
+    def test_directory_cli_prints_summary_and_diffs(self, tmp_path, capsys):
+        """Test --dir1/--dir2 prints the file summary and per-file unified diffs"""
+        old, new = tmp_path / "old", tmp_path / "new"
+        old.mkdir()
+        new.mkdir()
+        (old / "app.cfg").write_text("port=1\nhost=a\n")
+        (new / "app.cfg").write_text("port=22\nhost=a\n")
+        (old / "blob.bin").write_bytes(b"\xff\x00")
+        (new / "blob.bin").write_bytes(b"\xff\x00\x01")
+
+        args = parse_args("--dir1", str(old), "--dir2", str(new), "--show-diff")
+        assert diff_tool.main_function(args) == 0
+        output = capsys.readouterr().out
+        assert "Modified (2):" in output
+        assert "-port=1\n+port=22\n" in output
+        assert "Binary files" in output
+        assert "Summary: 0 added, 0 removed, 2 modified, 0 unchanged" in output
+
+    def test_unreadable_file_does_not_abort_tree_diff(self, tmp_path, monkeypatch, capsys):
+        """Test a file that cannot be hashed is reported on its own and the rest are still compared"""
+        old, new = tmp_path / "old", tmp_path / "new"
+        for root in (old, new):
+            root.mkdir()
+            for name in ("locked.txt", "ok.txt", "edited.txt"):
+                (root / name).write_text("same\n")
+        (new / "edited.txt").write_text("diff\n")
+        original = diff_tool.file_digest
+
+        def file_digest(path, *args):
+            if os.path.basename(path) == "locked.txt":
+                raise PermissionError(13, "Permission denied", path)
+            return original(path, *args)
+
+        monkeypatch.setattr(diff_tool, "file_digest", file_digest)
+        result = diff_tool.compare_directories(str(old), str(new), checksum=True)
+        assert result["modified"] == ["edited.txt"]
+        assert list(result["errors"]) == ["locked.txt"]
+        assert "Permission denied" in result["errors"]["locked.txt"]
+        assert result["unchanged"] == 1
+
+        args = parse_args("--dir1", str(old), "--dir2", str(new), "--checksum")
+        assert diff_tool.main_function(args) == 1
+        output = capsys.readouterr().out
+        assert "Unreadable (1):\n  ! locked.txt: " in output
+        assert "Summary: 0 added, 0 removed, 1 modified, 1 unchanged, 1 unreadable" in output
+
+    def test_unlistable_directory_is_an_error_not_a_removal(self, tmp_path, monkeypatch, capsys):
+        """Test files below a directory that cannot be listed are reported as errors, not removed"""
+        old, new = tmp_path / "old", tmp_path / "new"
+        for root in (old, new):
+            (root / "sub").mkdir(parents=True)
+            (root / "sub" / "f.txt").write_text("x\n")
+            (root / "top.txt").write_text("y\n")
+        blocked = str(new / "sub")
+        scandir = os.scandir
+
+        def guarded_scandir(path):
+            if os.path.normpath(path) == blocked:
+                raise PermissionError(13, "Permission denied", path)
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", guarded_scandir)
+        result = diff_tool.compare_directories(str(old), str(new), checksum=True)
+        assert result["removed"] == [] and result["added"] == []
+        assert list(result["errors"]) == ["sub"]
+        assert result["unchanged"] == 1
+
+        args = parse_args("--dir1", str(old), "--dir2", str(new))
+        assert diff_tool.main_function(args) == 1
+        assert "  ! sub: " in capsys.readouterr().out
+
+    def test_block_diff_resyncs_after_insertion(self, tmp_path):
+        """Test the rolling checksum finds shifted blocks and reports exact byte ranges"""
+        rng = random.Random(5)
+        data = bytes(rng.getrandbits(8) for _ in range(20000))
+        changed = data[:7000] + b"inserted bytes" + data[7000:15000] + data[15100:]
+        old, new = tmp_path / "old.bin", tmp_path / "new.bin"
+        old.write_bytes(data)
+        new.write_bytes(changed)
+
+        ranges = list(diff_tool.block_diff(str(old), str(new), block_size=512))
+        position = 0
+        for tag, offset2, length, offset1 in ranges:
+            assert offset2 == position
+            if tag == "match":
+                assert changed[offset2:offset2 + length] == data[offset1:offset1 + length]
+            position += length
+        assert position == len(changed)
+        differing = sum(length for tag, _, length, _ in ranges if tag == "differ")
+        # Only the blocks around the two edits are resent
+        assert differing < 4 * 512
+
+    def test_block_cli_does_not_call_reordered_blocks_identical(self, tmp_path, capsys):
+        """Test --blocks only reports identical files when every block stays in place"""
+        rng = random.Random(3)
+        a, b = (rng.getrandbits(8 * 4096).to_bytes(4096, "big") for _ in range(2))
+        first, swapped, copy = tmp_path / "ab.bin", tmp_path / "ba.bin", tmp_path / "copy.bin"
+        first.write_bytes(a + b)
+        swapped.write_bytes(b + a)
+        copy.write_bytes(a + b)
+
+        args = parse_args("--file1", str(first), "--file2", str(swapped), "--blocks", "--block-size", "512")
+        assert diff_tool.main_function(args) == 0
+        output = capsys.readouterr().out
+        assert "identical" not in output
+        assert "Matched 8192 of 8192 bytes" in output
+
+        args = parse_args("--file1", str(first), "--file2", str(copy), "--blocks")
+        assert diff_tool.main_function(args) == 0
+        assert "✓ File contents are identical" in capsys.readouterr().out
+
+    def test_delta_round_trip_and_checksum(self, tmp_path):
+        """Test apply_delta rebuilds the new file and rejects a corrupted delta"""
+        old, new = tmp_path / "dump_v1.sql", tmp_path / "dump_v2.sql"
+        old.write_text("".join(f"INSERT INTO t VALUES ({i});\n" for i in range(3000)))
+        new.write_text("".join(f"INSERT INTO t VALUES ({i});\n" for i in range(3000) if i % 700)
+                       + "-- end\n")
+        delta, rebuilt = tmp_path / "v1_to_v2.dkd", tmp_path / "rebuilt.sql"
+
+        stats = diff_tool.write_delta(str(old), str(new), str(delta))
+        assert stats["copied"] + stats["literal"] == new.stat().st_size
+        assert stats["delta_size"] < new.stat().st_size // 4
+        assert diff_tool.apply_delta(str(old), str(delta), str(rebuilt)) == new.stat().st_size
+        assert rebuilt.read_bytes() == new.read_bytes()
+
+        corrupted = bytearray(delta.read_bytes())
+        corrupted[-1] ^= 0xff
+        delta.write_bytes(bytes(corrupted))
+        with pytest.raises(ValueError):
+            diff_tool.apply_delta(str(old), str(delta), str(rebuilt))
+        # A failed apply leaves the existing output alone and no temporary file behind
+        assert rebuilt.read_bytes() == new.read_bytes()
+        with pytest.raises(ValueError):
+            diff_tool.apply_delta(str(old), str(delta), str(tmp_path / "partial.sql"))
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "dump_v1.sql", "dump_v2.sql", "rebuilt.sql", "v1_to_v2.dkd"]
+
+    def test_apply_delta_over_its_base(self, tmp_path):
+        """Test --output may name the base file: it is replaced only after a successful rebuild"""
+        old, new, delta = tmp_path / "base.bin", tmp_path / "new.bin", tmp_path / "d.dkd"
+        data = random.Random(7).getrandbits(8 * 32000).to_bytes(32000, "big")
+        old.write_bytes(data)
+        new.write_bytes(data[:16000] + b"patched" + data[16000:])
+        diff_tool.write_delta(str(old), str(new), str(delta))
+
+        assert diff_tool.apply_delta(str(old), str(delta), str(old)) == new.stat().st_size
+        assert old.read_bytes() == new.read_bytes()
+        # The base has changed, so applying again fails and keeps it intact
+        with pytest.raises(ValueError):
+            diff_tool.apply_delta(str(old), str(delta), str(old))
+        assert old.read_bytes() == new.read_bytes()
+
+    def test_json_diff_reports_pointer_paths(self):
+        """Test JSON diff ignores key order and reports additions, removals, changes and moves"""
+        old = {"name": "api", "limits": {"rps": 10, "burst": 20}, "flags": {"debug": True},
+               "routes": [{"path": "/a", "methods": ["GET"]}, "b", "c", "d"], "a/b": 1, "gone": [1]}
+        new = {"a/b": 1.0, "flags": {"debug": 1}, "limits": {"burst": 20, "rps": 10},
+               "routes": ["d", {"methods": ["GET"], "path": "/a"}, "b", "c", "e"], "name": "api2"}
+
+        changes = diff_tool.json_diff(old, new)
+        assert {"op": "changed", "path": "/flags/debug", "old": True, "new": 1} in changes
+        assert {"op": "removed", "path": "/gone", "value": [1]} in changes
+        assert {"op": "changed", "path": "/name", "old": "api", "new": "api2"} in changes
+        assert {"op": "moved", "from": "/routes/3", "path": "/routes/0"} in changes
+        assert {"op": "added", "path": "/routes/4", "value": "e"} in changes
+        assert len(changes) == 5
+        assert diff_tool.json_diff(old, {**old, "gone": [1], "limits": {"burst": 20, "rps": 10}}) == []
+
+        escaped = diff_tool.json_diff({"a/b": {"~x": 1}}, {"a/b": {"~x": 2}})
+        assert escaped == [{"op": "changed", "path": "/a~1b/~0x", "old": 1, "new": 2}]
+
+    def test_json_cli_prints_changes(self, capsys):
+        """Test --json prints one line per change and a summary"""
+        args = parse_args("--json", "--text1", '{"v": 1, "list": [1, 2]}', "--text2", '{"list": [1, 2, 3], "v": 2}')
+        assert diff_tool.main_function(args) == 0
+        output = capsys.readouterr().out
+        assert "+ /list/2: 3\n" in output
+        assert "~ /v: 1 -> 2\n" in output
+        assert "Summary: 1 added, 0 removed, 1 changed, 0 moved" in output
+
+        args = parse_args("--json", "--text1", '{"a": 1, "b": 2}', "--text2", '{"b": 2, "a": 1}')
+        assert diff_tool.main_function(args) == 0
+        assert "equivalent" in capsys.readouterr().out
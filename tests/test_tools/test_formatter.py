@@ -4,28 +4,377 @@ formatter工具的测试
 为formatter模块编写测试用例。
 """
 
+import ast
+import io
+import os
+import shutil
+import sys
+import tempfile
 import unittest
-# from devkit_zero.tools.formatter import main_function
-
-# TODO: 实现测试用例
-#
-# class TestFormatter(unittest.TestCase):
-#     """formatter工具测试类"""
-#     
-#     def test_format_python_code(self):
-#         """测试Python代码格式化"""
-#         # code = "def hello():print('hi')"
-#         # result = main_function(code, 'python')
-#         # self.assertIn('formatted', result)
-#         pass
-#     
-#     def test_format_javascript_code(self):
-#         """测试JavaScript代码格式化"""
-#         pass
-#     
-#     def test_invalid_input(self):
-#         """测试无效输入"""
-#         pass
-#
-# if __name__ == '__main__':
-#     unittest.main()
+
+from devkit_zero.tools.formatter import (
+    FormatCache, FormatServer, collect_source_files, format_code, format_code_range,
+    format_files, format_python_code,
+)
+
+
+class TestFormatter(unittest.TestCase):
+    """formatter工具测试类"""
+
+    def test_format_python_code(self):
+        """测试Python代码格式化"""
+        code = (
+            "import os,sys\n"
+            "def f(a,b=1,*args,c:int=2,**kw)->int:\n"
+            "  x=a+b*-c  # inline\n"
+            "  if x==1 and not kw :\n"
+            "      return lambda q,r=2:q+r\n"
+            "  return [1,2,3][1:-1]\n"
+        )
+        formatted, error = format_python_code(code)
+        self.assertIsNone(error)
+        self.assertEqual(formatted, (
+            "import os, sys\n"
+            "def f(a, b=1, *args, c: int = 2, **kw) -> int:\n"
+            "    x = a + b * -c  # inline\n"
+            "    if x == 1 and not kw:\n"
+            "        return lambda q, r=2: q + r\n"
+            "    return [1, 2, 3][1:-1]\n"
+        ))
+
+    def test_strings_and_comments_untouched(self):
+        """测试字符串、f-string和注释内容保持不变"""
+        code = (
+            "s = 'a=b,c+d'  # keep x=y,z\n"
+            "t = f'{a+b}={x!r:>10}'\n"
+            "u = '''\n"
+            "   x=1\n"
+            "'''\n"
+            "url = 'http://a/b-c'\n"
+        )
+        formatted, error = format_python_code(code)
+        self.assertIsNone(error)
+        self.assertEqual(formatted, code)
+
+    def test_brackets_and_blank_lines(self):
+        """测试括号续行缩进和空行合并"""
+        code = (
+            "result = call(\n"
+            "      first,\n"
+            "  second,\n"
+            ")\n"
+            "\n\n\n\n"
+            "class A(B,metaclass=M):\n"
+            "\tx: int=5\n"
+        )
+        formatted, _ = format_python_code(code)
+        self.assertEqual(formatted, (
+            "result = call(\n"
+            "    first,\n"
+            "    second,\n"
+            ")\n"
+            "\n\n"
+            "class A(B, metaclass=M):\n"
+            "    x: int = 5\n"
+        ))
+
+    def test_lambda_colon_keeps_space(self):
+        """测试lambda冒号后保留空格（包括下标和列表内）"""
+        code = "f = lambda:-1\ng = [lambda:-1]\nd[lambda x:-x]\nh = a[1:-1]\n"
+        formatted, error = format_python_code(code)
+        self.assertIsNone(error)
+        self.assertEqual(formatted, "f = lambda: -1\ng = [lambda: -1]\nd[lambda x: -x]\nh = a[1:-1]\n")
+
+    @unittest.skipUnless(sys.version_info >= (3, 10), "需要 Python 3.10+ 的 match 语句")
+    def test_match_case_soft_keywords(self):
+        """测试match/case作为语句开头时保留关键字空格，作为名称时不受影响"""
+        code = (
+            "match (a, b):\n"
+            "    case [x]:\n"
+            "        pass\n"
+            "    case -1: pass\n"
+            "    case (1|2):\n"
+            "        match(x)\n"
+            "match(a, b)\n"
+            "match[a]: int=1\n"
+            "case[1]\n"
+        )
+        formatted, error = format_python_code(code)
+        self.assertIsNone(error)
+        self.assertEqual(formatted, (
+            "match (a, b):\n"
+            "    case [x]:\n"
+            "        pass\n"
+            "    case -1: pass\n"
+            "    case (1 | 2):\n"
+            "        match(x)\n"
+            "match(a, b)\n"
+            "match[a]: int = 1\n"
+            "case[1]\n"
+        ))
+
+    def test_idempotent_and_preserves_ast(self):
+        """测试格式化幂等且不改变语义"""
+        import inspect
+        import json.decoder
+        code = inspect.getsource(json.decoder)
+        formatted, error = format_python_code(code)
+        self.assertIsNone(error)
+        self.assertEqual(ast.dump(ast.parse(formatted)), ast.dump(ast.parse(code)))
+        self.assertEqual(format_python_code(formatted)[0], formatted)
+
+    def test_format_javascript_code(self):
+        """测试JavaScript词法格式化：字符串、模板、正则和URL保持不变"""
+        from devkit_zero.tools.formatter import format_javascript_code
+        code = (
+            "const url='http://a/b-c',re=/a\\/b[/]+/gi;\n"
+            "function f(a,b=1){\n"
+            "if(a>0&&!b){\n"
+            "return `x/y ${a+`n${b}`}`;\n"
+            "}else{\n"
+            "return a?-b:{k:1,m:[1,2]};\n"
+            "}\n"
+            "}\n"
+        )
+        formatted, error = format_javascript_code(code)
+        self.assertIsNone(error)
+        self.assertEqual(formatted, (
+            "const url = 'http://a/b-c', re = /a\\/b[/]+/gi;\n"
+            "function f(a, b = 1) {\n"
+            "  if (a > 0 && !b) {\n"
+            "    return `x/y ${a+`n${b}`}`;\n"
+            "  } else {\n"
+            "    return a ? -b : { k: 1, m: [1, 2] };\n"
+            "  }\n"
+            "}\n"
+        ))
+        self.assertEqual(format_javascript_code(formatted)[0], formatted)
+
+        formatted, error = format_javascript_code("let s = `open;\n")
+        self.assertEqual(formatted, "let s = `open;\n")
+        self.assertIn("Unterminated template literal", error)
+
+    def test_invalid_input(self):
+        """测试无效输入"""
+        code = "def hello(name):\nprint(name)\n"
+        formatted, error = format_python_code(code)
+        self.assertEqual(formatted, code)
+        self.assertIn("Syntax Error", error)
+
+        # With ignore_errors, the line-based engine repairs the indentation
+        formatted, error = format_python_code(code, ignore_errors=True)
+        self.assertIn("Syntax Error", error)
+        self.assertEqual(formatted, "def hello(name):\n    print(name)\n")
+
+        _, error = format_code("x", "ruby")
+        self.assertIn("Unsupported", error)
+
+
+class TestFormatDirectory(unittest.TestCase):
+    """目录格式化、--check 模式和缓存测试"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.files = {
+            'a.py': 'x=1\n',
+            'pkg/b.py': 'y = 2\n',
+            'pkg/c.py': 'def f(:\n',
+            'web/d.js': 'function f(){\n  return 1;\n}\n',
+            'node_modules/skip.py': 'z=3\n',
+        }
+        for rel, content in self.files.items():
+            path = os.path.join(self.root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def read(self, rel):
+        with open(os.path.join(self.root, rel), encoding='utf-8') as f:
+            return f.read()
+
+    def run_format(self, **kwargs):
+        paths = collect_source_files(self.root)
+        return {os.path.relpath(path, self.root).replace(os.sep, '/'): status
+                for path, status, _ in format_files(paths, **kwargs)}
+
+    def test_check_mode_never_writes(self):
+        """测试 --check 只报告不写入"""
+        statuses = self.run_format(check=True, jobs=2)
+        self.assertNotIn('node_modules/skip.py', statuses)
+        self.assertEqual(statuses['a.py'], 'reformatted')
+        self.assertEqual(statuses['pkg/b.py'], 'unchanged')
+        self.assertEqual(statuses['pkg/c.py'], 'error')
+        self.assertEqual(self.read('a.py'), 'x=1\n')
+
+    def test_parallel_format_with_cache(self):
+        """测试并行格式化写入文件，且缓存跳过已确认格式化的文件"""
+        cache = FormatCache(os.path.join(self.root, '.devkit_cache', 'format'))
+        first = self.run_format(jobs=2, cache=cache)
+        self.assertEqual(first['a.py'], 'reformatted')
+        self.assertEqual(self.read('a.py'), 'x = 1\n')
+
+        # A fresh cache object reads the saved index
+        cache = FormatCache(os.path.join(self.root, '.devkit_cache', 'format'))
+        second = self.run_format(check=True, cache=cache)
+        self.assertEqual(second['pkg/b.py'], 'cached')
+        self.assertEqual(second['a.py'], 'unchanged')
+        third = self.run_format(check=True, cache=cache)
+        self.assertEqual(third['a.py'], 'cached')
+        self.assertEqual(third['pkg/c.py'], 'error')
+
+    def test_ignore_errors_does_not_cache_broken_files(self):
+        """测试 --ignore-errors 下未改动的语法错误文件不会进入缓存"""
+        cache = FormatCache(os.path.join(self.root, '.devkit_cache', 'format'))
+        lenient = self.run_format(check=True, ignore_errors=True, cache=cache)
+        self.assertEqual(lenient['pkg/c.py'], 'unchanged')
+
+        cache = FormatCache(os.path.join(self.root, '.devkit_cache', 'format'))
+        strict = self.run_format(check=True, cache=cache)
+        self.assertEqual(strict['pkg/b.py'], 'cached')
+        self.assertEqual(strict['pkg/c.py'], 'error')
+
+
+
+class TestFormatRange(unittest.TestCase):
+    """按行范围格式化测试"""
+
+    code = (
+        "def f(a,b):\n"
+        "    \"\"\"Doc\n"
+        "x=1\n"
+        "    \"\"\"\n"
+        "    x=a+b\n"
+        "    if x :\n"
+        "      return [1,\n"
+        "   2]\n"
+        "    z=3\n"
+    )
+
+    def test_only_requested_lines_change(self):
+        """测试只修改指定行，缩进从所在代码块恢复"""
+        formatted, error = format_code_range(self.code, 'python', [(5, 5), (9, 9)])
+        self.assertIsNone(error)
+        expected = self.code.split('\n')
+        expected[4] = "    x = a + b"
+        expected[8] = "    z = 3"
+        self.assertEqual(formatted, '\n'.join(expected))
+
+        # Lines inside a string are never touched
+        self.assertEqual(format_code_range(self.code, 'python', [(3, 3)]), (self.code, None))
+
+    def test_reindented_block_is_rewritten_whole(self):
+        """测试嵌套块需要重新缩进时整个语句一起格式化"""
+        formatted, error = format_code_range(self.code, 'python', [(6, 7)])
+        self.assertIsNone(error)
+        self.assertTrue(formatted.endswith(
+            "    if x:\n"
+            "        return [1,\n"
+            "            2]\n"
+            "    z=3\n"
+        ))
+        ast.parse(formatted)
+
+        js, error = format_code_range("a=1\nfunction f(){\nreturn a+b;\n}\n", 'js', [(3, 3)])
+        self.assertEqual(js, "a=1\nfunction f(){\n  return a + b;\n}\n")
+        _, error = format_code_range(self.code, 'python', [(3, 1)])
+        self.assertIn("Invalid line range", error)
+
+    def test_javascript_range_reports_lexer_errors(self):
+        """测试JS按行格式化与整体格式化一样报告词法错误并保持代码不变"""
+        for code in ("let x = (;\n", "let s = `abc\n", "f(){\nlet  a=1;\n}\nlet y = (;\n"):
+            formatted, error = format_code_range(code, 'javascript', [(1, 2)])
+            self.assertEqual(formatted, code)
+            self.assertEqual(error, format_code(code, 'javascript')[1])
+            self.assertIsNotNone(error)
+
+        # A bracket left open at the cut but closed further down is not an error
+        code = "f(){\nlet  a=1;\n}\n"
+        self.assertEqual(format_code_range(code, 'javascript', [(2, 2)]), ("f(){\n  let a = 1;\n}\n", None))
+
+
+
+class TestFormatServer(unittest.TestCase):
+    """--serve 长度前缀 JSON 协议测试"""
+
+    def test_serve_stream_with_cache(self):
+        """测试一个进程处理多个请求并缓存结果"""
+        reader = io.BytesIO()
+        requests = [
+            {'id': 1, 'code': 'x=1\n', 'language': 'python'},
+            {'id': 2, 'code': 'x=1\n', 'language': 'python'},
+            {'id': 3, 'code': 'a=1\nb=2\n', 'language': 'py', 'ranges': [[2, 2]]},
+            {'id': 4, 'language': 'python'},
+            {'command': 'shutdown'},
+            {'id': 5, 'code': 'never answered', 'language': 'python'},
+        ]
+        for request in requests:
+            FormatServer.write_message(reader, request)
+        reader.seek(0)
+        writer = io.BytesIO()
+
+        FormatServer().serve_stream(reader, writer)
+        writer.seek(0)
+        responses = []
+        while True:
+            message = FormatServer.read_message(writer)
+            if message is None:
+                break
+            responses.append(message)
+
+        self.assertEqual([r['id'] for r in responses], [1, 2, 3, 4, None])
+        self.assertEqual(responses[0], {'id': 1, 'cached': False, 'formatted': 'x = 1\n', 'error': None})
+        self.assertTrue(responses[1]['cached'])
+        self.assertEqual(responses[2]['formatted'], 'a=1\nb = 2\n')
+        self.assertIn("'code'", responses[3]['error'])
+
+    @unittest.skipUnless(hasattr(__import__('socket'), 'AF_UNIX'), "需要 Unix 套接字")
+    def test_second_server_keeps_live_socket(self):
+        """测试已有服务在监听时，第二个服务不会抢占套接字"""
+        import socket
+        import threading
+        import time
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        socket_path = os.path.join(directory, 'fmt.sock')
+        thread = threading.Thread(target=FormatServer().serve_unix, args=(socket_path,), daemon=True)
+        thread.start()
+        for _ in range(100):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(socket_path) == 0:
+                    break
+            time.sleep(0.01)
+
+        with self.assertRaisesRegex(RuntimeError, 'already running'):
+            FormatServer().serve_unix(socket_path)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            with client.makefile('rwb') as stream:
+                FormatServer.write_message(stream, {'id': 1, 'code': 'x=1\n', 'language': 'python'})
+                FormatServer.write_message(stream, {'command': 'shutdown'})
+                stream.flush()
+                self.assertEqual(FormatServer.read_message(stream)['formatted'], 'x = 1\n')
+                self.assertEqual(FormatServer.read_message(stream)['status'], 'shutting down')
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+
+    @unittest.skipUnless(hasattr(__import__('socket'), 'AF_UNIX'), "需要 Unix 套接字")
+    def test_serve_unix_refuses_non_socket_path(self):
+        """测试套接字路径是普通文件时拒绝启动且不删除该文件"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        path = os.path.join(directory, 'notes.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('keep me\n')
+        with self.assertRaisesRegex(RuntimeError, 'not a socket'):
+            FormatServer().serve_unix(path)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'keep me\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
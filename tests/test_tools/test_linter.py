@@ -0,0 +1,414 @@
+import ast
+import io
+import json
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+import pytest
+from devkit_zero.tools import linter
+
+
+class TestLinter:
+
+    @pytest.fixture
+    def sample_project(self, tmp_path):
+        """Create a sample project with a mix of clean and noisy files"""
+        project_dir = tmp_path / "lint_project"
+        (project_dir / "pkg").mkdir(parents=True)
+
+        (project_dir / "clean.py").write_text('''
+def add(a, b):
+    """Add two numbers"""
+    return a + b
+''', encoding="utf-8")
+
+        (project_dir / "noisy.py").write_text('''
+from os import *
+
+def badDefault(items=[]):
+    return items
+
+class lowercase:
+    pass
+''', encoding="utf-8")
+
+        for index in range(6):
+            (project_dir / "pkg" / f"mod_{index}.py").write_text(
+                "def f(x=[]):\n    return x\n" * (index + 1), encoding="utf-8"
+            )
+
+        (project_dir / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+
+        return project_dir
+
+    def test_lint_code_reports_mutable_default(self):
+        """Test mutable default argument detection"""
+        issues = linter.lint_code("def f(x=[]):\n    return x\n")
+        types = {issue['type'] for issue in issues}
+        assert 'mutable_default_argument' in types
+
+    def test_lint_directory_sorted_by_path(self, sample_project):
+        """Test directory results are ordered by path"""
+        results = linter.lint_directory(str(sample_project))
+        assert list(results) == sorted(results)
+        assert len(results) == 9
+
+    def test_lint_directory_parallel_matches_serial(self, sample_project):
+        """Test process pool results match the serial run"""
+        serial = linter.lint_directory(str(sample_project), workers=1)
+        parallel = linter.lint_directory(str(sample_project), workers=3)
+        assert parallel == serial
+        assert list(parallel) == list(serial)
+
+    def test_split_by_size_balances_chunks(self, sample_project):
+        """Test size-balanced chunking keeps every file exactly once"""
+        files = linter._collect_python_files(str(sample_project))
+        chunks = linter._split_by_size(files, 3)
+        assert len(chunks) == 3
+        assert sorted(path for chunk in chunks for path in chunk) == files
+
+    def test_lint_directory_missing(self, tmp_path):
+        """Test missing directory raises"""
+        with pytest.raises(FileNotFoundError):
+            linter.lint_directory(str(tmp_path / "missing"))
+
+    def test_cache_hit_skips_parse(self, sample_project, tmp_path, monkeypatch):
+        """Test unchanged files are served from the cache without parsing"""
+        cache = linter.LintCache(str(tmp_path / "cache"))
+        first = linter.lint_directory(str(sample_project), cache=cache)
+
+        def fail_parse(*args, **kwargs):
+            raise AssertionError("ast.parse called on cache hit")
+
+        monkeypatch.setattr(linter.ast, "parse", fail_parse)
+        second = linter.lint_directory(str(sample_project), cache=cache)
+        assert second == first
+
+    def test_cache_key_depends_on_content_and_config(self, tmp_path):
+        """Test cache keys change with content and config"""
+        cache = linter.LintCache(str(tmp_path / "cache"))
+        assert cache.make_key(b"x = 1\n") == cache.make_key(b"x = 1\n")
+        assert cache.make_key(b"x = 1\n") != cache.make_key(b"x = 2\n")
+        assert cache.make_key(b"x = 1\n") != cache.make_key(b"x = 1\n", {'max_line_length': 10})
+        assert cache.make_key(b"x = 1\n") == cache.make_key(b"x = 1\n", {'max_line_length': 120})
+
+    def test_cache_evicts_least_recently_used(self, tmp_path):
+        """Test eviction keeps the cache under its size cap"""
+        cache = linter.LintCache(str(tmp_path / "cache"), max_bytes=400)
+        keys = [cache.make_key(str(index).encode()) for index in range(20)]
+        for key in keys:
+            cache.put(key, [{'type': 'x', 'message': 'm' * 50, 'line': 1,
+                             'column': 0, 'severity': 'info'}])
+        cache.evict()
+        remaining = [key for key in keys if cache.get(key) is not None]
+        assert 0 < len(remaining) < len(keys)
+
+    def test_complexity_includes_nested_functions(self):
+        """Test nested function branches count toward the enclosing function"""
+        branches = "".join(f"        if x == {index}:\n            pass\n" for index in range(6))
+        code = (
+            "def outer(x):\n"
+            "    \"\"\"Outer\"\"\"\n"
+            "    if x:\n        pass\n"
+            "    def inner(x):\n"
+            "        \"\"\"Inner\"\"\"\n"
+            f"{branches}"
+            "        if x and x or x:\n            pass\n"
+            "    return inner\n"
+        )
+        complexity = {
+            issue['message'].split("'")[1]: issue['message']
+            for issue in linter.lint_code(code) if issue['type'] == 'complexity'
+        }
+        assert set(complexity) == {'outer', 'inner'}
+        assert "complexity: 13" in complexity['outer']
+        assert "complexity: 12" in complexity['inner']
+        assert linter.CodeLinter().calculate_complexity(ast.parse(code).body[0]) == 13
+
+    def test_iter_lint_directory_matches_lint_directory(self, sample_project):
+        """Test streaming results cover the same files as lint_directory"""
+        streamed = dict(linter.iter_lint_directory(str(sample_project), workers=2))
+        assert streamed == linter.lint_directory(str(sample_project))
+
+    def test_write_ndjson(self, sample_project):
+        """Test NDJSON writer emits one issue per line"""
+        stream = io.StringIO()
+        counts = linter.write_ndjson(linter.iter_lint_directory(str(sample_project)), stream)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert len(records) == sum(counts.values())
+        assert all('file' in record and 'severity' in record for record in records)
+
+    def test_write_sarif(self, sample_project):
+        """Test SARIF writer produces a valid log"""
+        stream = io.StringIO()
+        counts = linter.write_sarif(linter.iter_lint_directory(str(sample_project)), stream)
+        log = json.loads(stream.getvalue())
+        results = log['runs'][0]['results']
+        assert log['version'] == '2.1.0'
+        assert len(results) == sum(counts.values())
+        assert {result['level'] for result in results} <= {'error', 'warning', 'note'}
+
+    def test_write_sarif_empty(self):
+        """Test SARIF writer with no results"""
+        stream = io.StringIO()
+        linter.write_sarif([], stream)
+        assert json.loads(stream.getvalue())['runs'][0]['results'] == []
+
+    @pytest.fixture
+    def git_project(self, tmp_path):
+        """Create a git repository with one committed file"""
+        if shutil.which("git") is None:
+            pytest.skip("git not available")
+        repo = tmp_path / "repo"
+        repo.mkdir()
+
+        def git(*args):
+            subprocess.run(
+                ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                cwd=repo, check=True, capture_output=True
+            )
+
+        git("init", "-q")
+        (repo / "old.py").write_text("def f(x=[]):\n    return x\n", encoding="utf-8")
+        (repo / "untouched.py").write_text("def g(y={}):\n    return y\n", encoding="utf-8")
+        git("add", ".")
+        git("commit", "-q", "-m", "init")
+        return repo, git
+
+    def test_lint_changed_files(self, git_project):
+        """Test only files changed since a ref are linted"""
+        repo, git = git_project
+        with open(repo / "old.py", "a", encoding="utf-8") as f:
+            f.write("\ndef h(z=[]):\n    return z\n")
+        (repo / "notes.txt").write_text("not python", encoding="utf-8")
+
+        results = dict(linter.iter_lint_changed("HEAD", path=str(repo)))
+        assert [Path(p).name for p in results] == ["old.py"]
+        assert len([i for i in results[next(iter(results))]
+                    if i['type'] == 'mutable_default_argument']) == 2
+
+        changed_only = dict(linter.iter_lint_changed("HEAD", path=str(repo), changed_lines_only=True))
+        lines = {i['line'] for i in changed_only[next(iter(changed_only))]}
+        assert lines == {4}
+
+    def test_changed_lines_odd_names_and_untracked(self, git_project):
+        """Test paths git pads or quotes, and untracked files, are reported"""
+        repo, git = git_project
+        names = ["with space.py"] + ([] if os.name == "nt" else ['quo"te.py'])
+        for name in names:
+            (repo / name).write_text("x = 1\n", encoding="utf-8")
+        git("add", ".")
+        git("commit", "-q", "-m", "odd names")
+        for name in names:
+            with open(repo / name, "a", encoding="utf-8") as f:
+                f.write("++ x\ny = 2\n")
+        (repo / "fresh.py").write_text("a = 1\nb = 2\n", encoding="utf-8")
+        (repo / ".gitignore").write_text("ignored.py\n", encoding="utf-8")
+        (repo / "ignored.py").write_text("c = 3\n", encoding="utf-8")
+
+        ranges = linter.git_changed_lines("HEAD", path=str(repo))
+        assert {Path(p).name: r for p, r in ranges.items()} == dict(
+            {name: [(2, 3)] for name in names}, **{"fresh.py": [(1, 2)]}
+        )
+        files = linter.git_changed_files("HEAD", path=str(repo))
+        assert sorted(Path(p).name for p in files) == sorted(names + ["fresh.py"])
+        assert linter.git_changed_lines(staged=True, path=str(repo)) == {}
+
+    def test_lint_staged_files(self, git_project):
+        """Test staged mode only sees files in the index"""
+        repo, git = git_project
+        (repo / "new.py").write_text("def k(a=[]):\n    return a\n", encoding="utf-8")
+        (repo / "other.py").write_text("x = 1\n", encoding="utf-8")
+        git("add", "new.py")
+
+        files = linter.git_changed_files(staged=True, path=str(repo))
+        assert [Path(p).name for p in files] == ["new.py"]
+
+    def test_filter_issues_by_lines_keeps_syntax_errors(self):
+        """Test syntax errors survive line filtering"""
+        issues = [
+            {'type': 'syntax_error', 'message': '', 'line': 1, 'column': 0, 'severity': 'error'},
+            {'type': 'line_too_long', 'message': '', 'line': 9, 'column': 0, 'severity': 'warning'},
+            {'type': 'line_too_long', 'message': '', 'line': 3, 'column': 0, 'severity': 'warning'},
+        ]
+        kept = linter.filter_issues_by_lines(issues, [(2, 4)])
+        assert [issue['line'] for issue in kept] == [1, 3]
+
+    def test_disabled_rule_not_reported(self):
+        """Test rules can be turned off through the config"""
+        code = "def f(x=[]):\n    return x\n"
+        issues = linter.lint_code(code, config={'missing_docstring': 'off'})
+        types = {issue['type'] for issue in issues}
+        assert 'missing_docstring' not in types
+        assert 'mutable_default_argument' in types
+
+    def test_rule_profile_counts_calls(self, sample_project):
+        """Test rule profile records every enabled rule across workers"""
+        profile = linter.RuleProfile()
+        linter.lint_directory(str(sample_project), workers=2, profile=profile,
+                              config={'complexity': 'off'})
+        stats = profile.to_dict()
+        assert 'complexity' not in stats
+        assert stats['mutable_default_argument']['calls'] == 23
+        assert stats['<parse>']['calls'] == 9
+        assert 'mutable_default_argument' in profile.format_table()
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not supported")
+    def test_daemon_serves_warm_results(self, tmp_path):
+        """Test daemon answers lint requests and notices file changes"""
+        socket_path = str(tmp_path / "l.sock")
+        target = tmp_path / "target.py"
+        target.write_text("def f(x=[]):\n    return x\n", encoding="utf-8")
+
+        daemon = linter.LintDaemon(socket_path)
+        thread = threading.Thread(target=daemon.serve, daemon=True)
+        thread.start()
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.01)
+
+        try:
+            first = linter.lint_via_daemon(str(target), socket_path)
+            assert first == linter.lint_file(str(target))
+            assert linter.daemon_request({'op': 'ping'}, socket_path)['entries'] == 1
+
+            target.write_text('def f(x=None):\n    """Doc"""\n    return x\n', encoding="utf-8")
+            os.utime(target, ns=(0, 10 ** 9))
+            assert linter.lint_via_daemon(str(target), socket_path) == []
+        finally:
+            linter.daemon_request({'op': 'shutdown'}, socket_path)
+            thread.join(timeout=5)
+        assert not os.path.exists(socket_path)
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets not supported")
+    def test_second_daemon_keeps_live_socket(self, tmp_path):
+        """Test a second daemon refuses a live socket but replaces a stale one"""
+        socket_path = str(tmp_path / "l.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+
+        thread = threading.Thread(target=linter.LintDaemon(socket_path).serve, daemon=True)
+        thread.start()
+        for _ in range(100):
+            try:
+                linter.daemon_request({'op': 'ping'}, socket_path)
+                break
+            except OSError:
+                time.sleep(0.01)
+
+        try:
+            with pytest.raises(RuntimeError, match="already running"):
+                linter.LintDaemon(socket_path).serve()
+            assert linter.daemon_request({'op': 'ping'}, socket_path)['ok']
+        finally:
+            linter.daemon_request({'op': 'shutdown'}, socket_path)
+            thread.join(timeout=5)
+
+    def test_silent_client_does_not_block_daemon(self, tmp_path, monkeypatch):
+        """Test a client that never sends a request line is dropped after the read timeout"""
+        monkeypatch.setattr(linter, "DAEMON_READ_TIMEOUT", 0.2)
+        socket_path = str(tmp_path / "l.sock")
+        thread = threading.Thread(target=linter.LintDaemon(socket_path).serve, daemon=True)
+        thread.start()
+        for _ in range(100):
+            try:
+                linter.daemon_request({'op': 'ping'}, socket_path)
+                break
+            except OSError:
+                time.sleep(0.01)
+
+        silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            silent.connect(socket_path)
+            assert linter.daemon_request({'op': 'ping'}, socket_path, timeout=5)['ok']
+        finally:
+            silent.close()
+            linter.daemon_request({'op': 'shutdown'}, socket_path)
+            thread.join(timeout=5)
+
+    def test_lint_via_daemon_falls_back_on_malformed_reply(self, tmp_path):
+        """Test client mode lints locally when the daemon answers with invalid JSON"""
+        target = tmp_path / "target.py"
+        target.write_text("def f(x=[]):\n    return x\n", encoding="utf-8")
+        socket_path = str(tmp_path / "bad.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+
+        def reply_garbage():
+            connection, _ = server.accept()
+            with connection:
+                connection.recv(65536)
+                connection.sendall(b"not json\n")
+
+        thread = threading.Thread(target=reply_garbage, daemon=True)
+        thread.start()
+        try:
+            assert linter.lint_via_daemon(str(target), socket_path) == linter.lint_file(str(target))
+        finally:
+            thread.join(timeout=5)
+            server.close()
+
+    def test_daemon_refuses_non_socket_path(self, tmp_path):
+        """Test a regular file given as the socket path is left alone"""
+        target = tmp_path / "notes.txt"
+        target.write_text("keep me\n", encoding="utf-8")
+        with pytest.raises(RuntimeError, match="not a socket"):
+            linter.LintDaemon(str(target)).serve()
+        assert target.read_text(encoding="utf-8") == "keep me\n"
+
+    def test_lint_via_daemon_falls_back_without_server(self, tmp_path):
+        """Test client mode lints locally when no daemon is listening"""
+        target = tmp_path / "target.py"
+        target.write_text("def f(x=[]):\n    return x\n", encoding="utf-8")
+        issues = linter.lint_via_daemon(str(target), str(tmp_path / "missing.sock"))
+        assert issues == linter.lint_file(str(target))
+
+    @pytest.mark.parametrize("use_inotify", [False, True])
+    def test_watcher_reports_deltas(self, tmp_path, use_inotify):
+        """Test watcher re-lints only modified files and reports deltas"""
+        (tmp_path / "sub").mkdir()
+        stable = tmp_path / "stable.py"
+        stable.write_text("def f(x=[]):\n    return x\n", encoding="utf-8")
+        target = tmp_path / "sub" / "target.py"
+        target.write_text('def g():\n    """Doc"""\n    return 1\n', encoding="utf-8")
+
+        watcher = linter.LintWatcher(str(tmp_path), use_inotify=use_inotify)
+        try:
+            initial = watcher.start()
+            assert len(initial) == 2
+            assert watcher.poll() == []
+
+            # Touching without changing content is not reported
+            os.utime(stable, ns=(0, 10 ** 9))
+            assert watcher.poll(0.05) == []
+
+            target.write_text('def g(y={}):\n    """Doc"""\n    return y\n', encoding="utf-8")
+            deltas = watcher.poll(0.05)
+            assert [Path(path).name for path, _, _ in deltas] == ["target.py"]
+            assert [issue['type'] for issue in deltas[0][1]] == ['mutable_default_argument']
+            assert deltas[0][2] == []
+
+            new_dir = tmp_path / "new"
+            new_dir.mkdir()
+            (new_dir / "added.py").write_text("from os import *\n", encoding="utf-8")
+            target.unlink()
+            deltas = {Path(path).name: (added, resolved) for path, added, resolved in watcher.poll(0.05)}
+            assert [issue['type'] for issue in deltas["added.py"][0]] == ['import_style']
+            assert [issue['type'] for issue in deltas["target.py"][1]] == ['mutable_default_argument']
+        finally:
+            watcher.close()
+
+    def test_diff_issues_multiset(self):
+        """Test duplicate issues are matched one to one"""
+        issue = {'type': 't', 'message': 'm', 'line': 1, 'column': 0, 'severity': 'info'}
+        other = dict(issue, line=2)
+        added, resolved = linter.diff_issues([issue, issue], [issue, other])
+        assert added == [other]
+        assert resolved == [issue]
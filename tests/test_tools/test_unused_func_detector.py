@@ -1,7 +1,7 @@
 import os
 import pytest
 from pathlib import Path
-from devkit_zero.tools.unused_func_detector import detect_unused_functions
+from devkit_zero.tools.unused_func_detector import detect_unused_functions, find_python_files
 
 class TestUnusedFuncDetector:
     
@@ -70,3 +70,213 @@ def ignored_unused():
         unused_names = {f.name for f in unused}
         
         assert "ignored_unused" not in unused_names
+
+    def test_walker_prunes_globs_and_gitignore(self, sample_project, monkeypatch):
+        """Test glob excludes and .gitignore rules prune the directory walk"""
+        from devkit_zero.tools import unused_func_detector
+
+        for rel in ["generated/gen.py", "pkg/skip_me.py", "pkg/keep.py", "pkg/cache/c.py", "logs/keep.py"]:
+            path = sample_project / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("def x():\n    pass\n", encoding="utf-8")
+        (sample_project / ".gitignore").write_text("# comment\n/generated/\nlogs/\n!logs/keep.py\n", encoding="utf-8")
+        (sample_project / "pkg" / ".gitignore").write_text("cache\n", encoding="utf-8")
+
+        scanned = []
+        real_scandir = os.scandir
+
+        def tracking_scandir(path):
+            scanned.append(os.path.relpath(path, sample_project))
+            return real_scandir(path)
+
+        monkeypatch.setattr(unused_func_detector.os, "scandir", tracking_scandir)
+        files = find_python_files(sample_project, ["skip_*.py"])
+        rel_files = {p.relative_to(sample_project).as_posix() for p in files}
+
+        assert "pkg/keep.py" in rel_files
+        assert "pkg/skip_me.py" not in rel_files
+        assert not any(f.startswith(("generated/", "logs/", "pkg/cache/")) for f in rel_files)
+        # Ignored directories are never opened
+        assert not {"generated", "logs", os.path.join("pkg", "cache")} & set(scanned)
+
+        everything = find_python_files(sample_project, [], use_gitignore=False)
+        assert len(everything) == len(files) + 4
+
+    def test_parallel_matches_serial(self, sample_project):
+        """Test process pool analysis gives the same result as serial analysis"""
+        for index in range(5):
+            (sample_project / f"extra_{index}.py").write_text(
+                f"def helper_{index}():\n    pass\n\ndef caller_{index}():\n    helper_{index}()\n",
+                encoding="utf-8"
+            )
+
+        def key(func):
+            return (func.file_path, func.line_no, func.full_name, func.is_method)
+
+        serial = sorted(key(f) for f in detect_unused_functions(sample_project))
+        parallel = sorted(key(f) for f in detect_unused_functions(sample_project, workers=3))
+        assert parallel == serial
+        assert {name for _, _, name, _ in parallel} >= {f"caller_{index}" for index in range(5)}
+
+    def test_symbol_index_reanalyzes_only_changed_files(self, sample_project, tmp_path, monkeypatch):
+        """Test the persistent index skips unchanged files and tracks edits"""
+        from devkit_zero.tools import unused_func_detector as detector
+
+        index_path = str(tmp_path / "index" / "symbols.sqlite")
+        first = detect_unused_functions(sample_project, index_path=index_path)
+        assert {f.name for f in first} == {"unused_function", "unused_method"}
+
+        analyzed = []
+        original = detector.analyze_file
+        monkeypatch.setattr(detector, "analyze_file",
+                            lambda path: analyzed.append(path.name) or original(path))
+
+        assert {f.name for f in detect_unused_functions(sample_project, index_path=index_path)} == \
+            {"unused_function", "unused_method"}
+        assert analyzed == []
+
+        (sample_project / "main.py").write_text(
+            "from lib import used_function\n\ndef main():\n    used_function()\n    unused_function()\n",
+            encoding="utf-8"
+        )
+        (sample_project / "lib.py").touch()
+        unused = detect_unused_functions(sample_project, index_path=index_path)
+        assert analyzed == ["main.py"]
+        assert {f.name for f in unused} == {"used_method", "unused_method"}
+
+        (sample_project / "main.py").unlink()
+        unused = detect_unused_functions(sample_project, index_path=index_path)
+        assert "used_function" in {f.name for f in unused}
+
+    def test_symbol_index_falls_back_to_full_scan(self, sample_project, tmp_path, capsys):
+        """Test an unusable or corrupted index degrades to the in-memory scan with a warning"""
+        expected = {"unused_function", "unused_method"}
+
+        corrupted = tmp_path / "corrupted.sqlite"
+        corrupted.write_bytes(b"this is not a database" * 100)
+        assert {f.name for f in detect_unused_functions(sample_project, index_path=str(corrupted))} == expected
+
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("", encoding="utf-8")
+        unwritable = str(blocker / "index.sqlite")
+        assert {f.name for f in detect_unused_functions(sample_project, index_path=unwritable)} == expected
+        assert capsys.readouterr().err.count("Warning: symbol index") == 2
+
+    def test_index_is_opt_in_and_outside_project(self, sample_project, tmp_path, monkeypatch):
+        """Test the CLI only indexes with --index, under the user cache directory"""
+        import argparse
+        from devkit_zero.tools.unused_func_detector import register_parser, main_function
+
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        parser = argparse.ArgumentParser()
+        register_parser(parser.add_subparsers())
+
+        main_function(parser.parse_args(["unused-func", str(sample_project)]))
+        assert not (tmp_path / "cache").exists()
+
+        main_function(parser.parse_args(["unused-func", str(sample_project), "--index"]))
+        assert len(list((tmp_path / "cache").rglob("*.sqlite"))) == 1
+        assert not (sample_project / ".devkit_cache").exists()
+
+    def test_reachability_resolves_qualified_calls(self, tmp_path):
+        """Test call graph reachability distinguishes same-named methods"""
+        from devkit_zero.tools.unused_func_detector import CallGraph, detect_unreachable_functions
+
+        project = tmp_path / "graph_project"
+        pkg = project / "pkg"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text("from .store import Cache\n", encoding="utf-8")
+        (pkg / "store.py").write_text("""
+class Cache:
+    def get(self, key):
+        return self._load(key)
+
+    def _load(self, key):
+        return key
+
+class Registry:
+    def get(self, key):
+        return key
+
+def orphan():
+    Registry().get("x")
+""", encoding="utf-8")
+        (pkg / "cli.py").write_text("""
+from pkg import Cache
+
+def run():
+    cache = Cache()
+    return cache.get("k")
+""", encoding="utf-8")
+        (project / "pyproject.toml").write_text(
+            '[project.scripts]\ntool = "pkg.cli:run"\n', encoding="utf-8"
+        )
+
+        unreachable = {f.full_name for f in detect_unreachable_functions(project)}
+        assert unreachable == {"Registry.get", "orphan"}
+        # The name-based scan sees a call to "get" and keeps both methods
+        assert "Registry.get" not in {f.full_name for f in detect_unused_functions(project)}
+
+        graph = CallGraph.build(project, find_python_files(project, []))
+        assert graph.find_nodes("Cache._load") == ["pkg.store.Cache._load"]
+        assert graph.callers_of("pkg.store.Cache._load") == {"pkg.store.Cache.get": "direct"}
+        assert graph.callers_of("pkg.store.Registry.get") == {
+            "pkg.cli.run": "attribute", "pkg.store.orphan": "direct",
+        }
+        assert graph.to_dict()["nodes"]["pkg.store.orphan"]["reachable"] is False
+        assert {f.full_name for f in graph.unreachable_functions(["pkg.store:orphan"])} == set()
+
+    def test_function_table_interns_and_replaces(self):
+        """Test the compact table dedups by (file, class, name) and materializes on demand"""
+        from devkit_zero.tools.unused_func_detector import FunctionTable
+
+        table = FunctionTable()
+        table.add("a.py", "run", 1, "Job")
+        table.add("a.py", "run", 3)
+        table.add("b.py", "helper", 5)
+        table.add("a.py", "run", 9, "Job")
+
+        assert len(table) == 3
+        assert table.strings.count("a.py") == 1
+        funcs = table.functions()
+        assert [(f.file_path, f.full_name, f.line_no, f.is_method) for f in funcs] == [
+            ("a.py", "Job.run", 9, True), ("a.py", "run", 3, False), ("b.py", "helper", 5, False),
+        ]
+        assert [f.name for f in table.uncalled({"run", "unknown"})] == ["helper"]
+        assert not hasattr(funcs[0], "__dict__")
+
+    def test_streaming_writers(self, tmp_path):
+        """Test writers stream the same reports and paginate large HTML output"""
+        import argparse
+        import io
+        import json
+        from devkit_zero.tools.unused_func_detector import (
+            FunctionInfo, format_json_report, main_function, register_parser,
+            write_html_report, write_json_report,
+        )
+
+        funcs = [FunctionInfo(f"f{i}", f"mod{i // 10}.py", i + 1) for i in range(45)]
+        funcs.append(FunctionInfo("get", "mod0.py", 99, True, "A<B>"))
+
+        buffer = io.StringIO()
+        write_json_report(funcs, buffer)
+        assert buffer.getvalue() == format_json_report(funcs)
+        assert json.loads(buffer.getvalue())["total_count"] == 46
+
+        html_buffer = io.StringIO()
+        write_html_report(funcs, html_buffer, page_size=20)
+        html = html_buffer.getvalue()
+        assert html.count("<section class='page'") == 3
+        assert "href='#page-3'" in html
+        assert html.count("<details class='file-section' open>") == 5
+        assert "A&lt;B&gt;.get" in html
+
+        output = tmp_path / "report.json"
+        parser = argparse.ArgumentParser()
+        register_parser(parser.add_subparsers())
+        project = tmp_path / "proj"
+        project.mkdir()
+        (project / "a.py").write_text("def lonely():\n    pass\n", encoding="utf-8")
+        args = parser.parse_args(["unused-func", str(project), "-f", "json", "-o", str(output), "--no-index"])
+        main_function(args)
+        assert json.loads(output.read_text(encoding="utf-8"))["unused_functions"][0]["name"] == "lonely"